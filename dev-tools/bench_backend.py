@@ -0,0 +1,37 @@
+"""
+Micro-benchmark of the per-call dispatch overhead of InputBackend.
+
+Every Input call goes through InputBackend.get(); with the "null" backend nothing is injected,
+so the time per call is the overhead of BMAutomation itself.
+
+Run with:
+    py dev-tools/bench_backend.py [calls]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from BMAutomation import Input, InputBackend, InputBatch, NullInputBackend, RecordingInputBackend
+
+
+def main(calls: int = 100000) -> None:
+    batch = InputBatch.fromKey("w", 0)
+    cases = [
+        ("baseline: empty call", lambda: None),
+        ("InputBackend.get()", InputBackend.get),
+        ("sendBatch() prebuilt batch", lambda: InputBackend.get().sendBatch(batch)),
+        ("Input.key_input()", lambda: Input.key_input("w", 0)),
+        ("Input.clickLeft()", lambda: Input.clickLeft(None, None, 0)),
+        ("Input.move()", lambda: Input.move(960, 540, 0, 0)),
+    ]
+    for name, backend in (("null", NullInputBackend()), ("recording", RecordingInputBackend())):
+        with InputBackend.use(backend):
+            for case, func in cases:
+                seconds = timeit.timeit(func, number=calls)
+                print('%-10s %-28s %8.3f us/call' % (name, case, seconds / calls * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
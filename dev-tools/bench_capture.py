@@ -0,0 +1,60 @@
+"""
+Cost of one poll of ScreenObserver: capturing the region, and fingerprinting the frame.
+
+Capturing uses pyautogui.screenshot() of SystemConditionProvider, and is skipped if pyautogui cannot capture
+the screen here. Fingerprinting is measured on frames of SyntheticFrameSource.
+
+Run with:
+    py dev-tools/bench_capture.py [polls]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from BMAutomation import ScreenObserver, SyntheticFrameSource, SystemConditionProvider
+
+REGIONS = [(760, 400, 400, 300), (0, 0, 1280, 720), (0, 0, 1920, 1080)]
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    print('%-36s mean %9.3f ms  p95 %9.3f ms  max %9.3f ms  (%.0f Hz)' % (
+        name, sum(samples) / len(samples) * 1e3, samples[int(len(samples) * 0.95)] * 1e3, samples[-1] * 1e3,
+        len(samples) / sum(samples)))
+
+
+def main(polls: int = 30) -> None:
+    provider = SystemConditionProvider()
+    source = SyntheticFrameSource(loadTime=polls)
+    for region in REGIONS:
+        size = "%sx%s" % region[2:]
+        observer = ScreenObserver(region)
+        frames = [source(i, region) for i in range(polls)]
+        samples = []
+        for frame in frames:
+            t = time.perf_counter()
+            observer.fingerprint(frame)
+            samples.append(time.perf_counter() - t)
+        report("fingerprint %s" % size, samples)
+
+        samples = []
+        try:
+            for _ in range(polls):
+                t = time.perf_counter()
+                frame = provider.captureRegion(region)
+                samples.append(time.perf_counter() - t)
+                if frame is None:
+                    break
+        except Exception as e:
+            print('capture %-28s skipped: %s' % (size, e.__class__.__name__))
+            continue
+        if frame is None:
+            print('capture %-28s skipped: pyautogui is not installed' % size)
+            continue
+        report("capture %s" % size, samples)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 30)
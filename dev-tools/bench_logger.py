@@ -0,0 +1,66 @@
+"""
+Micro-benchmark of Logger.Log() per-call cost, before and after the caller location fast path.
+
+Run with:
+    py dev-tools/bench_logger.py [calls]
+"""
+import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import BMAutomation as ba
+from BMAutomation import Logger, LogLevel
+
+
+def legacyLog(log, logFile=None):
+    """Logger.Log() before the fast path: walk frames with os.path.split() and format with datetime."""
+    frameCount = 1
+    while True:
+        frame = sys._getframe(frameCount)
+        _, scriptFileName = os.path.split(frame.f_code.co_filename)
+        if scriptFileName != Logger._SelfFileName:
+            break
+        frameCount += 1
+    t = datetime.datetime.now()
+    log = '{}-{:02}-{:02} {:02}:{:02}:{:02}.{:03} {}[{}] {} -> {}\n'.format(
+        t.year, t.month, t.day, t.hour, t.minute, t.second, t.microsecond // 1000, scriptFileName, frame.f_lineno, frame.f_code.co_name, log)
+    if logFile:
+        fout = open(logFile, 'a+', encoding='utf-8')
+        fout.write(log)
+        fout.close()
+    return log
+
+
+def main(calls: int = 100000) -> None:
+    logFile = '@BenchLogger.txt'
+    cases = [
+        ("legacy frame walk + format", lambda: legacyLog("Performing Action")),
+        ("legacy file only", lambda: legacyLog("Performing Action", logFile)),
+        ("Log() sync, no output", lambda: Logger.Log(
+            "Performing Action", writeToFile=False, printToStdout=False)),
+        ("Log() sync, file only", lambda: Logger.Log(
+            "Performing Action", printToStdout=False, logFile=logFile)),
+        ("Log() level disabled", lambda: Logger.Log(
+            "Performing Action", printToStdout=False, logFile=logFile, level=LogLevel.Debug)),
+    ]
+    Logger.SetLevel(LogLevel.Info)
+    for name, case in cases:
+        seconds = timeit.timeit(case, number=calls)
+        print('%-32s %8.3f us/call' % (name, seconds / calls * 1e6))
+
+    Logger.SetAsync(True, maxQueueSize=0)
+    seconds = timeit.timeit(lambda: Logger.Log(
+        "Performing Action", printToStdout=False, logFile=logFile), number=calls)
+    print('%-32s %8.3f us/call (caller side)' %
+          ("Log() async, file only", seconds / calls * 1e6))
+    Logger.Shutdown()
+    ba.LogSink.release(logFile)
+    if os.path.exists(logFile):
+        os.remove(logFile)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
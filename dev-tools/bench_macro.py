@@ -0,0 +1,58 @@
+"""
+Overhead of playing a TinyTask recording in-process with MacroPlayer, against running its TinyTask executor.
+
+Both paths play the same recordings of a tinytask folder at real time: MacroPlayer plays the converted macros
+with the current InputBackend (win32 on Windows), and each compiled TinyTask executor is run until it exits.
+The overhead of an action is its time beyond the length of the recording. TinyTask executors only run on Windows;
+elsewhere, only MacroPlayer is measured, with the "null" backend.
+
+Run with:
+    py dev-tools/bench_macro.py [actions] [tinytask folder]
+"""
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from BMAutomation import InputBackend, MacroPlayer
+
+TINYTASK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples", "AMDAutomation", "dev", "tinytask")
+MACROS = ["enter", "esc", "e", "r", "space"]
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    print('%-36s mean %9.3f ms  p95 %9.3f ms  max %9.3f ms' % (
+        name, sum(samples) / len(samples) * 1e3, samples[int(len(samples) * 0.95)] * 1e3, samples[-1] * 1e3))
+
+
+def main(actions: int = 50, folder: str = TINYTASK) -> None:
+    macros = MacroPlayer.convertTinyTask(folder)
+    for name in MACROS:
+        MacroPlayer.register(name, macros[name])
+    durations = {name: MacroPlayer.get(name).getDuration() for name in MACROS}
+
+    samples = []
+    for i in range(actions):
+        name = MACROS[i % len(MACROS)]
+        t = time.perf_counter()
+        MacroPlayer.play(name)
+        samples.append(time.perf_counter() - t - durations[name])
+    report("MacroPlayer.play() (%s)" % type(InputBackend.get()).__name__, samples)
+
+    if sys.platform != "win32":
+        print("TinyTask executors only run on Windows, skipped")
+        return
+    samples = []
+    for i in range(actions):
+        name = MACROS[i % len(MACROS)]
+        t = time.perf_counter()
+        subprocess.Popen([os.path.join(folder, name + ".exe")]).wait()
+        samples.append(time.perf_counter() - t - durations[name])
+    report("TinyTask executor", samples)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50, sys.argv[2] if len(sys.argv) > 2 else TINYTASK)
@@ -0,0 +1,40 @@
+"""
+Overshoot of key hold waits with time.sleep() and with PreciseWait.
+
+Run with:
+    py dev-tools/bench_wait.py [waits]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from BMAutomation import PreciseWait, WaitStats
+
+HOLDS = [0.05, 0.065, 0.1, 0.3, 0.6]
+
+
+def main(waits: int = 50) -> None:
+    legacy = WaitStats()
+    for i in range(waits):
+        seconds = HOLDS[i % len(HOLDS)]
+        deadline = time.perf_counter_ns() + int(seconds * 1e9)
+        time.sleep(seconds)
+        legacy.record(time.perf_counter_ns() - deadline)
+
+    cases = [("time.sleep()", legacy)]
+    for mode in ("off", "yield", "busy"):
+        wait = PreciseWait(spinMode=mode, maxSpinRatio=None)
+        for i in range(waits):
+            wait.sleep(HOLDS[i % len(HOLDS)])
+        cases.append(("PreciseWait %s" % mode, wait.stats))
+
+    for name, stats in cases:
+        s = stats.getStats()
+        print('%-20s mean %7.3f ms  p99 %7.3f ms  max %7.3f ms  spin %7.1f ms' % (
+            name, s["overshootMean"] * 1e3, s["overshootP99"] * 1e3, s["overshootMax"] * 1e3, s["spin"] * 1e3))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
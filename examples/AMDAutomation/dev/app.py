@@ -59,6 +59,12 @@ app.setBenchmarkTime(300)
 
 # app.setDealCrashDump(True)
 
+# Play the TinyTask recordings in-process instead of starting a process per action.
+# tinytask/macros.json is converted from the recordings by:
+# ba.MacroPlayer.convertTinyTask("tinytask", "tinytask/macros.json")
+ba.MacroPlayer.load("tinytask/macros.json")
+ba.MacroPlayer.Enabled = True
+
 ################################################################################
 ################################# Game Scripts #################################
 ################################################################################
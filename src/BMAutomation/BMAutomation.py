@@ -13,23 +13,54 @@ BMAutomation is shared under the MIT License.
 This means that you can do almost anything they want with the code,
 like making and distributing closed source versions.
 """
+import abc
+import array
+import atexit
+import contextlib
 import ctypes
 import ctypes.wintypes
 import datetime
+import functools
+import gzip
+import hashlib
+import io
 import json
+import math
+import mmap
 import os
+import queue
 import random
 import re
+import shlex
+import signal
+import struct
 import subprocess
 import sys
+import threading
 import time
+import types
+import weakref
 from typing import Any  # need 'pip install typing' for Python3.4 or lower
-from typing import Callable, Dict, Iterable, List, Literal, Tuple
-
-import pyautogui as pag
-import uiautomation as auto
-import win32api
-import win32con
+from typing import Callable, Dict, Iterable, Iterator, List, Literal, Tuple, Union
+
+try:
+    import numpy as np  # optional, need 'pip install numpy' for WorkloadGenerator
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image  # optional, installed with pyautogui, for reading templates of TemplateMatcher
+except ImportError:
+    Image = None
+
+try:
+    import pyautogui as pag
+    import uiautomation as auto
+    import win32api
+    import win32con
+except ImportError:
+    # Not on Windows, only the "recording" and "null" InputBackend can be used
+    pag = auto = win32api = win32con = None
 
 ################################################################################
 ################################### Console ####################################
@@ -60,6 +91,14 @@ class ConsoleColor:
     White = 15
 
 
+class LogLevel:
+    """Levels of Logger.Log() and Logger.ColorfulLog()."""
+    Debug = 10
+    Info = 20
+    Warning = 30
+    Error = 40
+
+
 class ConsoleScreenBufferInfo(ctypes.Structure):
     _fields_ = [
         ('dwSize', ctypes.wintypes._COORD),
@@ -78,6 +117,8 @@ def SetConsoleColor(color: int) -> bool:
     """
     global _ConsoleOutputHandle
     global _DefaultConsoleColor
+    if not hasattr(ctypes, 'windll'):
+        return False
     if not _DefaultConsoleColor:
         if not _ConsoleOutputHandle:
             _ConsoleOutputHandle = ctypes.c_void_p(
@@ -96,1451 +137,7155 @@ def ResetConsoleColor() -> bool:
     Reset to the default text color on console window.
     Return bool, True if succeed otherwise False.
     """
+    if not hasattr(ctypes, 'windll') or _DefaultConsoleColor is None:
+        return False
     if sys.stdout:
         sys.stdout.flush()
     return bool(ctypes.windll.kernel32.SetConsoleTextAttribute(_ConsoleOutputHandle, ctypes.c_ushort(_DefaultConsoleColor)))
 
 
+# ANSI escape sequences of ConsoleColor
+_ANSI_RESET = '\x1b[0m'
+_ANSI_COLOR = {
+    ConsoleColor.Black: '\x1b[30m',
+    ConsoleColor.DarkBlue: '\x1b[34m',
+    ConsoleColor.DarkGreen: '\x1b[32m',
+    ConsoleColor.DarkCyan: '\x1b[36m',
+    ConsoleColor.DarkRed: '\x1b[31m',
+    ConsoleColor.DarkMagenta: '\x1b[35m',
+    ConsoleColor.DarkYellow: '\x1b[33m',
+    ConsoleColor.Gray: '\x1b[37m',
+    ConsoleColor.DarkGray: '\x1b[90m',
+    ConsoleColor.Blue: '\x1b[94m',
+    ConsoleColor.Green: '\x1b[92m',
+    ConsoleColor.Cyan: '\x1b[96m',
+    ConsoleColor.Red: '\x1b[91m',
+    ConsoleColor.Magenta: '\x1b[95m',
+    ConsoleColor.Yellow: '\x1b[93m',
+    ConsoleColor.White: '\x1b[97m',
+}
+
+
+def EnableVirtualTerminal() -> bool:
+    """
+    Enable the virtual terminal processing (ANSI escape sequences) on console window.
+    Return bool, True if the console supports ANSI escape sequences otherwise False.
+    """
+    if not hasattr(ctypes, 'windll'):
+        return True
+    try:
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(_StdOutputHandle)
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
+
+
+def DetectConsoleMode() -> Literal["ansi", "win32", "none"]:
+    """
+    Detect how to color texts on the standard output.
+    Return "ansi" for ANSI escape sequences, "win32" for the Win32 console attributes,
+    or "none" if the standard output is not a console.
+    """
+    try:
+        isTTY = bool(sys.stdout) and sys.stdout.isatty()
+    except Exception:
+        isTTY = False
+    if not isTTY:
+        return "none"
+    if EnableVirtualTerminal():
+        return "ansi"
+    return "win32"
+
+
+def ColorizeAnsi(segments: Iterable[Tuple[str, int]]) -> str:
+    """
+    Join (text, color) segments into one string with ANSI escape sequences.
+    color: integer, a value in class `ConsoleColor`. Texts with an invalid color are not colored.
+    """
+    texts = []
+    for t, c in segments:
+        if c in _ANSI_COLOR:
+            # Reset before the line ending, so that the next line is not colored
+            body = t.rstrip('\r\n')
+            texts.append(_ANSI_COLOR[c] + body + _ANSI_RESET + t[len(body):])
+        else:
+            texts.append(t)
+    return ''.join(texts)
+
+
 ################################################################################
-#################################### Logger ####################################
+################################### LogSink ####################################
 ################################################################################
-class Logger:
+class LogSink:
     """
-    Logger for print and log. Support for printing log with different colors on console.
+    A persistent and buffered log file handle used by Logger.
+
+    Instead of opening, appending and closing the log file for every log line, a LogSink keeps
+    the file opened and writes the buffered lines once the buffer is larger than `MaxBufferSize`
+    bytes or older than `MaxBufferAge` seconds. A background thread flushes aged buffers and all
+    the buffers are flushed at exit or on an uncaught exception.
     """
-    FileName = '@AutomationLog.txt'
-    _SelfFileName = os.path.split(__file__)[1]
-    ColorNames = {
-        "Black": ConsoleColor.Black,
-        "DarkBlue": ConsoleColor.DarkBlue,
-        "DarkGreen": ConsoleColor.DarkGreen,
-        "DarkCyan": ConsoleColor.DarkCyan,
-        "DarkRed": ConsoleColor.DarkRed,
-        "DarkMagenta": ConsoleColor.DarkMagenta,
-        "DarkYellow": ConsoleColor.DarkYellow,
-        "Gray": ConsoleColor.Gray,
-        "DarkGray": ConsoleColor.DarkGray,
-        "Blue": ConsoleColor.Blue,
-        "Green": ConsoleColor.Green,
-        "Cyan": ConsoleColor.Cyan,
-        "Red": ConsoleColor.Red,
-        "Magenta": ConsoleColor.Magenta,
-        "Yellow": ConsoleColor.Yellow,
-        "White": ConsoleColor.White,
-    }
+    # Default flushing limits
+    MaxBufferSize = 64 * 1024
+    MaxBufferAge = 1.0
+    # Period in seconds for the background thread to check aged buffers
+    FlushInterval = 0.5
+    # Default `fsync` of sinks got from LogSink.get(), so urgent writes such as errors survive a crash of the OS
+    Fsync = True
 
-    @staticmethod
-    def WriteProgress(counts: int, total: int, log: str = "", width: int = 50, unit: str = "", consoleColor: int = ConsoleColor.Default) -> None:
+    _Sinks: Dict[str, 'LogSink'] = dict()
+    _SinksLock = threading.Lock()
+    _FlushThread: threading.Thread = None
+    _Hooked = False
+    # Calibrated cost in seconds of the legacy open/append/close per line
+    _LegacyLineCost: float = None
+
+    def __init__(self, fileName: str, maxBufferSize: int = None, maxBufferAge: float = None, fsync: bool = False) -> None:
         """
-        Write a progress bar with the given counts of total.
+        Construct a LogSink for the given file.
 
         Parameters
         ----------
-        counts : integer.
-            Current counts of a progress.
-        total : integer.
-            Total counts of a progress.
-        log : string, optional.
-            Log message before the progress bar (default: ""). Usually passing 'Waiting' or 'Progressing'.
-        width : integer, optional.
-            The width in letters of the progress bar (default: 50).
-        unit : string, optional.
-            Unit of the counts (default: ""). Ususally passing a time unit like 's' and 'min'.
-            For example, by passing 's' will have an output '1 s / 10 s  10%'; otherwise, '1 / 10  10%'
-        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
-            Text's color on console (default: ConsoleColor.White).
+        fileName : string.
+            The log file to append to.
+        maxBufferSize : integer, optional.
+            Bytes to be buffered before writing to the file (default: None). None to use `LogSink.MaxBufferSize`.
+        maxBufferAge : float, optional.
+            Seconds a line can stay in the buffer (default: None). None to use `LogSink.MaxBufferAge`.
+        fsync : bool, optional.
+            True to also call `os.fsync()` for urgent writes and explicit synced flushes (default: False).
 
         Notes
         -----
-        * Logger.WriteProgress should always be used with vairables updated in loops; Please check the Examples section
-
-        Examples
-        --------
-        To init a new progress bar with 1 / 10, simply do this:
-
-        >>> Logger.WriteProgress(1, 10)
-        |                                                  | 1 / 10  10.00%
-
-        Adding log message and count units:
+        * A LogSink is usually got from `LogSink.get()`, so that every file has only one opened handle.
 
-        >>> Logger.WriteProgress(1, 10, log='Waiting', unit='s')
-        Waiting|                                                  | 1 s / 10 s  10.00%
+        """
+        self.fileName: str = fileName
+        self.maxBufferSize: int = LogSink.MaxBufferSize if maxBufferSize is None else maxBufferSize
+        self.maxBufferAge: float = LogSink.MaxBufferAge if maxBufferAge is None else maxBufferAge
+        self.fsync: bool = fsync
 
-        The following code shows a small demo of having progress bar randomly increasing:
+        self._file = None
+        self._buffer: List[str] = []
+        self._bufferSize: int = 0
+        self._bufferSince: float = 0
+        self._lock = threading.RLock()
 
-        >>> import random
-        >>> counts = 0
-        >>> total = 100 # Total counts will be 100
-        >>> Logger.WriteProgress(counts, total) # Starting the progress bar from 0 to 100
-        >>> while counts < total:
-        >>>     counts += random.randint(0, 5) # Randomly increasing the progress bar.
-        >>>     Logger.WriteProgress(counts, total) # Updating the progress bar on console
+        # Rotation, see LogSink.setRotation()
+        self.maxBytes: int = 0
+        self.compress: bool = True
+        self._size: int = None
+        self._segment: int = None
+        self._segmentMarks: List[int] = []
 
-        """
-        isValidColor = (
-            consoleColor >= ConsoleColor.Black and consoleColor <= ConsoleColor.White)
-        if isValidColor:
-            SetConsoleColor(consoleColor)
-        # sys.stdout.write(' ' * (width + 9) + '\r')
-        # sys.stdout.flush()
-        progress = int(width * counts / total)
-        sys.stdout.write(log + '|' + '█' * progress +
-                         ' ' * int(width - progress) + '|')
-        if unit == "" or unit is None:
-            sys.stdout.write(
-                ' {0} / {1}  {2}%\r'.format(int(counts), total, ('%.2f' % (100*counts/total))))
-        else:
-            sys.stdout.write(' {0} {3} / {1} {3}  {2}%\r'.format(int(counts),
-                             total, ('%.2f' % (100*counts/total)), unit))
-        if progress == width:
-            sys.stdout.write('\n')
-        if isValidColor:
-            ResetConsoleColor()
-        sys.stdout.flush()
+        # Statistics
+        self._writes: int = 0
+        self._flushes: int = 0
+        self._bytes: int = 0
+        self._ioTime: float = 0
 
     @staticmethod
-    def CountProgress(total: int, log: str = "Progressing", step: int = 1, width: int = 50, consoleColor: int = ConsoleColor.Default) -> None:
+    def get(fileName: str, fsync: bool = None) -> 'LogSink':
         """
-        Write a progress bar counting down in seconds.
+        Get the shared LogSink of a file, a new LogSink will be created if not exists.
 
         Parameters
         ----------
-        total : integer.
-            Total counts of a progress.
-        log : string, optional.
-            Log message before the progress bar (default: "Progressing"). Usually passing 'Waiting' or 'Progressing'.
-        step : integer, optional.
-            Steps or period to update the progress bar in seconds (default: 1).
-        width : integer, optional
-            The width in letters of the progress bar (default: 50).
-        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
-            Text's color on console (default: ConsoleColor.White).
+        fileName : string.
+            The log file.
+        fsync : bool, optional.
+            Set `fsync` of the sink (default: None). None to keep it, or to use `LogSink.Fsync` for a new sink.
 
-        Examples
-        --------
-        To show a progress bar uniformly progressing for 10 seconds with step 1:
+        Returns
+        -------
+        get : LogSink.
+            The shared LogSink of the file.
 
-        >>> Logger.WriteProgress(10, log="Progressing", step=1)
-        Progressing|                                                  | 0 s / 10 s  0.00%
-        Progressing|█                                                 | 1 s / 10 s  10.00%
-        Progressing|██                                                | 2 s / 10 s  20.00%
-        ......
+        """
+        sink = LogSink._Sinks.get(fileName)
+        if sink is None:
+            with LogSink._SinksLock:
+                sink = LogSink._Sinks.get(fileName)
+                if sink is None:
+                    sink = LogSink(fileName, fsync=LogSink.Fsync if fsync is None else fsync)
+                    LogSink._Sinks[fileName] = sink
+                    LogSink._startFlushThread()
+                    return sink
+        if fsync is not None:
+            sink.fsync = fsync
+        return sink
 
-        or just simply use the following code and will prodcue the same output:
+    def write(self, text: str, urgent: bool = False) -> None:
+        """
+        Buffer a text to be written into the file.
 
-        >>> Logger.WriteProgress(10)
-        Progressing|                                                  | 0 s / 10 s  0.00%
-        Progressing|█                                                 | 1 s / 10 s  10.00%
-        Progressing|██                                                | 2 s / 10 s  20.00%
-        ......
+        Parameters
+        ----------
+        text : string.
+            Text to be written.
+        urgent : bool, optional.
+            True to write the buffer to disk immediately (default: False). Usually used for error messages.
 
         """
-        for counts in range(0, total+1, step):
-            Logger.WriteProgress(counts, total, log, width, "s", consoleColor)
-            time.sleep(step)
+        with self._lock:
+            if not self._buffer:
+                self._bufferSince = time.monotonic()
+            self._buffer.append(text)
+            self._bufferSize += len(text)
+            self._writes += 1
+            if urgent:
+                self.flush(sync=True)
+            elif self._bufferSize >= self.maxBufferSize:
+                self.flush()
 
-    @staticmethod
-    def SetLogFile(path: str) -> None:
+    def flush(self, sync: bool = False) -> None:
         """
-        Set Log file.
+        Write the buffered texts to the file.
 
         Parameters
         ----------
-        path : string.
-            Log file to be used.
-
-        """
-        Logger.FileName = path
+        sync : bool, optional.
+            True to force the OS to write the file onto disk if `fsync` is enabled (default: False).
 
-    @staticmethod
-    def Write(log: Any, consoleColor: int = ConsoleColor.Default, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None, printTruncateLen: int = 0) -> None:
         """
-        Write logs to Console.
+        with self._lock:
+            if not self._buffer and not sync:
+                return
+            t = time.perf_counter()
+            try:
+                if self._file is None:
+                    self._file = open(self.fileName, 'ab')
+                    self._size = os.fstat(self._file.fileno()).st_size
+                if self._buffer:
+                    data = ''.join(self._buffer)
+                    if os.linesep != '\n':
+                        data = data.replace('\n', os.linesep)
+                    data = data.encode('utf-8')
+                    self._file.write(data)
+                    self._bytes += len(data)
+                    self._size += len(data)
+                self._file.flush()
+                if sync and self.fsync:
+                    os.fsync(self._file.fileno())
+            except Exception as ex:
+                if sys.stdout:
+                    sys.stdout.write(ex.__class__.__name__ +
+                                     ': can\'t write the log!')
+            finally:
+                self._buffer = []
+                self._bufferSize = 0
+                self._flushes += 1
+                self._ioTime += time.perf_counter() - t
+            if self.maxBytes > 0 and self._size is not None and self._size >= self.maxBytes:
+                self.rotate()
+
+    def flushIfAged(self) -> None:
+        """Flush the buffer if the oldest buffered line is older than `maxBufferAge`."""
+        if self._buffer and time.monotonic() - self._bufferSince >= self.maxBufferAge:
+            self.flush()
+
+    def close(self) -> None:
+        """Flush the buffer and close the file handle."""
+        with self._lock:
+            self.flush()
+            if self._file is not None:
+                try:
+                    self._file.close()
+                except Exception:
+                    pass
+                self._file = None
+
+    ################################# Rotation #################################
+    def setRotation(self, maxBytes: int = 0, compress: bool = True) -> None:
+        """
+        Set the rotation of this log file.
 
         Parameters
         ----------
-        log : Any type. A string is preferred.
-            Logs text
-        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
-            Text's color on console (default: ConsoleColor.White).
-        writeToFile : bool, optional.
-            True to write logs into a file (default: True).
-        printToStdout : bool, optional.
-            True to print to standard output (default: True).
-        logFile : str, optional.
-            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
-        printTruncateLen : integer, optional.
-            If <= 0, log is not truncated when print.
+        maxBytes : integer, optional.
+            Rotate the file once it is larger than `maxBytes` bytes (default: 0). 0 to rotate only by `LogSink.rotate()`.
+        compress : bool, optional.
+            True to gzip the rotated segments on the background LogCompressor thread (default: True).
 
         Notes
         -----
-        'ConsoleColor' (or Logger.ColorNames) currently has supported the following colors:
+        The rotated segments are named as '{name}.{segment:04}{ext}', such as '@AutomationLog.0001.txt',
+        and '@AutomationLog.0001.txt.gz' once compressed. Marks and segments are recorded in the index
+        file '{name}.index.jsonl', please see more in `LogSink.mark()` and `LogSink.readFrom()`.
 
-        ============  ===========
-            Color       integer
-        ============  ===========
-        Default       -1
-        Black         0
-        DarkBlue      1
-        DarkGreen     2
-        DarkCyan      3
-        DarkRed       4
-        DarkMagenta   5
-        DarkYellow    6
-        Gray          7
-        DarkGray      8
-        Blue          9
-        Green         10
-        Cyan          11
-        Red           12
-        Magenta       13
-        Yellow        14
-        White         15
-        ============  ===========
+        """
+        self.maxBytes = maxBytes
+        self.compress = compress
 
-        Examples
-        --------
-        Logger.Write() is mainly used by other Logger Functions.
+    def getIndexName(self) -> str:
+        """Get the index file name of this log file."""
+        return '%s.index.jsonl' % os.path.splitext(self.fileName)[0]
 
-        Logger.WriteLine() utilize this function to write logs to console line, and change a new line
-        for next log, by adding `\\n` in log parameter.
+    def getSegmentName(self, segment: int) -> str:
+        """Get the file name of a rotated segment of this log file."""
+        name, ext = os.path.splitext(self.fileName)
+        return '%s.%04d%s' % (name, segment, ext)
 
-        >>> Logger.Write('{}\\n'.format(log), consoleColor, writeToFile, printToStdout, logFile)
+    def mark(self, **fields: Any) -> None:
+        """
+        Record the current segment and byte offset of this log file into the index file.
 
-        Logger.WriteFlush() utilize this function to write logs to console line, and will overwrite
-        the current line with next log, by adding `\\r` in log parameter.
+        Examples
+        --------
+        >>> LogSink.get(Logger.FileName).mark(loop=412, game="Borderlands3")
 
-        >>> Logger.Write('{}\\r'.format(log), consoleColor, writeToFile, printToStdout, logFile)
+        """
+        with self._lock:
+            self.flush()
+            self._loadSegment()
+            if self._size is None:
+                self._size = os.path.getsize(
+                    self.fileName) if os.path.isfile(self.fileName) else 0
+            entry = {"seg": self._segment, "offset": self._size}
+            entry.update(fields)
+            self._segmentMarks.append(self._size)
+            LogSink._appendIndex(self.getIndexName(), [entry])
 
+    def rotate(self) -> str:
         """
-        if not isinstance(log, str):
-            log = str(log)
-        if printToStdout and sys.stdout:
-            isValidColor = (
-                consoleColor >= ConsoleColor.Black and consoleColor <= ConsoleColor.White)
-            if isValidColor:
-                SetConsoleColor(consoleColor)
-            try:
-                if printTruncateLen > 0 and len(log) > printTruncateLen:
-                    sys.stdout.write(log[:printTruncateLen] + '...')
+        Close the current log file, rename it as the next rotated segment, and start a new file.
+
+        Returns
+        -------
+        rotate : string.
+            The rotated segment name, or None if the current log file is empty.
+
+        """
+        with self._lock:
+            self.flush()
+            self._loadSegment()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._size = 0
+            if not os.path.isfile(self.fileName) or os.path.getsize(self.fileName) == 0:
+                return None
+            segmentName = self.getSegmentName(self._segment)
+            os.replace(self.fileName, segmentName)
+            LogSink._appendIndex(self.getIndexName(), [
+                                 {"seg": self._segment, "rotated": segmentName}])
+            if self.compress:
+                LogCompressor.submit(segmentName, self._segment, list(
+                    self._segmentMarks), self.getIndexName())
+            self._segment += 1
+            self._segmentMarks = []
+            return segmentName
+
+    def locate(self, **fields: Any) -> Tuple[str, int, int]:
+        """
+        Find the last mark with the given fields in the index file.
+
+        Returns
+        -------
+        locate : Tuple[str, int, int].
+            A tuple (path, offset, zoffset), where `offset` is the byte offset in the uncompressed segment and
+            `zoffset` is the byte offset of the gzip member in a compressed segment (None if not compressed).
+            Return None if no mark matches.
+
+        """
+        with self._lock:
+            self.flush()
+            self._loadSegment()
+            currentSegment = self._segment
+        found = None
+        zoffsets = dict()
+        items = list(fields.items())
+        for entry in LogSink._readIndex(self.getIndexName()):
+            if "zoffset" in entry:
+                zoffsets[(entry["seg"], entry["offset"])] = entry["zoffset"]
+            elif "offset" in entry:
+                for key, value in items:
+                    if entry.get(key) != value:
+                        break
                 else:
-                    sys.stdout.write(log)
-            except Exception as ex:
-                SetConsoleColor(ConsoleColor.Red)
-                isValidColor = True
-                sys.stdout.write(ex.__class__.__name__ +
-                                 ': can\'t print the log!')
-                if log.endswith('\n'):
-                    sys.stdout.write('\n')
-            if isValidColor:
-                ResetConsoleColor()
-            sys.stdout.flush()
-        if not writeToFile:
-            return
-        fileName = logFile if logFile else Logger.FileName
-        fout = None
-        try:
-            fout = open(fileName, 'a+', encoding='utf-8')
-            fout.write(log)
-        except Exception as ex:
-            if sys.stdout:
-                sys.stdout.write(ex.__class__.__name__ +
-                                 ': can\'t write the log!')
-        finally:
-            if fout:
-                fout.close()
+                    found = (entry["seg"], entry["offset"])
+        if found is None:
+            return None
+        segment, offset = found
+        if segment == currentSegment:
+            return self.fileName, offset, None
+        segmentName = self.getSegmentName(segment)
+        if os.path.isfile(segmentName):
+            return segmentName, offset, None
+        return segmentName + '.gz', offset, zoffsets.get(found, 0)
 
-    @staticmethod
-    def WriteLine(log: Any, consoleColor: int = -1, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None) -> None:
+    def readFrom(self, **fields: Any) -> Iterator[str]:
         """
-        Write logs to Console with a new line.
-
-        Parameters
-        ----------
-        log : Any type. A string is preferred.
-            Logs text
-        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
-            Text's color on console (default: ConsoleColor.White).
-        writeToFile : bool, optional.
-            True to write logs into a file (default: True).
-        printToStdout : bool, optional.
-            True to print to standard output (default: True).
-        logFile : str, optional.
-            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
-        printTruncateLen : integer, optional.
-            If <= 0, log is not truncated when print.
+        Lazily read lines of the log starting from the last mark with the given fields,
+        by seeking into the located segment instead of scanning the whole log.
 
-        Notes
-        -----
-        * This function utilize Logger.Write(), please see more details in Logger.Write().
-        * Parameters of this functions must fully satisfy Logger.Write() specification.
+        Returns
+        -------
+        readFrom : Iterator[str].
+            An iterator of log lines. Empty if no mark matches.
 
         Examples
         --------
-        To easily utilize Logger.WriteLine() to log error or warning message for this package:
+        >>> for line in LogSink.get(Logger.FileName).readFrom(loop=412, game="Borderlands3"):
+        >>>     print(line, end="")
 
-        >>> # The following line of code will log a message with Red color on console, representing an Error Message.
-        >>> Logger.WriteLine('ERROR: This is an error message.'.format(log), consoleColor=ConsoleColor.Red)
-        ERROR: This is an error message.
+        """
+        location = self.locate(**fields)
+        if location is None:
+            return
+        path, offset, zoffset = location
+        with open(path, 'rb') as raw:
+            if zoffset is None:
+                raw.seek(offset)
+                stream = raw
+            else:
+                raw.seek(zoffset)
+                stream = gzip.GzipFile(fileobj=raw, mode='rb')
+            for line in io.TextIOWrapper(stream, encoding='utf-8', errors='replace'):
+                yield line
+
+    def _loadSegment(self) -> None:
+        """Load the current segment number and its marks from the index file once."""
+        if self._segment is not None:
+            return
+        segment = 1
+        marks = []
+        for entry in LogSink._readIndex(self.getIndexName()):
+            if "rotated" in entry:
+                segment = max(segment, entry["seg"] + 1)
+                marks = []
+            elif "offset" in entry and "zoffset" not in entry and entry["seg"] >= segment:
+                marks.append(entry["offset"])
+        self._segment = segment
+        self._segmentMarks = marks
 
-        >>> # The following line of code will log a message with Yellow color on console, representing a Warning Message.
-        >>> Logger.WriteLine('Warning: This is a warning message.'.format(log), consoleColor=ConsoleColor.Red)
-        Warning: This is a warning message.
+    @staticmethod
+    def _appendIndex(indexName: str, entries: List[Dict[str, Any]]) -> None:
+        """Append entries to an index file and write them immediately."""
+        sink = LogSink.get(indexName)
+        for entry in entries:
+            sink.write(json.dumps(entry, separators=(',', ':'), default=str) + '\n')
+        sink.flush()
 
-        The following code by using Looger.Write() will have the same output as above:
+    @staticmethod
+    def _readIndex(indexName: str) -> Iterator[Dict[str, Any]]:
+        """Lazily read the entries of an index file."""
+        if indexName in LogSink._Sinks:
+            LogSink._Sinks[indexName].flush()
+        if not os.path.isfile(indexName):
+            return
+        with open(indexName, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
 
-        >>> # The following line of code will log a message with Red color on console, representing an Error Message.
-        >>> Logger.Write('ERROR: This is an error message.\\n'.format(log), consoleColor=ConsoleColor.Red)
-        ERROR: This is an error message.
+    def getStats(self) -> Dict[str, float]:
+        """
+        Get the statistics of this LogSink, compared with the legacy open/append/close per line.
 
-        >>> # The following line of code will log a message with Yellow color on console, representing a Warning Message.
-        >>> Logger.Write('Warning: This is a warning message.\\n'.format(log), consoleColor=ConsoleColor.Red)
-        Warning: This is a warning message.
+        Returns
+        -------
+        getStats : Dict[str, float].
+            A dictionary with the following keys:
+                writes - lines written.\n
+                flushes - times the buffer was written to the file.\n
+                bytes - characters written to the file.\n
+                ioTime - seconds spent in file I/O.\n
+                legacyTime - estimated seconds the legacy path would spend for the same lines.\n
+                savedTime - estimated seconds saved.
+
+        """
+        legacyTime = self._writes * LogSink.calibrate(os.path.dirname(os.path.abspath(self.fileName)))
+        return {
+            "writes": self._writes,
+            "flushes": self._flushes,
+            "bytes": self._bytes,
+            "ioTime": self._ioTime,
+            "legacyTime": legacyTime,
+            "savedTime": legacyTime - self._ioTime,
+        }
 
+    @staticmethod
+    def calibrate(directory: str = None, samples: int = 200) -> float:
         """
-        Logger.Write('{}\n'.format(log), consoleColor,
-                     writeToFile, printToStdout, logFile)
-
-    @staticmethod
-    def WriteFlush(log: Any, consoleColor: int = ConsoleColor.Default, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None, printTruncateLen: int = 0) -> None:
-        """
-        Write logs to Console by overwriting the current line.
+        Measure the cost of the legacy open/append/close path for one line.
 
         Parameters
         ----------
-        log : Any type. A string is preferred.
-            Logs text
-        consoleColor : integer, optional.  A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
-            Text's color on console (default: ConsoleColor.White).
-        writeToFile : bool, optional.
-            True to write logs into a file (default: True).
-        printToStdout : bool, optional.
-            True to print to standard output (default: True).
-        logFile : str, optional.
-            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
-        printTruncateLen : integer, optional.
-            If <= 0, log is not truncated when print.
-
-        Notes
-        -----
-        * This function utilize Logger.Write(), please see more details in Logger.Write().
-        * Parameters of this functions must fully satisfy Logger.Write() specification.
-
-        Examples
-        --------
-        To easily utilize Logger.WriteFlush() to log error or warning message for this package:
-
-        >>> # The following line of code will log a message with Red color on console, representing an Error Message.
-        >>> Logger.WriteFlush('ERROR: This is an error message.'.format(log), consoleColor=ConsoleColor.Red)
-
-        >>> # The following line of code will log a message with Yellow color on console, representing a Warning Message.
-        >>> Logger.WriteFlush('Warning: This is a warning message.'.format(log), consoleColor=ConsoleColor.Red)
-
-        The following code by using Looger.Write() will have the same output as above:
-
-        >>> # The following line of code will log a message with Red color on console, representing an Error Message.
-        >>> Logger.Write('ERROR: This is an error message.\\r'.format(log), consoleColor=ConsoleColor.Red)
-        ERROR: This is an error message.
+        directory : string, optional.
+            Directory to measure in (default: None). None to use the current working directory.
+        samples : integer, optional.
+            Lines to be measured (default: 200).
 
-        >>> # The following line of code will log a message with Yellow color on console, representing a Warning Message.
-        >>> Logger.Write('Warning: This is a warning message.\\r'.format(log), consoleColor=ConsoleColor.Red)
-        Warning: This is a warning message.
+        Returns
+        -------
+        calibrate : float.
+            Seconds for one line. The result is measured once and cached.
 
         """
-        Logger.Write('{}\r'.format(log), consoleColor,
-                     writeToFile, printToStdout, logFile)
+        if LogSink._LegacyLineCost is not None:
+            return LogSink._LegacyLineCost
+        fileName = os.path.join(directory or os.getcwd(),
+                                '@LogSinkCalibrate_%s.txt' % os.getpid())
+        line = '%s\n' % ('-' * 80)
+        try:
+            t = time.perf_counter()
+            for _ in range(samples):
+                fout = open(fileName, 'a+', encoding='utf-8')
+                fout.write(line)
+                fout.close()
+            LogSink._LegacyLineCost = (time.perf_counter() - t) / samples
+        except Exception:
+            LogSink._LegacyLineCost = 0
+        finally:
+            if os.path.exists(fileName):
+                os.remove(fileName)
+        return LogSink._LegacyLineCost
 
     @staticmethod
-    def ColorfulWrite(log: str, consoleColor: int = -1, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None) -> None:
+    def flushAll(sync: bool = False) -> None:
         """
-        Can write colorful logs to Console by using brackets.
+        Flush all the opened LogSinks.
 
         Parameters
         ----------
-        log : Sting
-            Logs text
-        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
-            Text's color on console (default: ConsoleColor.White).
-        writeToFile : bool, optional.
-            True to write logs into a file (default: True).
-        printToStdout : bool, optional.
-            True to print to standard output (default: True).
-        logFile : str, optional.
-            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
-        printTruncateLen : integer, optional.
-            If <= 0, log is not truncated when print.
-
-        Notes
-        -----
-        * Parameters of this functions must fully satisfy Logger.Write() specification.
-
-        Examples
-        --------
-        Logger.ColorfulWrite() can print colorfull outputs by using brackets:
-
-        >>> ColorfulWrite('Hello <Color=Green>Green</Color>!!')
-        Hello Green!!
-
-        where 'Hello' has default ConsoleColor (which is White), and 'Green' will be printed
-        in ConsoleColor.Green (which is Green).
-
-        The value on the right of `Color=Green` must be in Logger.ColorNames.
+        sync : bool, optional.
+            Passed to `LogSink.flush()` (default: False).
 
         """
-        text = []
-        start = 0
-        while True:
-            index1 = log.find('<Color=', start)
-            if index1 >= 0:
-                if index1 > start:
-                    text.append((log[start:index1], consoleColor))
-                index2 = log.find('>', index1)
-                colorName = log[index1+7:index2]
-                index3 = log.find('</Color>', index2 + 1)
-                text.append((log[index2 + 1:index3],
-                            Logger.ColorNames[colorName]))
-                start = index3 + 8
-            else:
-                if start < len(log):
-                    text.append((log[start:], consoleColor))
-                break
-        for t, c in text:
-            Logger.Write(t, c, writeToFile, printToStdout, logFile)
+        for sink in list(LogSink._Sinks.values()):
+            sink.flush(sync)
 
     @staticmethod
-    def ColorfulWriteLine(log: str, consoleColor: int = -1, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None) -> None:
+    def closeAll() -> None:
+        """Flush and close all the opened LogSinks."""
+        with LogSink._SinksLock:
+            sinks = list(LogSink._Sinks.values())
+            LogSink._Sinks.clear()
+        for sink in sinks:
+            sink.close()
+
+    @staticmethod
+    def release(fileName: str) -> None:
         """
-        Can write colorful logs to Console with a new line by using brackets.
+        Flush and close the LogSink of a file, so that the file can be moved or deleted.
 
         Parameters
         ----------
-        log : Sting
-            Logs text
-        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
-            Text's color on console (default: ConsoleColor.White).
-        writeToFile : bool, optional.
-            True to write logs into a file (default: True).
-        printToStdout : bool, optional.
-            True to print to standard output (default: True).
-        logFile : str, optional.
-            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
-        printTruncateLen : integer, optional.
-            If <= 0, log is not truncated when print.
-
-        Notes
-        -----
-        * This function utilize Logger.ColorfulWrite(), please see more details in Logger.ColorfulWrite().
-        * Parameters of this functions must fully satisfy Logger.Write() specification.
+        fileName : string.
+            The log file.
 
-        Examples
-        --------
-        Logger.ColorfulWriteLine() can print colorfull outputs with a new line by using brackets:
+        """
+        with LogSink._SinksLock:
+            sink = LogSink._Sinks.pop(fileName, None)
+        if sink is not None:
+            sink.close()
 
-        >>> ColorfulWriteLine('Hello <Color=Green>Green</Color>!!')
-        Hello Green!!
+    @staticmethod
+    def _startFlushThread() -> None:
+        """Start the background flushing thread and the exit hooks once."""
+        if not LogSink._Hooked:
+            LogSink._Hooked = True
+            atexit.register(LogSink.closeAll)
+            previousHook = sys.excepthook
+
+            def excepthook(*args):
+                LogSink.flushAll(sync=True)
+                previousHook(*args)
+            sys.excepthook = excepthook
+        if LogSink._FlushThread is None or not LogSink._FlushThread.is_alive():
+            LogSink._FlushThread = threading.Thread(
+                target=LogSink._flushLoop, name="LogSinkFlush", daemon=True)
+            LogSink._FlushThread.start()
 
-        where 'Hello' has default ConsoleColor (which is White), and Green will be printed
-        in ConsoleColor.Green (which is Green).
+    @staticmethod
+    def _flushLoop() -> None:
+        """Background loop flushing aged buffers."""
+        while True:
+            time.sleep(LogSink.FlushInterval)
+            for sink in list(LogSink._Sinks.values()):
+                sink.flushIfAged()
+            Logger._PersistCrashContextIfDue()
 
-        The value on the right of `Color=Green` must be in Logger.ColorNames.
 
-        The following code by using Looger.Write() will have the same output with same style as above:
+################################################################################
+################################ LogCompressor #################################
+################################################################################
+class LogCompressor:
+    """
+    A low-priority background thread compressing rotated log segments.
 
-        >>> Logger.ColorfulWrite('Hello <Color=Green>Green</Color>!!')
-        Hello Green!!
+    Every segment is compressed into a multi-member gzip file with one member per mark, and the
+    compressed offset of every member is recorded in the index file, so that a mark can be read
+    by seeking into the compressed segment.
+    """
+    # Bytes to compress before yielding the thread
+    ChunkSize = 256 * 1024
 
-        """
-        Logger.ColorfulWrite(log + '\n', consoleColor,
-                             writeToFile, printToStdout, logFile)
+    _Queue = queue.Queue()
+    _Thread: threading.Thread = None
 
     @staticmethod
-    def Log(log: Any = '', consoleColor: int = -1, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None) -> None:
+    def submit(path: str, segment: int, marks: List[int], indexName: str) -> None:
         """
-        Write logs to Console with current time information.
+        Submit a rotated segment to be compressed.
 
         Parameters
         ----------
-        log : Any type. A string is preferred.
-            Logs text
-        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
-            Text's color on console (default: ConsoleColor.White).
-        writeToFile : bool, optional.
-            True to write logs into a file (default: True).
-        printToStdout : bool, optional.
-            True to print to standard output (default: True).
-        logFile : str, optional.
-            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
-        printTruncateLen : integer, optional.
-            If <= 0, log is not truncated when print.
-
-        Notes
-        -----
-        * Parameters of this functions must fully satisfy Logger.Write() specification.
-
-        Examples
-        --------
-        >>> Logger.Log("This line used Logger.Log()!")
-        2021-07-07 14:56:24.345 test.py[3] <module> -> This line used Logger.Log()!
+        path : string.
+            The rotated segment file.
+        segment : integer.
+            The segment number.
+        marks : List[int].
+            Byte offsets of the marks in this segment.
+        indexName : string.
+            The index file to record compressed offsets in.
 
         """
-        frameCount = 1
-        while True:
-            frame = sys._getframe(frameCount)
-            _, scriptFileName = os.path.split(frame.f_code.co_filename)
-            if scriptFileName != Logger._SelfFileName:
-                break
-            frameCount += 1
+        LogCompressor._Queue.put((path, segment, marks, indexName))
+        if LogCompressor._Thread is None or not LogCompressor._Thread.is_alive():
+            LogCompressor._Thread = threading.Thread(
+                target=LogCompressor._run, name="LogCompressor", daemon=True)
+            LogCompressor._Thread.start()
 
-        t = datetime.datetime.now()
-        log = '{}-{:02}-{:02} {:02}:{:02}:{:02}.{:03} {}[{}] {} -> {}\n'.format(
-            t.year, t.month, t.day, t.hour, t.minute, t.second, t.microsecond // 1000, scriptFileName, frame.f_lineno, frame.f_code.co_name, log)
-        Logger.Write(log, consoleColor, writeToFile, printToStdout, logFile)
+    @staticmethod
+    def wait() -> None:
+        """Wait until every submitted segment is compressed."""
+        LogCompressor._Queue.join()
 
     @staticmethod
-    def ColorfulLog(log: str = '', consoleColor: int = -1, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None) -> None:
+    def compress(path: str, segment: int, marks: List[int], indexName: str) -> str:
         """
-        Write colorful logs to Console with current time information by using brackets.
-
-        Parameters
-        ----------
-        log : Any type. A string is preferred.
-            Logs text
-        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
-            Text's color on console (default: ConsoleColor.White).
-        writeToFile : bool, optional.
-            True to write logs into a file (default: True).
-        printToStdout : bool, optional.
-            True to print to standard output (default: True).
-        logFile : str, optional.
-            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
-        printTruncateLen : integer, optional.
-            If <= 0, log is not truncated when print.
-
-        Notes
-        -----
-        * Parameters of this functions must fully satisfy Logger.Write() specification.
-
-        Examples
-        --------
-        >>> Logger.Log("This line used <Color=DarkGray>Logger.Log()</Color>!")
-        2021-07-07 14:56:24.345 test.py[3] <module> -> This line used Logger.Log()!
-
-        where 'This line used' and '!' has default ConsoleColor (which is White), and 'Logger.Log()' will be printed
-        in ConsoleColor.DarkGray (which is DarkGray).
+        Compress a rotated segment into '{path}.gz' and remove the original segment.
 
-        The value on the right of `Color=DarkGray` must be in Logger.ColorNames.
+        Returns
+        -------
+        compress : string.
+            The compressed file name.
+
+        """
+        size = os.path.getsize(path)
+        boundaries = sorted(set(m for m in marks if 0 < m < size))
+        starts = [0] + boundaries
+        ends = boundaries + [size]
+        entries = []
+        tmpName = path + '.gz.tmp'
+        with open(path, 'rb') as src, open(tmpName, 'wb') as dst:
+            for start, end in zip(starts, ends):
+                entries.append(
+                    {"seg": segment, "offset": start, "zoffset": dst.tell()})
+                with gzip.GzipFile(fileobj=dst, mode='wb') as member:
+                    remaining = end - start
+                    while remaining > 0:
+                        chunk = src.read(
+                            min(LogCompressor.ChunkSize, remaining))
+                        if not chunk:
+                            break
+                        member.write(chunk)
+                        remaining -= len(chunk)
+                        # Yield to the other threads
+                        time.sleep(0)
+        os.replace(tmpName, path + '.gz')
+        LogSink._appendIndex(indexName, entries)
+        os.remove(path)
+        return path + '.gz'
 
-        """
-        frameCount = 1
+    @staticmethod
+    def _run() -> None:
+        """Compressor thread loop."""
+        LogCompressor._lowerPriority()
         while True:
-            frame = sys._getframe(frameCount)
-            _, scriptFileName = os.path.split(frame.f_code.co_filename)
-            if scriptFileName != Logger._SelfFileName:
-                break
-            frameCount += 1
-
-        t = datetime.datetime.now()
-        log = '{}-{:02}-{:02} {:02}:{:02}:{:02}.{:03} {}[{}] {} -> {}\n'.format(
-            t.year, t.month, t.day, t.hour, t.minute, t.second, t.microsecond // 1000, scriptFileName, frame.f_lineno, frame.f_code.co_name, log)
-        Logger.ColorfulWrite(
-            log, consoleColor, writeToFile, printToStdout, logFile)
+            path, segment, marks, indexName = LogCompressor._Queue.get()
+            try:
+                LogCompressor.compress(path, segment, marks, indexName)
+            except Exception as ex:
+                if sys.stdout:
+                    sys.stdout.write(ex.__class__.__name__ +
+                                     ': can\'t compress the log %s!\n' % path)
+            finally:
+                LogCompressor._Queue.task_done()
 
     @staticmethod
-    def DeleteLog() -> None:
-        """Delete the log file."""
-        if os.path.exists(Logger.FileName):
-            os.remove(Logger.FileName)
+    def _lowerPriority() -> None:
+        """Lower the priority of the current thread as much as possible."""
+        try:
+            if sys.platform == 'win32':
+                # THREAD_MODE_BACKGROUND_BEGIN also lowers the I/O priority
+                kernel32 = ctypes.windll.kernel32
+                kernel32.SetThreadPriority(
+                    kernel32.GetCurrentThread(), 0x00010000)
+            elif hasattr(os, 'setpriority'):
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except Exception:
+            pass
 
 
 ################################################################################
-################################# Benchmarking #################################
+################################## LogWriter ###################################
 ################################################################################
-class Benchmarking:
-    """Benchmarking Methods for Automation Testing"""
-    # BM stands for BenchMarking
-    _ROTATE_ANGLE = [0, 90, 180, 270]
-
-    _BM_WAIT_TIME_MIN = 0
-    _BM_WAIT_TIME_MAX = 3
-
-    _KEY_PRESS_WAIT_TIME_MIN = 0
-    _KEY_PRESS_WAIT_TIME_MAX = 2
-
-    _RANDOM_KEY_LIST = [
-        "w",
-        "a",
-        "s",
-        "d",
-        "e",
-        "space",
-        "left_click",
-        "right_click"
-    ]
-    # "spacebar",
+class LogWriter:
+    """
+    A background thread draining preformatted log records to Console and log files.
 
-    _MOUSE_LIST = [
-        "left_click",
-        "right_click"
-    ]
-    # "view_upward",
-    # "view_downward",
-    # "view_leftward",
-    # "view_rightward"
+    Used by Logger in asynchronous mode (see `Logger.SetAsync()`), so that the thread performing
+    inputs only pays a queue put for every log.
+    """
+    POLICY_BLOCK = "block"
+    POLICY_DROP = "drop"
 
-    # Logger Progress Bar width
-    _WIDTH = 50
+    _STOP = None
 
-    @staticmethod
-    def NormalTest(duration: float) -> None:
+    def __init__(self, maxQueueSize: int = 10000, policy: Literal["block", "drop"] = "block") -> None:
         """
-        Perform a normal Benchmarking. No actions would be made.
+        Construct and start a LogWriter.
 
         Parameters
         ----------
-        duration : float.
-            Time to perform the normal benchmarking.
+        maxQueueSize : integer, optional.
+            Maximum records waiting in the queue (default: 10000). 0 for an unbounded queue.
+        policy : Literal["block", "drop"], optional.
+            What to do when the queue is full (default: "block"):
+                "block" - wait until the writer thread makes room.\n
+                "drop" - drop the record and count it in `LogWriter.dropped`. Urgent records are never dropped.
 
         """
-        Logger.CountProgress(duration, width=Benchmarking._WIDTH)
-        # time.sleep(duration)
+        if policy not in [LogWriter.POLICY_BLOCK, LogWriter.POLICY_DROP]:
+            policy = LogWriter.POLICY_BLOCK
+        self.policy: str = policy
+        self.dropped: int = 0
+        self._queue = queue.Queue(maxQueueSize)
+        self._thread = threading.Thread(
+            target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
 
-    @staticmethod
-    def RandomControlTest(duration: float) -> None:
+    def put(self, record: tuple, urgent: bool = False) -> bool:
         """
-        Perform a random Character Control for games.
+        Enqueue a log record, which are the arguments of `Logger._Output()`, or of `Logger._OutputLog()`
+        for logs captured by Logger.Log() and Logger.ColorfulLog() to be formatted on the writer thread.
 
         Parameters
         ----------
-        duration : float.
-            Time to perform the random character control.
+        record : tuple.
+            A preformatted log record.
+        urgent : bool, optional.
+            True for records such as Red errors (default: False), which wait for room even with the "drop" policy.
+
+        Returns
+        -------
+        put : bool.
+            Return True if the record is enqueued; otherwise, dropped and return False.
 
         """
-        waitTime = 0
-        tmp = Benchmarking._RANDOM_KEY_LIST.copy()
-        tmp.extend(Benchmarking._RANDOM_KEY_LIST)
+        if self.policy == LogWriter.POLICY_DROP and not urgent:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+                return False
+        else:
+            self._queue.put(record)
+        return True
 
-        total = duration
-        counts = 0
-        Logger.WriteProgress(
-            counts, total, width=Benchmarking._WIDTH)
-        while(duration > 0):
+    def flush(self) -> None:
+        """Wait until every enqueued record is written, then flush the log files."""
+        if self._thread.is_alive():
+            self._queue.join()
+        LogSink.flushAll()
+
+    def stop(self) -> None:
+        """Write the remaining records and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(LogWriter._STOP)
+            self._thread.join()
+        LogSink.flushAll()
+
+    def _run(self) -> None:
+        """Writer thread loop."""
+        while True:
+            record = self._queue.get()
+            try:
+                if record is LogWriter._STOP:
+                    return
+                # Logs captured by Logger.Log() are formatted on this thread
+                if len(record) == 9:
+                    Logger._OutputLog(*record)
+                else:
+                    Logger._Output(*record)
+            except Exception:
+                pass
+            finally:
+                self._queue.task_done()
 
-            waitTime = random.uniform(
-                Benchmarking._BM_WAIT_TIME_MIN, Benchmarking._BM_WAIT_TIME_MAX)
-            keyTime = random.uniform(
-                Benchmarking._KEY_PRESS_WAIT_TIME_MIN, Benchmarking._KEY_PRESS_WAIT_TIME_MAX)
-            action = random.choice(tmp)
 
-            if keyTime > duration:
-                keyTime = int(duration / 2)
-                waitTime = duration - keyTime
+################################################################################
+################################# ProgressBar ##################################
+################################################################################
+class ProgressBar:
+    """
+    A rate-limited progress bar renderer used by Logger.WriteProgress() and Logger.CountProgress().
 
-            if action in Benchmarking._MOUSE_LIST:
-                Benchmarking.mouseCharacterControl(action, keyTime)
-            elif action in Benchmarking._RANDOM_KEY_LIST:
-                Benchmarking.keyCharacterControl(action, keyTime)
-
-            duration -= keyTime
-            counts += keyTime
-            Logger.WriteProgress(
-                counts, total, width=Benchmarking._WIDTH, unit="s")
-
-            time.sleep(waitTime)
+    A ProgressBar only redraws when the visible bar or the percentage text changes, and at most
+    `maxFrequency` times per second. When the standard output is not a TTY (e.g. redirected into a
+    file), it writes one line per `percentStep` percent instead of overwriting the line with `\r`.
+    """
+    # Default maximum redraws per second
+    MaxFrequency = 10.0
+    # Default percent step for each line when the standard output is not a TTY
+    PercentStep = 10
 
-            duration -= waitTime
-            counts += waitTime
-            Logger.WriteProgress(
-                counts, total, width=Benchmarking._WIDTH, unit="s")
+    # Precomputed bar segments by width
+    _SEGMENTS: Dict[int, List[str]] = dict()
 
-    @staticmethod
-    def RandomInputTest(duration: float) -> None:
+    def __init__(self, total: float, log: str = "", width: int = 50, unit: str = "", consoleColor: int = ConsoleColor.Default,
+                 maxFrequency: float = None, percentStep: float = None, isTTY: bool = None) -> None:
         """
-        Perform a random Typing Words for Office.
+        Construct a ProgressBar.
 
         Parameters
         ----------
-        duration : float.
-            Time to perform the random typing.
+        total : float.
+            Total counts of a progress.
+        log : string, optional.
+            Log message before the progress bar (default: "").
+        width : integer, optional.
+            The width in letters of the progress bar (default: 50).
+        unit : string, optional.
+            Unit of the counts (default: "").
+        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred.
+            Text's color on console (default: ConsoleColor.Default).
+        maxFrequency : float, optional.
+            Maximum redraws per second (default: None). None to use `ProgressBar.MaxFrequency`; 0 for no limit.
+        percentStep : float, optional.
+            Percent step for each line in low-noise mode (default: None). None to use `ProgressBar.PercentStep`.
+        isTTY : bool, optional.
+            Whether the standard output is a TTY (default: None). None to detect automatically.
+
+        """
+        self.total: float = total
+        self.log: str = log
+        self.width: int = width
+        self.unit: str = "" if unit is None else unit
+        self.consoleColor: int = consoleColor
+        self.maxFrequency: float = ProgressBar.MaxFrequency if maxFrequency is None else maxFrequency
+        self.percentStep: float = ProgressBar.PercentStep if percentStep is None else percentStep
+        if isTTY is None:
+            try:
+                isTTY = bool(sys.stdout) and sys.stdout.isatty()
+            except Exception:
+                isTTY = False
+        self.isTTY: bool = isTTY
+
+        self.counts: float = 0
+        self.redraws: int = 0
+        self.skipped: int = 0
+        self._lastKey: tuple = None
+        self._lastDraw: float = None
+        self._lastStep: int = -1
+        self._finished: bool = False
 
+        if width not in ProgressBar._SEGMENTS:
+            ProgressBar._SEGMENTS[width] = [
+                '█' * i + ' ' * (width - i) for i in range(width + 1)]
+        self._segments: List[str] = ProgressBar._SEGMENTS[width]
+
+    def update(self, counts: float, force: bool = False) -> bool:
         """
-        waitTime = 0
+        Update the progress bar with the given counts, and redraw it if needed.
 
-        total = duration
-        counts = 0
-        Logger.WriteProgress(
-            counts, total, width=Benchmarking._WIDTH, unit="s")
-        while(duration > 0):
+        Parameters
+        ----------
+        counts : float.
+            Current counts of the progress.
+        force : bool, optional.
+            True to redraw regardless of the frequency limit (default: False).
 
-            waitTime = random.uniform(
-                Benchmarking._BM_WAIT_TIME_MIN, Benchmarking._BM_WAIT_TIME_MAX)
-            keyTime = random.uniform(
-                Benchmarking._KEY_PRESS_WAIT_TIME_MIN, Benchmarking._KEY_PRESS_WAIT_TIME_MAX)
-            action = random.choice(_RANDOM_WORD_LIST)
+        Returns
+        -------
+        update : bool.
+            Return True if the progress bar is redrawn; otherwise, return False.
 
-            if keyTime > duration:
-                keyTime = int(duration / 2)
-                waitTime = duration - keyTime
+        """
+        self.counts = counts
+        if self._finished:
+            return False
+        total = self.total if self.total else 1
+        progress = min(max(int(self.width * counts / total), 0), self.width)
+        percent = 100 * counts / total
+        done = progress == self.width
+
+        if self.isTTY:
+            key = (progress, int(counts), '%.2f' % percent)
+            if key == self._lastKey:
+                self.skipped += 1
+                return False
+            if not force and not done and self._lastDraw is not None and self.maxFrequency > 0:
+                if time.monotonic() - self._lastDraw < 1 / self.maxFrequency:
+                    self.skipped += 1
+                    return False
+            end = '\n' if done else '\r'
+        else:
+            step = int(percent // self.percentStep) if self.percentStep > 0 else int(percent)
+            if step <= self._lastStep and not done:
+                self.skipped += 1
+                return False
+            self._lastStep = step
+            key = None
+            end = '\n'
 
-            Benchmarking.keyCharacterControl(action, keyTime)
+        if self.unit == "":
+            text = ' {0} / {1}  {2:.2f}%'.format(int(counts), self.total, percent)
+        else:
+            text = ' {0} {3} / {1} {3}  {2:.2f}%'.format(
+                int(counts), self.total, percent, self.unit)
+        Logger.Write(self.log + '|' + self._segments[progress] + '|' + text + end,
+                     self.consoleColor, writeToFile=False)
+
+        self._lastKey = key
+        self._lastDraw = time.monotonic()
+        self._finished = done
+        self.redraws += 1
+        return True
 
-            duration -= keyTime
-            counts += keyTime
-            Logger.WriteProgress(
-                counts, total, width=Benchmarking._WIDTH, unit="s")
+    def isFinished(self) -> bool:
+        """Return True if the progress bar has reached its total."""
+        return self._finished
 
-            time.sleep(waitTime)
 
-            duration -= waitTime
-            counts += waitTime
-            Logger.WriteProgress(
-                counts, total, width=Benchmarking._WIDTH, unit="s")
+################################################################################
+################################## RingBuffer ##################################
+################################################################################
+class RingBuffer:
+    """
+    A fixed-size and preallocated ring buffer keeping the last N items in memory.
 
-    @staticmethod
-    def RandomRotateTest(duration: float) -> None:
+    Appending only takes a lock and stores a reference, so items can be appended on any thread and
+    snapshotted on another one, such as the LogSink flush thread persisting `Logger.CrashContext`.
+    """
+
+    def __init__(self, size: int = 256) -> None:
         """
-        Perform a random screen rotating.
+        Construct a RingBuffer.
 
         Parameters
         ----------
-        duration : float.
-            Time to perform the random screen rotating.
+        size : integer, optional.
+            Maximum items to keep (default: 256).
+
+        """
+        self.size: int = max(int(size), 1)
+        # Items ever appended, telling whether the buffer changed since a snapshot
+        self.appended: int = 0
+        self._items: List[Any] = [None] * self.size
+        self._next: int = 0
+        self._count: int = 0
+        self._lock = threading.Lock()
+
+    def append(self, item: Any) -> None:
+        """Append an item, overwriting the oldest item once the buffer is full."""
+        with self._lock:
+            self._items[self._next] = item
+            self._next = (self._next + 1) % self.size
+            if self._count < self.size:
+                self._count += 1
+            self.appended += 1
+
+    def snapshot(self) -> List[Any]:
+        """Return the kept items from the oldest to the newest."""
+        with self._lock:
+            if self._count < self.size:
+                return self._items[:self._count]
+            return self._items[self._next:] + self._items[:self._next]
+
+    def clear(self) -> None:
+        """Remove all the items."""
+        with self._lock:
+            self._items = [None] * self.size
+            self._next = 0
+            self._count = 0
+            self.appended += 1
+
+    def __len__(self) -> int:
+        return self._count
 
-        """
-        waitTime = 0
-
-        total = duration
-        counts = 0
-        Logger.WriteProgress(
-            counts, total, width=Benchmarking._WIDTH, unit="s")
-        while(duration > 0):
-            waitTime = random.uniform(5, 20)
 
-            Benchmarking.changeDisplayDirection(
-                0, random.choice(Benchmarking._ROTATE_ANGLE))
-
-            time.sleep(waitTime)
+################################################################################
+#################################### Logger ####################################
+################################################################################
+# Whether `Logger.Shutdown()` is registered to run at exit, so it is registered once
+_LoggerShutdownRegistered = False
 
-            duration -= waitTime
-            counts += waitTime
-            Logger.WriteProgress(
-                counts, total, width=Benchmarking._WIDTH, unit="s")
 
-        Benchmarking.changeDisplayDirection(0, 0)
+class Logger:
+    """
+    Logger for print and log. Support for printing log with different colors on console.
+    """
+    FileName = '@AutomationLog.txt'
+    _SelfFileName = os.path.split(__file__)[1]
+    # Lowest level of logs written by Logger.Log(), see Logger.SetLevel()
+    Level: int = LogLevel.Debug
+    # Cached code objects of this library, and of the callers with their file names
+    _SelfCodes = set()
+    _ForeignCodes: Dict[types.CodeType, str] = dict()
+    # Cached (second, 'YYYY-MM-DD HH:MM:SS') of the last log
+    _TimePrefix: Tuple[int, str] = (None, '')
+    ColorNames = {
+        "Black": ConsoleColor.Black,
+        "DarkBlue": ConsoleColor.DarkBlue,
+        "DarkGreen": ConsoleColor.DarkGreen,
+        "DarkCyan": ConsoleColor.DarkCyan,
+        "DarkRed": ConsoleColor.DarkRed,
+        "DarkMagenta": ConsoleColor.DarkMagenta,
+        "DarkYellow": ConsoleColor.DarkYellow,
+        "Gray": ConsoleColor.Gray,
+        "DarkGray": ConsoleColor.DarkGray,
+        "Blue": ConsoleColor.Blue,
+        "Green": ConsoleColor.Green,
+        "Cyan": ConsoleColor.Cyan,
+        "Red": ConsoleColor.Red,
+        "Magenta": ConsoleColor.Magenta,
+        "Yellow": ConsoleColor.Yellow,
+        "White": ConsoleColor.White,
+    }
+    # How to color texts on console: "ansi", "win32" or "none". None to detect on first use.
+    ConsoleMode: str = None
+    # Background LogWriter in asynchronous mode, see Logger.SetAsync()
+    _Writer: LogWriter = None
+    # Current ProgressBar reused by Logger.WriteProgress()
+    _Progress: ProgressBar = None
+    # Last structured events kept in memory, see Logger.DumpCrashContext()
+    CrashContext: RingBuffer = RingBuffer(256)
+    # File the last structured events are persisted to, see Logger.PersistCrashContext(); None to keep them in memory only
+    CrashContextFile: str = '@CrashContext.jsonl'
+    # Seconds between persisting new events by the LogSink flush thread
+    CrashContextSyncInterval: float = 5.0
+    # Events of the previous run read from CrashContextFile, kept ahead of the ring; None until read
+    _PreviousCrashContext: List[Dict[str, Any]] = None
+    # (ring, `RingBuffer.appended`) last persisted, and when
+    _CrashContextPersisted: Tuple[RingBuffer, int] = None
+    _CrashContextSynced: float = 0
+    _CrashContextLock = threading.Lock()
+    # Rotation settings (maxBytes, compress), see Logger.SetRotation()
+    _Rotation: Tuple[int, bool] = None
+    RotateEachLoop = False
 
     @staticmethod
-    def StressTest(duration: float) -> None:
+    def WriteProgress(counts: int, total: int, log: str = "", width: int = 50, unit: str = "", consoleColor: int = ConsoleColor.Default) -> None:
         """
-        Perform a stressed Benchmarking. Randomly performing an ALT+TAB action.
+        Write a progress bar with the given counts of total.
 
         Parameters
         ----------
-        duration : float.
-            Time to perform the stressed benchmarking.
+        counts : integer.
+            Current counts of a progress.
+        total : integer.
+            Total counts of a progress.
+        log : string, optional.
+            Log message before the progress bar (default: ""). Usually passing 'Waiting' or 'Progressing'.
+        width : integer, optional.
+            The width in letters of the progress bar (default: 50).
+        unit : string, optional.
+            Unit of the counts (default: ""). Ususally passing a time unit like 's' and 'min'.
+            For example, by passing 's' will have an output '1 s / 10 s  10%'; otherwise, '1 / 10  10%'
+        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
+            Text's color on console (default: ConsoleColor.White).
 
-        """
-        waitTime = 0
-        keyTime = 0
+        Notes
+        -----
+        * Logger.WriteProgress should always be used with vairables updated in loops; Please check the Examples section
+        * Consecutive calls with the same total, log, width, unit and color share one `ProgressBar`, so the bar
+          is only redrawn when it changes and at most `ProgressBar.MaxFrequency` times per second.
 
-        total = duration
-        counts = 0
-        Logger.WriteProgress(
-            counts, total, width=Benchmarking._WIDTH, unit="s")
-        while(duration >= 0):
+        Examples
+        --------
+        To init a new progress bar with 1 / 10, simply do this:
+
+        >>> Logger.WriteProgress(1, 10)
+        |                                                  | 1 / 10  10.00%
 
-            waitTime = random.uniform(
-                Benchmarking._BM_WAIT_TIME_MIN, Benchmarking._BM_WAIT_TIME_MAX)
-            keyTime = random.uniform(
-                Benchmarking._KEY_PRESS_WAIT_TIME_MIN, Benchmarking._KEY_PRESS_WAIT_TIME_MAX)
+        Adding log message and count units:
 
-            if keyTime > duration:
-                keyTime = int(duration / 2)
-                waitTime = duration - keyTime
+        >>> Logger.WriteProgress(1, 10, log='Waiting', unit='s')
+        Waiting|                                                  | 1 s / 10 s  10.00%
 
-            Input.key_alt_tab()
-            time.sleep(keyTime)
-            duration -= keyTime
-            counts += keyTime
-            Logger.WriteProgress(
-                counts, total, width=Benchmarking._WIDTH, unit="s")
+        The following code shows a small demo of having progress bar randomly increasing:
 
-            Input.key_alt_tab()
-            time.sleep(waitTime)
+        >>> import random
+        >>> counts = 0
+        >>> total = 100 # Total counts will be 100
+        >>> Logger.WriteProgress(counts, total) # Starting the progress bar from 0 to 100
+        >>> while counts < total:
+        >>>     counts += random.randint(0, 5) # Randomly increasing the progress bar.
+        >>>     Logger.WriteProgress(counts, total) # Updating the progress bar on console
 
-            duration -= waitTime
-            counts += waitTime
-            Logger.WriteProgress(
-                counts, total, width=Benchmarking._WIDTH, unit="s")
+        """
+        bar = Logger._Progress
+        if bar is None or bar.isFinished() or counts < bar.counts or \
+                (bar.total, bar.log, bar.width, bar.unit, bar.consoleColor) != (total, log, width, "" if unit is None else unit, consoleColor):
+            bar = ProgressBar(total, log, width, unit, consoleColor)
+            Logger._Progress = bar
+        bar.update(counts)
 
     @staticmethod
-    def mouseCharacterControl(action: str, keyTime: int) -> None:
+    def CountProgress(total: int, log: str = "Progressing", step: int = 1, width: int = 50, consoleColor: int = ConsoleColor.Default) -> None:
         """
-        A method called by randomCharacterControl() to perform mouse control for characters.
+        Write a progress bar counting down in seconds.
 
         Parameters
         ----------
-        action : string.
-            Action to be perform. Action should in the following list:
-                ["view_upward", "view_downward", "view_leftward",
-                 "view_rightward", "left_click", "right_click"]
-        keyTime: integer.
-            duration to perform the key time.
+        total : integer.
+            Total counts of a progress.
+        log : string, optional.
+            Log message before the progress bar (default: "Progressing"). Usually passing 'Waiting' or 'Progressing'.
+        step : integer, optional.
+            Steps or period to update the progress bar in seconds (default: 1).
+        width : integer, optional
+            The width in letters of the progress bar (default: 50).
+        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
+            Text's color on console (default: ConsoleColor.White).
+
+        Examples
+        --------
+        To show a progress bar uniformly progressing for 10 seconds with step 1:
+
+        >>> Logger.WriteProgress(10, log="Progressing", step=1)
+        Progressing|                                                  | 0 s / 10 s  0.00%
+        Progressing|█                                                 | 1 s / 10 s  10.00%
+        Progressing|██                                                | 2 s / 10 s  20.00%
+        ......
+
+        or just simply use the following code and will prodcue the same output:
+
+        >>> Logger.WriteProgress(10)
+        Progressing|                                                  | 0 s / 10 s  0.00%
+        Progressing|█                                                 | 1 s / 10 s  10.00%
+        Progressing|██                                                | 2 s / 10 s  20.00%
+        ......
 
         """
-        if action == "view_upward":
-            Input.moveTo(960, 1000, keyTime)
-        if action == "view_downward":
-            Input.moveTo(960, 80, keyTime)
-        if action == "view_leftward":
-            Input.moveTo(1800, 540), keyTime
-        if action == "view_rightward":
-            Input.moveTo(120, 540, keyTime)
-        if action == "left_click":
-            Input.clickLeft(None, None, keyTime)
-        if action == "right_click":
-            Input.clickRight(None, None, keyTime)
+        bar = ProgressBar(total, log, width, "s", consoleColor)
+        scheduler = Scheduler(total)
+        scheduler.start()
+        for counts in range(0, int(total)+1, step):
+            scheduler.waitUntil(counts)
+            bar.update(counts)
+        scheduler.finish()
+        if total != int(total):
+            bar.update(total)
 
     @staticmethod
-    def keyCharacterControl(action: str, keyTime: float, WriteProgress: bool = False) -> None:
+    def SetLogFile(path: str) -> None:
         """
-        A method called by randomCharacterControl() to perform keyboard control for characters.
+        Set Log file.
 
         Parameters
         ----------
-        action : string.
-            Action to be perform. Action should in the following list:
-                ["view_upward", "view_downward", "view_leftward",
-                 "view_rightward", "left_click", "right_click"]
-        keyTime: integer.
-            duration to perform the key time
-        WriteProgress : bool, optional.
-            True to show a console progress bar (default : True).
+        path : string.
+            Log file to be used.
 
         """
-        # utils.input.key_input(action, keyTime)
-        Input.callTinyTask(action)
-        if WriteProgress:
-            Logger.CountProgress(
-                0, keyTime, width=Benchmarking._WIDTH)
-        else:
-            time.sleep(keyTime)
+        Logger.FileName = path
+        if Logger._Rotation is not None:
+            LogSink.get(path).setRotation(*Logger._Rotation)
 
     @staticmethod
-    def changeDisplayDirection(deviceIndex: int, angle: int) -> bool:
+    def Write(log: Any, consoleColor: int = ConsoleColor.Default, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None, printTruncateLen: int = 0) -> None:
         """
-        Rotate the Display Screen's Direction.
+        Write logs to Console.
 
-        @param:
-            - deviceIndex - display device index.
-            - angle - angle to be rotated.
+        Parameters
+        ----------
+        log : Any type. A string is preferred.
+            Logs text
+        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
+            Text's color on console (default: ConsoleColor.White).
+        writeToFile : bool, optional.
+            True to write logs into a file (default: True).
+        printToStdout : bool, optional.
+            True to print to standard output (default: True).
+        logFile : str, optional.
+            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
+        printTruncateLen : integer, optional.
+            If <= 0, log is not truncated when print.
 
-        @RETURN:
-            - True - succeed in rotating the screen.
-            - False - failed to rotate the screen.
-        """
-        # if not hasDisplayDevice(deviceIndex):
-        #     return
-        try:
-            device = win32api.EnumDisplayDevices(None, deviceIndex)
-            dm = win32api.EnumDisplaySettings(
-                device.DeviceName, win32con.ENUM_CURRENT_SETTINGS)
-            if angle == 90:
-                dm.DisplayOrientation = win32con.DMDO_90  # 待改变的值
-                # 以下的720或者1280 代表我的屏幕的长宽
-                # 在应用项目的时候,建议使用GetSystemMetrics 动态获取长宽
-                # 在每次改变方向的时候,都要判断是否需要交换屏幕的长宽
-                if win32api.GetSystemMetrics(win32con.SM_CXSCREEN) != 720:
-                    dm.PelsWidth, dm.PelsHeight = dm.PelsHeight, dm.PelsWidth
+        Notes
+        -----
+        'ConsoleColor' (or Logger.ColorNames) currently has supported the following colors:
 
-            elif angle == 180:
-                dm.DisplayOrientation = win32con.DMDO_180
-                if win32api.GetSystemMetrics(win32con.SM_CXSCREEN) != 1280:
-                    dm.PelsWidth, dm.PelsHeight = dm.PelsHeight, dm.PelsWidth
+        ============  ===========
+            Color       integer
+        ============  ===========
+        Default       -1
+        Black         0
+        DarkBlue      1
+        DarkGreen     2
+        DarkCyan      3
+        DarkRed       4
+        DarkMagenta   5
+        DarkYellow    6
+        Gray          7
+        DarkGray      8
+        Blue          9
+        Green         10
+        Cyan          11
+        Red           12
+        Magenta       13
+        Yellow        14
+        White         15
+        ============  ===========
 
-            elif angle == 270:
-                dm.DisplayOrientation = win32con.DMDO_270
-                if win32api.GetSystemMetrics(win32con.SM_CXSCREEN) != 720:
-                    dm.PelsWidth, dm.PelsHeight = dm.PelsHeight, dm.PelsWidth
+        Logs are written into the file through a buffered `LogSink` (see `LogSink.get()`), which keeps
+        the file opened. Logs in ConsoleColor.Red are written to disk immediately.
 
-            elif angle == 0:
-                dm.DisplayOrientation = win32con.DMDO_DEFAULT
-                if win32api.GetSystemMetrics(win32con.SM_CXSCREEN) != 1280:
-                    dm.PelsWidth, dm.PelsHeight = dm.PelsHeight, dm.PelsWidth
+        In asynchronous mode (see `Logger.SetAsync()`), the log is only put in a queue and written by
+        a background LogWriter thread.
 
-            win32api.ChangeDisplaySettingsEx(device.DeviceName, dm)
+        Examples
+        --------
+        Logger.Write() is mainly used by other Logger Functions.
 
-            return True
+        Logger.WriteLine() utilize this function to write logs to console line, and change a new line
+        for next log, by adding `\\n` in log parameter.
 
-        except Exception:
-            return False
+        >>> Logger.Write('{}\\n'.format(log), consoleColor, writeToFile, printToStdout, logFile)
 
+        Logger.WriteFlush() utilize this function to write logs to console line, and will overwrite
+        the current line with next log, by adding `\\r` in log parameter.
 
-############################################################################
+        >>> Logger.Write('{}\\r'.format(log), consoleColor, writeToFile, printToStdout, logFile)
+
+        """
+        if not isinstance(log, str):
+            log = str(log)
+        fileName = logFile if logFile else Logger.FileName
+        record = (log, consoleColor, writeToFile, printToStdout,
+                  fileName, printTruncateLen, None)
+        if Logger._Writer is not None:
+            Logger._Writer.put(record, urgent=consoleColor == ConsoleColor.Red)
+            return
+        Logger._Output(*record)
+
+    @staticmethod
+    def _Output(log: str, consoleColor: int, writeToFile: bool, printToStdout: bool, fileName: str, printTruncateLen: int,
+                segments: Tuple[Tuple[str, int], ...] = None) -> None:
+        """
+        Write a preformatted log record to Console and the log file on the current thread.
+        Called by Logger.Write() directly, or by the LogWriter thread in asynchronous mode.
+
+        `segments` are the (text, color) segments of a colorful log (see Logger.ColorfulWrite()),
+        where `log` is their plain text.
+
+        """
+        if printToStdout and sys.stdout:
+            if Logger.ConsoleMode is None:
+                Logger.ConsoleMode = DetectConsoleMode()
+            if printTruncateLen > 0 and len(log) > printTruncateLen:
+                segments = ((log[:printTruncateLen] + '...', consoleColor),)
+            elif segments is None:
+                segments = ((log, consoleColor),)
+            try:
+                if Logger.ConsoleMode == "ansi":
+                    sys.stdout.write(ColorizeAnsi(segments))
+                elif Logger.ConsoleMode == "win32":
+                    for text, color in segments:
+                        isValidColor = color in _ANSI_COLOR
+                        if isValidColor:
+                            SetConsoleColor(color)
+                        sys.stdout.write(text)
+                        if isValidColor:
+                            ResetConsoleColor()
+                else:
+                    sys.stdout.write(''.join(text for text, _ in segments))
+            except Exception as ex:
+                error = ex.__class__.__name__ + ': can\'t print the log!'
+                if log.endswith('\n'):
+                    error += '\n'
+                if Logger.ConsoleMode == "ansi":
+                    sys.stdout.write(ColorizeAnsi(((error, ConsoleColor.Red),)))
+                else:
+                    sys.stdout.write(error)
+            sys.stdout.flush()
+        if not writeToFile:
+            return
+        LogSink.get(fileName).write(
+            log, urgent=consoleColor == ConsoleColor.Red)
+
+    @staticmethod
+    def WriteLine(log: Any, consoleColor: int = -1, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None) -> None:
+        """
+        Write logs to Console with a new line.
+
+        Parameters
+        ----------
+        log : Any type. A string is preferred.
+            Logs text
+        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
+            Text's color on console (default: ConsoleColor.White).
+        writeToFile : bool, optional.
+            True to write logs into a file (default: True).
+        printToStdout : bool, optional.
+            True to print to standard output (default: True).
+        logFile : str, optional.
+            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
+        printTruncateLen : integer, optional.
+            If <= 0, log is not truncated when print.
+
+        Notes
+        -----
+        * This function utilize Logger.Write(), please see more details in Logger.Write().
+        * Parameters of this functions must fully satisfy Logger.Write() specification.
+
+        Examples
+        --------
+        To easily utilize Logger.WriteLine() to log error or warning message for this package:
+
+        >>> # The following line of code will log a message with Red color on console, representing an Error Message.
+        >>> Logger.WriteLine('ERROR: This is an error message.'.format(log), consoleColor=ConsoleColor.Red)
+        ERROR: This is an error message.
+
+        >>> # The following line of code will log a message with Yellow color on console, representing a Warning Message.
+        >>> Logger.WriteLine('Warning: This is a warning message.'.format(log), consoleColor=ConsoleColor.Red)
+        Warning: This is a warning message.
+
+        The following code by using Looger.Write() will have the same output as above:
+
+        >>> # The following line of code will log a message with Red color on console, representing an Error Message.
+        >>> Logger.Write('ERROR: This is an error message.\\n'.format(log), consoleColor=ConsoleColor.Red)
+        ERROR: This is an error message.
+
+        >>> # The following line of code will log a message with Yellow color on console, representing a Warning Message.
+        >>> Logger.Write('Warning: This is a warning message.\\n'.format(log), consoleColor=ConsoleColor.Red)
+        Warning: This is a warning message.
+
+        """
+        Logger.Write('{}\n'.format(log), consoleColor,
+                     writeToFile, printToStdout, logFile)
+
+    @staticmethod
+    def WriteFlush(log: Any, consoleColor: int = ConsoleColor.Default, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None, printTruncateLen: int = 0) -> None:
+        """
+        Write logs to Console by overwriting the current line.
+
+        Parameters
+        ----------
+        log : Any type. A string is preferred.
+            Logs text
+        consoleColor : integer, optional.  A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
+            Text's color on console (default: ConsoleColor.White).
+        writeToFile : bool, optional.
+            True to write logs into a file (default: True).
+        printToStdout : bool, optional.
+            True to print to standard output (default: True).
+        logFile : str, optional.
+            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
+        printTruncateLen : integer, optional.
+            If <= 0, log is not truncated when print.
+
+        Notes
+        -----
+        * This function utilize Logger.Write(), please see more details in Logger.Write().
+        * Parameters of this functions must fully satisfy Logger.Write() specification.
+
+        Examples
+        --------
+        To easily utilize Logger.WriteFlush() to log error or warning message for this package:
+
+        >>> # The following line of code will log a message with Red color on console, representing an Error Message.
+        >>> Logger.WriteFlush('ERROR: This is an error message.'.format(log), consoleColor=ConsoleColor.Red)
+
+        >>> # The following line of code will log a message with Yellow color on console, representing a Warning Message.
+        >>> Logger.WriteFlush('Warning: This is a warning message.'.format(log), consoleColor=ConsoleColor.Red)
+
+        The following code by using Looger.Write() will have the same output as above:
+
+        >>> # The following line of code will log a message with Red color on console, representing an Error Message.
+        >>> Logger.Write('ERROR: This is an error message.\\r'.format(log), consoleColor=ConsoleColor.Red)
+        ERROR: This is an error message.
+
+        >>> # The following line of code will log a message with Yellow color on console, representing a Warning Message.
+        >>> Logger.Write('Warning: This is a warning message.\\r'.format(log), consoleColor=ConsoleColor.Red)
+        Warning: This is a warning message.
+
+        """
+        Logger.Write('{}\r'.format(log), consoleColor,
+                     writeToFile, printToStdout, logFile)
+
+    @staticmethod
+    def ColorfulWrite(log: str, consoleColor: int = -1, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None) -> None:
+        """
+        Can write colorful logs to Console by using brackets.
+
+        Parameters
+        ----------
+        log : Sting
+            Logs text
+        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
+            Text's color on console (default: ConsoleColor.White).
+        writeToFile : bool, optional.
+            True to write logs into a file (default: True).
+        printToStdout : bool, optional.
+            True to print to standard output (default: True).
+        logFile : str, optional.
+            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
+        printTruncateLen : integer, optional.
+            If <= 0, log is not truncated when print.
+
+        Notes
+        -----
+        * Parameters of this functions must fully satisfy Logger.Write() specification.
+
+        Examples
+        --------
+        Logger.ColorfulWrite() can print colorfull outputs by using brackets:
+
+        >>> ColorfulWrite('Hello <Color=Green>Green</Color>!!')
+        Hello Green!!
+
+        where 'Hello' has default ConsoleColor (which is White), and 'Green' will be printed
+        in ConsoleColor.Green (which is Green).
+
+        The value on the right of `Color=Green` must be in Logger.ColorNames.
+
+        The parsed segments are cached for repeated logs, and the whole colorful log is written to console
+        with one call (see `Logger.SetConsoleMode()`) and to the log file once.
+
+        """
+        segments = Logger._ParseColorful(log, consoleColor)
+        Logger._WriteSegments(segments, consoleColor,
+                              writeToFile, printToStdout, logFile)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _ParseColorful(log: str, consoleColor: int) -> Tuple[Tuple[str, int], ...]:
+        """
+        Parse a colorful log with brackets into (text, color) segments. Results are cached for repeated logs.
+
+        """
+        text = []
+        start = 0
+        while True:
+            index1 = log.find('<Color=', start)
+            if index1 >= 0:
+                if index1 > start:
+                    text.append((log[start:index1], consoleColor))
+                index2 = log.find('>', index1)
+                colorName = log[index1+7:index2]
+                index3 = log.find('</Color>', index2 + 1)
+                text.append((log[index2 + 1:index3],
+                            Logger.ColorNames[colorName]))
+                start = index3 + 8
+            else:
+                if start < len(log):
+                    text.append((log[start:], consoleColor))
+                break
+        return tuple(text)
+
+    @staticmethod
+    def _WriteSegments(segments: Tuple[Tuple[str, int], ...], consoleColor: int, writeToFile: bool, printToStdout: bool, logFile: str) -> None:
+        """
+        Write (text, color) segments as one log record, so that Console and the log file are written only once.
+
+        """
+        fileName = logFile if logFile else Logger.FileName
+        record = (''.join(t for t, _ in segments), consoleColor, writeToFile, printToStdout,
+                  fileName, 0, segments)
+        if Logger._Writer is not None:
+            Logger._Writer.put(record, urgent=consoleColor == ConsoleColor.Red)
+            return
+        Logger._Output(*record)
+
+    @staticmethod
+    def ColorfulWriteLine(log: str, consoleColor: int = -1, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None) -> None:
+        """
+        Can write colorful logs to Console with a new line by using brackets.
+
+        Parameters
+        ----------
+        log : Sting
+            Logs text
+        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
+            Text's color on console (default: ConsoleColor.White).
+        writeToFile : bool, optional.
+            True to write logs into a file (default: True).
+        printToStdout : bool, optional.
+            True to print to standard output (default: True).
+        logFile : str, optional.
+            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
+        printTruncateLen : integer, optional.
+            If <= 0, log is not truncated when print.
+
+        Notes
+        -----
+        * This function utilize Logger.ColorfulWrite(), please see more details in Logger.ColorfulWrite().
+        * Parameters of this functions must fully satisfy Logger.Write() specification.
+
+        Examples
+        --------
+        Logger.ColorfulWriteLine() can print colorfull outputs with a new line by using brackets:
+
+        >>> ColorfulWriteLine('Hello <Color=Green>Green</Color>!!')
+        Hello Green!!
+
+        where 'Hello' has default ConsoleColor (which is White), and Green will be printed
+        in ConsoleColor.Green (which is Green).
+
+        The value on the right of `Color=Green` must be in Logger.ColorNames.
+
+        The following code by using Looger.Write() will have the same output with same style as above:
+
+        >>> Logger.ColorfulWrite('Hello <Color=Green>Green</Color>!!')
+        Hello Green!!
+
+        """
+        Logger.ColorfulWrite(log + '\n', consoleColor,
+                             writeToFile, printToStdout, logFile)
+
+    @staticmethod
+    def Log(log: Any = '', consoleColor: int = -1, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None, level: int = LogLevel.Info) -> None:
+        """
+        Write logs to Console with current time information.
+
+        Parameters
+        ----------
+        log : Any type. A string is preferred.
+            Logs text
+        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
+            Text's color on console (default: ConsoleColor.White).
+        writeToFile : bool, optional.
+            True to write logs into a file (default: True).
+        printToStdout : bool, optional.
+            True to print to standard output (default: True).
+        logFile : str, optional.
+            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
+        printTruncateLen : integer, optional.
+            If <= 0, log is not truncated when print.
+        level : integer, optional. A value in class 'LogLevel' is preferred, such as `LogLevel.Debug`.
+            Level of the log (default: LogLevel.Info). The log is dropped if the level is lower than `Logger.Level`.
+
+        Notes
+        -----
+        * Parameters of this functions must fully satisfy Logger.Write() specification.
+
+        Examples
+        --------
+        >>> Logger.Log("This line used Logger.Log()!")
+        2021-07-07 14:56:24.345 test.py[3] <module> -> This line used Logger.Log()!
+
+        """
+        if level < Logger.Level:
+            return
+        if not isinstance(log, str):
+            log = str(log)
+        code, lineno = Logger._Caller()
+        record = (Clock.get().wall(), code, lineno, log, consoleColor, writeToFile,
+                  printToStdout, logFile if logFile else Logger.FileName, False)
+        if Logger._Writer is not None:
+            Logger._Writer.put(record, urgent=consoleColor == ConsoleColor.Red)
+            return
+        Logger._OutputLog(*record)
+
+    @staticmethod
+    def ColorfulLog(log: str = '', consoleColor: int = -1, writeToFile: bool = True, printToStdout: bool = True, logFile: str = None, level: int = LogLevel.Info) -> None:
+        """
+        Write colorful logs to Console with current time information by using brackets.
+
+        Parameters
+        ----------
+        log : Any type. A string is preferred.
+            Logs text
+        consoleColor : integer, optional. A value in class 'ConsoleColor' is preferred, such as `ConsoleColor.DarkGreen`.
+            Text's color on console (default: ConsoleColor.White).
+        writeToFile : bool, optional.
+            True to write logs into a file (default: True).
+        printToStdout : bool, optional.
+            True to print to standard output (default: True).
+        logFile : str, optional.
+            Logs file name (default: None). None to write to default log file '@AutomationLog.txt'
+        printTruncateLen : integer, optional.
+            If <= 0, log is not truncated when print.
+        level : integer, optional. A value in class 'LogLevel' is preferred, such as `LogLevel.Debug`.
+            Level of the log (default: LogLevel.Info). The log is dropped if the level is lower than `Logger.Level`.
+
+        Notes
+        -----
+        * Parameters of this functions must fully satisfy Logger.Write() specification.
+
+        Examples
+        --------
+        >>> Logger.Log("This line used <Color=DarkGray>Logger.Log()</Color>!")
+        2021-07-07 14:56:24.345 test.py[3] <module> -> This line used Logger.Log()!
+
+        where 'This line used' and '!' has default ConsoleColor (which is White), and 'Logger.Log()' will be printed
+        in ConsoleColor.DarkGray (which is DarkGray).
+
+        The value on the right of `Color=DarkGray` must be in Logger.ColorNames.
+
+        """
+        if level < Logger.Level:
+            return
+        code, lineno = Logger._Caller()
+        record = (Clock.get().wall(), code, lineno, log, consoleColor, writeToFile,
+                  printToStdout, logFile if logFile else Logger.FileName, True)
+        if Logger._Writer is not None:
+            Logger._Writer.put(record, urgent=consoleColor == ConsoleColor.Red)
+            return
+        Logger._OutputLog(*record)
+
+    @staticmethod
+    def _Caller() -> Tuple[types.CodeType, int]:
+        """
+        Find the (code object, line number) of the first caller outside this library.
+        Code objects are cached, so that file names are only compared once for each function.
+
+        """
+        frame = sys._getframe(2)
+        while True:
+            code = frame.f_code
+            if code in Logger._ForeignCodes:
+                return code, frame.f_lineno
+            if code not in Logger._SelfCodes:
+                scriptFileName = os.path.split(code.co_filename)[1]
+                if scriptFileName != Logger._SelfFileName:
+                    Logger._ForeignCodes[code] = scriptFileName
+                    return code, frame.f_lineno
+                Logger._SelfCodes.add(code)
+            frame = frame.f_back
+
+    @staticmethod
+    def _FormatTime(t: float) -> str:
+        """
+        Format a time.time() timestamp as 'YYYY-MM-DD HH:MM:SS.mmm'. The part in seconds is cached.
+
+        """
+        second = int(t)
+        if second != Logger._TimePrefix[0]:
+            Logger._TimePrefix = (second, time.strftime(
+                '%Y-%m-%d %H:%M:%S', time.localtime(second)))
+        return '%s.%03d' % (Logger._TimePrefix[1], int((t - second) * 1000))
+
+    @staticmethod
+    def _OutputLog(t: float, code: types.CodeType, lineno: int, log: str, consoleColor: int, writeToFile: bool,
+                   printToStdout: bool, fileName: str, colorful: bool) -> None:
+        """
+        Format a log record captured by Logger.Log() or Logger.ColorfulLog() and write it.
+        Called on the current thread, or by the LogWriter thread in asynchronous mode.
+
+        """
+        prefix = '{} {}[{}] {} -> '.format(Logger._FormatTime(
+            t), Logger._ForeignCodes[code], lineno, code.co_name)
+        if colorful:
+            segments = ((prefix, consoleColor),) + Logger._ParseColorful(log, consoleColor) + \
+                (('\n', consoleColor),)
+            Logger._Output(''.join(text for text, _ in segments), consoleColor,
+                           writeToFile, printToStdout, fileName, 0, segments)
+        else:
+            Logger._Output(prefix + log + '\n', consoleColor,
+                           writeToFile, printToStdout, fileName, 0)
+
+    @staticmethod
+    def SetLevel(level: int) -> None:
+        """
+        Set the lowest level of logs written by Logger.Log() and Logger.ColorfulLog().
+
+        Parameters
+        ----------
+        level : integer. A value in class 'LogLevel' is preferred, such as `LogLevel.Warning`.
+            Logs with a lower level are dropped with only one comparison.
+
+        """
+        Logger.Level = level
+
+    @staticmethod
+    def IsEnabledFor(level: int) -> bool:
+        """
+        Check whether logs of the given level will be written, so that building an expensive log can be skipped.
+
+        Parameters
+        ----------
+        level : integer. A value in class 'LogLevel' is preferred.
+
+        Returns
+        -------
+        IsEnabledFor : bool.
+            Return True if the level is not lower than `Logger.Level`; otherwise, return False.
+
+        """
+        return level >= Logger.Level
+
+    @staticmethod
+    def SetConsoleMode(mode: Literal["ansi", "win32", "none"] = None) -> None:
+        """
+        Set how to color texts on console.
+
+        Parameters
+        ----------
+        mode : Literal["ansi", "win32", "none"], optional.
+            "ansi" - write ANSI escape sequences, every log is written to console with one call.\n
+            "win32" - change colors by Win32 console attributes, used when the console does not support ANSI.\n
+            "none" - do not color texts.\n
+            None - detect automatically by `DetectConsoleMode()` (default).
+
+        """
+        if mode == "ansi":
+            EnableVirtualTerminal()
+        Logger.ConsoleMode = mode
+
+    @staticmethod
+    def SetAsync(enable: bool = True, maxQueueSize: int = 10000, policy: Literal["block", "drop"] = "block") -> None:
+        """
+        Enable or disable the asynchronous logging mode.
+
+        Parameters
+        ----------
+        enable : bool, optional.
+            True to write logs on a background LogWriter thread (default: True).
+            False to stop the thread and write logs on the calling thread.
+        maxQueueSize : integer, optional.
+            Maximum records waiting to be written (default: 10000). 0 for an unbounded queue.
+        policy : Literal["block", "drop"], optional.
+            What to do when the queue is full (default: "block"). Please see more in `LogWriter`.
+
+        Notes
+        -----
+        * In asynchronous mode, every Logger function only formats the log and puts it in a queue.
+        * `Logger.Flush()` should be called before reading the log file.
+
+        Examples
+        --------
+        >>> Logger.SetAsync(True, maxQueueSize=1000, policy="drop")
+        >>> Logger.WriteLine("This line is written by the LogWriter thread.")
+        >>> Logger.Flush()
+
+        """
+        if Logger._Writer is not None:
+            writer = Logger._Writer
+            Logger._Writer = None
+            writer.stop()
+        if enable:
+            global _LoggerShutdownRegistered
+            Logger._Writer = LogWriter(maxQueueSize, policy)
+            if not _LoggerShutdownRegistered:
+                atexit.register(Logger.Shutdown)
+                _LoggerShutdownRegistered = True
+
+    @staticmethod
+    def Flush() -> None:
+        """Wait until all the logs are written to Console and the log files."""
+        if Logger._Writer is not None:
+            Logger._Writer.flush()
+        else:
+            LogSink.flushAll()
+
+    @staticmethod
+    def Shutdown() -> None:
+        """Write the remaining logs, stop the asynchronous mode and close the log files."""
+        if Logger._Writer is not None:
+            Logger.SetAsync(False)
+        LogSink.closeAll()
+
+    @staticmethod
+    def SetRotation(maxBytes: int = 0, rotateEachLoop: bool = False, compress: bool = True) -> None:
+        """
+        Set the rotation of the log file.
+
+        Parameters
+        ----------
+        maxBytes : integer, optional.
+            Rotate the log file once it is larger than `maxBytes` bytes (default: 0). 0 to disable rotation by size.
+        rotateEachLoop : bool, optional.
+            True to rotate the log file at the beginning of every BMAutomation overall loop (default: False).
+        compress : bool, optional.
+            True to gzip rotated segments on a low-priority background thread (default: True).
+
+        Notes
+        -----
+        * BMAutomation.start() marks the log with the loop number and game name before every game, so that
+          `Logger.ReadLog()` can seek to a game directly. Please see more in `LogSink.setRotation()`.
+
+        Examples
+        --------
+        >>> Logger.SetRotation(maxBytes=64 * 1024 * 1024, rotateEachLoop=True)
+
+        """
+        Logger._Rotation = (maxBytes, compress)
+        Logger.RotateEachLoop = rotateEachLoop
+        LogSink.get(Logger.FileName).setRotation(maxBytes, compress)
+
+    @staticmethod
+    def SetFsync(fsync: bool) -> None:
+        """
+        Set whether urgent logs, such as Red errors, are forced onto disk by `os.fsync()`.
+
+        Parameters
+        ----------
+        fsync : bool.
+            True to fsync urgent writes of the log file and of later opened files (default of `LogSink.Fsync`: True).
+            False to only flush them to the OS, which is faster but may lose them if the machine hangs.
+
+        """
+        LogSink.Fsync = fsync
+        for sink in list(LogSink._Sinks.values()):
+            sink.fsync = fsync
+
+    @staticmethod
+    def Rotate() -> str:
+        """
+        Rotate the log file now.
+
+        Returns
+        -------
+        Rotate : string.
+            The rotated segment name, or None if the log file is empty.
+
+        """
+        Logger.Flush()
+        return LogSink.get(Logger.FileName).rotate()
+
+    @staticmethod
+    def Mark(**fields: Any) -> None:
+        """
+        Record the current position of the log file with the given fields into the index file.
+
+        Examples
+        --------
+        >>> Logger.Mark(loop=412, game="Borderlands3")
+
+        """
+        Logger.Flush()
+        LogSink.get(Logger.FileName).mark(**fields)
+
+    @staticmethod
+    def ReadLog(**fields: Any) -> Iterator[str]:
+        """
+        Lazily read the log from the last mark with the given fields, even if it is rotated and compressed.
+
+        Examples
+        --------
+        >>> for line in Logger.ReadLog(loop=412, game="Borderlands3"):
+        >>>     print(line, end="")
+
+        """
+        Logger.Flush()
+        return LogSink.get(Logger.FileName).readFrom(**fields)
+
+    @staticmethod
+    def SetCrashContextSize(size: int) -> None:
+        """
+        Set how many last structured events are kept in memory for crash triage.
+
+        Parameters
+        ----------
+        size : integer.
+            Events to keep.
+
+        """
+        Logger.CrashContext = RingBuffer(size)
+
+    @staticmethod
+    def SetCrashContextFile(path: str) -> None:
+        """
+        Set the file the last structured events are persisted to.
+
+        Parameters
+        ----------
+        path : string.
+            File to be used, or None to keep the events in memory only.
+
+        """
+        with Logger._CrashContextLock:
+            Logger.CrashContextFile = path
+            Logger._PreviousCrashContext = None
+            Logger._CrashContextPersisted = None
+
+    @staticmethod
+    def _ReadPreviousCrashContext() -> List[Dict[str, Any]]:
+        """Read the events of the previous run from `Logger.CrashContextFile` once, before it is rewritten."""
+        if Logger._PreviousCrashContext is None:
+            events = RingBuffer(Logger.CrashContext.size)
+            path = Logger.CrashContextFile
+            if path and os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            events.append(json.loads(line))
+                        except ValueError:
+                            # The last line may be torn by the crash
+                            continue
+            Logger._PreviousCrashContext = events.snapshot()
+        elif len(Logger.CrashContext) == Logger.CrashContext.size:
+            # The ring alone is the last events now
+            Logger._PreviousCrashContext = []
+        return Logger._PreviousCrashContext
+
+    @staticmethod
+    def _PersistCrashContextIfDue() -> None:
+        """Persist the crash context if `Logger.CrashContextSyncInterval` seconds passed, on the LogSink flush thread."""
+        if time.monotonic() - Logger._CrashContextSynced >= Logger.CrashContextSyncInterval:
+            Logger.PersistCrashContext()
+
+    @staticmethod
+    def PersistCrashContext() -> None:
+        """
+        Force the last structured events onto disk, into `Logger.CrashContextFile`.
+
+        Notes
+        -----
+        * `EventLog.Emit()` only appends events to `Logger.CrashContext` in memory, without any I/O. The events are
+          persisted here, at the beginning and the end of every `EventLog.Phase()`, and by the LogSink flush thread
+          every `Logger.CrashContextSyncInterval` seconds if new events were emitted. They survive a crash of the
+          whole system, whose dump is only found after a reboot.
+        * The file is rewritten atomically and forced onto disk by `os.fsync()`, with the last events of the previous
+          run ahead of those of this run, so it never holds more events than `Logger.CrashContext`.
+
+        """
+        with Logger._CrashContextLock:
+            path = Logger.CrashContextFile
+            ring = Logger.CrashContext
+            state = (ring, ring.appended)
+            if not path or Logger._CrashContextPersisted == state:
+                return
+            Logger._CrashContextSynced = time.monotonic()
+            try:
+                events = (Logger._ReadPreviousCrashContext() + ring.snapshot())[-ring.size:]
+                with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                    f.write(''.join(EventLog._Encoder.encode(record) + '\n' for record in events))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(path + '.tmp', path)
+                Logger._CrashContextPersisted = state
+            except OSError:
+                Logger.WriteLine('ERROR: Unable to persist crash context %s' % path, ConsoleColor.Red)
+
+    @staticmethod
+    def ReadCrashContext() -> List[Dict[str, Any]]:
+        """
+        Read the last structured events, including those of the previous run persisted in `Logger.CrashContextFile`,
+        such as before a crash of the system.
+
+        Returns
+        -------
+        ReadCrashContext : List[Dict[str, Any]].
+            At most the size of `Logger.CrashContext` events, from the oldest to the newest.
+
+        """
+        with Logger._CrashContextLock:
+            ring = Logger.CrashContext
+            if not Logger.CrashContextFile:
+                return ring.snapshot()
+            return (Logger._ReadPreviousCrashContext() + ring.snapshot())[-ring.size:]
+
+    @staticmethod
+    def DumpCrashContext(path: str, **info: Any) -> str:
+        """
+        Write the last structured events into a small JSON file.
+
+        Parameters
+        ----------
+        path : string.
+            The JSON file to write, usually a sidecar file next to a crash dump.
+        info : Any.
+            Additional information written with the events, such as the dump file name.
+
+        Returns
+        -------
+        DumpCrashContext : string.
+            The written file name, or None if failed to write.
+
+        Notes
+        -----
+        * Every event emitted by `EventLog.Emit()` is kept in `Logger.CrashContext`, and persisted into
+          `Logger.CrashContextFile` even if the EventLog is disabled. The events are read by `Logger.ReadCrashContext()`,
+          so the dump of a crash of the system gets the events before the crash, from the previous run.
+
+        Examples
+        --------
+        >>> Logger.DumpCrashContext("C:\\WinDumps\\MEMORY_07.07-1456-2021.DMP.context.json")
+
+        """
+        clock = Clock.get()
+        data = {"wall": clock.wall(), "t": clock.nowNs()}
+        data.update(info)
+        data["events"] = Logger.ReadCrashContext()
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, default=str)
+            return path
+        except Exception:
+            Logger.WriteLine('ERROR: Unable to write crash context %s' %
+                             path, ConsoleColor.Red)
+            return None
+
+    @staticmethod
+    def DeleteLog() -> None:
+        """Delete the log file."""
+        LogSink.release(Logger.FileName)
+        if os.path.exists(Logger.FileName):
+            os.remove(Logger.FileName)
+
+
+################################################################################
+################################### EventLog ###################################
+################################################################################
+class EventLog:
+    """
+    A machine-readable JSON-Lines event stream written alongside the human-readable automation log.
+
+    Every event is one compact JSON object per line, carrying a monotonic nanosecond timestamp of `Clock.get()`
+    ("t"), the event name ("ev"), the current context (run / loop / game / gameLoop ids) and its own fields.
+    Events are written through a buffered `LogSink`.
+    """
+    FileName = '@AutomationEvents.jsonl'
+    Enabled = True
+
+    _Context: Dict[str, Any] = dict()
+    _Encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=str)
+
+    @staticmethod
+    def SetEventFile(path: str) -> None:
+        """
+        Set the event file.
+
+        Parameters
+        ----------
+        path : string.
+            Event file to be used.
+
+        """
+        EventLog.FileName = path
+
+    @staticmethod
+    def SetEnabled(enable: bool) -> None:
+        """
+        Enable or disable the event stream.
+
+        Parameters
+        ----------
+        enable : bool.
+            True to write events; otherwise, events are dropped.
+
+        """
+        EventLog.Enabled = enable
+
+    @staticmethod
+    def SetContext(**fields: Any) -> None:
+        """
+        Set context fields added to every following event. A field with value None is removed.
+
+        Examples
+        --------
+        >>> EventLog.SetContext(run="20210707-145624", loop=0, game="Fallout 4")
+
+        """
+        for key, value in fields.items():
+            if value is None:
+                EventLog._Context.pop(key, None)
+            else:
+                EventLog._Context[key] = value
+
+    @staticmethod
+    def ClearContext() -> None:
+        """Remove all the context fields."""
+        EventLog._Context = dict()
+
+    @staticmethod
+    def Emit(event: str, **fields: Any) -> Dict[str, Any]:
+        """
+        Emit an event.
+
+        Parameters
+        ----------
+        event : string.
+            Name of the event, such as "phase" or "action".
+        fields : Any.
+            Fields of the event. Values should be JSON serializable; otherwise, they are converted to strings.
+
+        Returns
+        -------
+        Emit : Dict[str, Any].
+            The emitted record.
+
+        Examples
+        --------
+        >>> EventLog.Emit("action", index=0, type="w", target="wait", duration=20)
+        {"t":1234567890,"ev":"action","run":"20210707-145624","loop":0,"game":"Fallout 4","index":0,"type":"w",...}
+
+        """
+        record = {"t": Clock.get().nowNs(), "ev": event}
+        record.update(EventLog._Context)
+        record.update(fields)
+        # Memory only, persisted by `Logger.PersistCrashContext()` off the emitting path
+        Logger.CrashContext.append(record)
+        if EventLog.Enabled:
+            LogSink.get(EventLog.FileName).write(EventLog._Encoder.encode(record) + '\n')
+        return record
+
+    @staticmethod
+    @contextlib.contextmanager
+    def Phase(phase: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Emit a "phase" event with state "begin" when entered, and with state "end" and its duration
+        in nanoseconds ("ns") when exited.
+
+        Parameters
+        ----------
+        phase : string.
+            Name of the phase, such as "launch", "start", "benchmark" and "quit".
+        fields : Any.
+            Fields added to both events.
+
+        Examples
+        --------
+        >>> with EventLog.Phase("launch"):
+        >>>     game.launch()
+
+        Fields can also be added to the "end" event with the yielded dictionary:
+
+        >>> with EventLog.Phase("launch") as end:
+        >>>     end["code"] = game.launch()
+
+        """
+        begin = EventLog.Emit("phase", phase=phase, state="begin", **fields)
+        Logger.PersistCrashContext()
+        end = dict(fields)
+        try:
+            yield end
+        finally:
+            end["ns"] = Clock.get().nowNs() - begin["t"]
+            EventLog.Emit("phase", phase=phase, state="end", **end)
+            Logger.PersistCrashContext()
+
+    @staticmethod
+    def Read(path: str = None, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily read events from an event file. Only one line is held in memory at a time.
+
+        Parameters
+        ----------
+        path : string, optional.
+            The event file to read (default: None). None to read `EventLog.FileName`.
+        filters : Any.
+            Only yield events whose fields equal to all the given values.
+
+        Returns
+        -------
+        Read : Iterator[Dict[str, Any]].
+            An iterator of event records.
+
+        Examples
+        --------
+        To get how long each game spent on benchmarking:
+
+        >>> for e in EventLog.Read(ev="phase", phase="benchmark", state="end"):
+        >>>     print(e["loop"], e["game"], e["ns"] / 1e9)
+
+        """
+        fileName = path if path else EventLog.FileName
+        if fileName in LogSink._Sinks:
+            LogSink._Sinks[fileName].flush()
+        items = list(filters.items())
+        with open(fileName, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                for key, value in items:
+                    if record.get(key) != value:
+                        break
+                else:
+                    yield record
+
+
+################################################################################
+################################## WaitStats ###################################
+################################################################################
+class WaitStats:
+    """
+    A histogram of overshoots of precise waits, how late each wait returned after its deadline.
+
+    Overshoots are counted in log2 buckets of microseconds: bucket 0 is below 1 us, and bucket i
+    is from 2^(i-1) us to 2^i us. The last bucket also counts every longer overshoot.
+    """
+    BUCKETS = 26
+
+    def __init__(self) -> None:
+        self.buckets = array.array('Q', bytes(8 * WaitStats.BUCKETS))
+        self.count: int = 0
+        self.totalNs: int = 0
+        self.maxNs: int = 0
+        self.spinNs: int = 0
+
+    def record(self, overshootNs: int, spinNs: int = 0) -> None:
+        """Record the overshoot and spinning time of a wait in nanoseconds."""
+        if overshootNs < 0:
+            overshootNs = 0
+        self.buckets[min((overshootNs // 1000).bit_length(), WaitStats.BUCKETS - 1)] += 1
+        self.count += 1
+        self.totalNs += overshootNs
+        self.spinNs += spinNs
+        if overshootNs > self.maxNs:
+            self.maxNs = overshootNs
+
+    def clear(self) -> None:
+        """Clear the histogram."""
+        self.__init__()
+
+    def percentile(self, q: float) -> float:
+        """Return the upper bound in seconds of the bucket holding the `q` (0 to 1) quantile of overshoots."""
+        if not self.count:
+            return 0
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for i, counts in enumerate(self.buckets):
+            seen += counts
+            if seen >= rank:
+                return min((1 << i) * 1e-6, self.maxNs / 1e9)
+        return self.maxNs / 1e9
+
+    def getStats(self) -> Dict[str, Any]:
+        """
+        Get the statistics of the recorded waits.
+
+        Returns
+        -------
+        getStats : Dict[str, Any].
+            A dictionary with the following keys:
+                waits - waits recorded.\n
+                overshootMean / overshootMax - overshoot in seconds.\n
+                overshootP50 / overshootP95 / overshootP99 - bucket upper bound of the overshoot quantiles in seconds.\n
+                spin - seconds spent spinning before deadlines.\n
+                histogram - counts of non-empty buckets keyed by their upper bound, such as "<64us".
+
+        """
+        return {
+            "waits": self.count,
+            "overshootMean": self.totalNs / self.count / 1e9 if self.count else 0,
+            "overshootMax": self.maxNs / 1e9,
+            "overshootP50": self.percentile(0.5),
+            "overshootP95": self.percentile(0.95),
+            "overshootP99": self.percentile(0.99),
+            "spin": self.spinNs / 1e9,
+            "histogram": {"<%sus" % (1 << i): counts for i, counts in enumerate(self.buckets) if counts},
+        }
+
+
+################################################################################
+################################# PreciseWait ##################################
+################################################################################
+class PreciseWait:
+    """
+    A hybrid sleep/spin wait returning close to its deadline.
+
+    A wait sleeps coarsely until `spinThreshold` seconds before the deadline, and then spins on
+    `time.perf_counter_ns()` for the rest, so the OS timer granularity (1-15 ms) is not added to
+    short key holds. Spinning burns CPU, which is limited by:
+        spinThreshold - the most seconds a wait spins.\n
+        maxSpinRatio - the most spinning time over total waiting time; above it, waits only sleep.\n
+        spinMode - "yield" gives the CPU away while spinning, "busy" never does, "off" never spins.
+    Overshoots of every wait are recorded in `PreciseWait.stats`, and in every `WaitStats` attached
+    by `PreciseWait.attach()`, such as the one of a running `Scheduler`.
+
+    `RealClock.sleep()` waits with the current PreciseWait, which is got by `PreciseWait.get()`
+    and replaced by `PreciseWait.set()`.
+    """
+    _Current: 'PreciseWait' = None
+
+    def __init__(self, spinThreshold: float = 0.002, maxSpinRatio: float = 0.1,
+                 spinMode: Literal["yield", "busy", "off"] = "yield") -> None:
+        """
+        Construct a PreciseWait.
+
+        Parameters
+        ----------
+        spinThreshold : float, optional.
+            Seconds before the deadline to stop sleeping and start spinning (default: 0.002).
+        maxSpinRatio : float, optional.
+            Most spinning time over total waiting time (default: 0.1). None for no limit.
+        spinMode : Literal["yield", "busy", "off"], optional.
+            How to spin (default: "yield").
+
+        """
+        self.spinThreshold: float = spinThreshold
+        self.maxSpinRatio: float = maxSpinRatio
+        self.spinMode: str = spinMode
+        self.stats = WaitStats()
+
+        self._thresholdNs: int = int(spinThreshold * 1e9)
+        self._waitedNs: int = 0
+        self._attached: List[WaitStats] = []
+
+    @staticmethod
+    def get() -> 'PreciseWait':
+        """Return the current PreciseWait."""
+        return PreciseWait._Current
+
+    @staticmethod
+    def set(wait: 'PreciseWait' = None) -> 'PreciseWait':
+        """
+        Replace the current PreciseWait.
+
+        Parameters
+        ----------
+        wait : PreciseWait, optional.
+            The new PreciseWait, or None to restore a default one (default: None).
+
+        Returns
+        -------
+        set : PreciseWait.
+            The previous PreciseWait.
+
+        """
+        previous = PreciseWait._Current
+        PreciseWait._Current = wait if wait is not None else PreciseWait()
+        return previous
+
+    def attach(self, stats: WaitStats) -> WaitStats:
+        """Record the following waits also into `stats`, until detached."""
+        self._attached.append(stats)
+        return stats
+
+    def detach(self, stats: WaitStats) -> None:
+        """Stop recording waits into `stats`."""
+        if stats in self._attached:
+            self._attached.remove(stats)
+
+    def sleep(self, seconds: float) -> int:
+        """
+        Wait for `seconds` seconds.
+
+        Returns
+        -------
+        sleep : integer.
+            Overshoot in nanoseconds.
+
+        """
+        if seconds <= 0:
+            return 0
+        return self.waitUntilNs(time.perf_counter_ns() + int(seconds * 1e9))
+
+    def waitUntilNs(self, deadline: int) -> int:
+        """
+        Wait until `deadline`, a `time.perf_counter_ns()` time in nanoseconds.
+
+        Returns
+        -------
+        waitUntilNs : integer.
+            Overshoot in nanoseconds, which is 0 if the deadline has passed when called.
+
+        """
+        begin = now = time.perf_counter_ns()
+        if now >= deadline:
+            return 0
+
+        threshold = self._thresholdNs
+        if self.spinMode == "off" or (self.maxSpinRatio is not None and
+                                      self.stats.spinNs > self.maxSpinRatio * self._waitedNs):
+            threshold = 0
+        while deadline - now > threshold:
+            time.sleep((deadline - now - threshold) / 1e9)
+            now = time.perf_counter_ns()
+
+        spinStart = now
+        if self.spinMode == "busy":
+            while now < deadline:
+                now = time.perf_counter_ns()
+        else:
+            while now < deadline:
+                time.sleep(0)
+                now = time.perf_counter_ns()
+        spinNs = now - spinStart
+
+        overshoot = now - deadline
+        self._waitedNs += now - begin
+        self.stats.record(overshoot, spinNs)
+        for stats in self._attached:
+            stats.record(overshoot, spinNs)
+        return overshoot
+
+
+PreciseWait.set(PreciseWait())
+
+
+################################################################################
+#################################### Clock #####################################
+################################################################################
+class Clock(abc.ABC):
+    """
+    Clock used by every wait and timestamp of BMAutomation.
+
+    The current clock is got by `Clock.get()` and replaced by `Clock.set()`. `RealClock` is used by default;
+    `VirtualClock` advances instantly on sleeping, so a whole run can be simulated in seconds while
+    keeping the same event timeline and timing statistics.
+    """
+    _Current: 'Clock' = None
+
+    @abc.abstractmethod
+    def now(self) -> float:
+        """Return a monotonic time in seconds, comparable to `time.perf_counter()`."""
+
+    @abc.abstractmethod
+    def nowNs(self) -> int:
+        """Return a monotonic time in nanoseconds, comparable to `time.perf_counter_ns()`."""
+
+    @abc.abstractmethod
+    def wall(self) -> float:
+        """Return the wall-clock time in seconds since the epoch, comparable to `time.time()`."""
+
+    @abc.abstractmethod
+    def sleep(self, seconds: float) -> None:
+        """Wait for `seconds` seconds."""
+
+    @staticmethod
+    def get() -> 'Clock':
+        """Return the current clock."""
+        return Clock._Current
+
+    @staticmethod
+    def set(clock: 'Clock' = None) -> 'Clock':
+        """
+        Replace the current clock.
+
+        Parameters
+        ----------
+        clock : Clock, optional.
+            The new clock, or None to restore a `RealClock` (default: None).
+
+        Returns
+        -------
+        set : Clock.
+            The previous clock.
+
+        """
+        previous = Clock._Current
+        Clock._Current = clock if clock is not None else RealClock()
+        return previous
+
+    @staticmethod
+    @contextlib.contextmanager
+    def use(clock: 'Clock') -> Iterator['Clock']:
+        """
+        Use a clock within a `with` block, and restore the previous clock afterward.
+
+        Examples
+        --------
+        >>> with Clock.use(VirtualClock()) as clock:
+        ...     automation.start()
+        ...     print(clock.now())
+
+        """
+        previous = Clock.set(clock)
+        try:
+            yield clock
+        finally:
+            Clock.set(previous)
+
+
+class RealClock(Clock):
+    """The wall clock, sleeping with the current `PreciseWait`."""
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def nowNs(self) -> int:
+        return time.perf_counter_ns()
+
+    def wall(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            PreciseWait._Current.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """
+    A simulated clock. Sleeping advances the clock instantly instead of waiting.
+
+    The clock starts at the real time when constructed, unless `start` and `wallStart` are given.
+    It is shared by all threads; every sleep advances it for all of them.
+    """
+
+    def __init__(self, start: float = None, wallStart: float = None) -> None:
+        """
+        Construct a VirtualClock.
+
+        Parameters
+        ----------
+        start : float, optional.
+            Initial monotonic time in seconds (default: None, `time.perf_counter()`).
+        wallStart : float, optional.
+            Initial wall-clock time in seconds since the epoch (default: None, `time.time()`).
+
+        """
+        self._lock = threading.Lock()
+        self._ns: int = int((time.perf_counter() if start is None else start) * 1e9)
+        self._wallOffset: float = (time.time() if wallStart is None else wallStart) - self._ns / 1e9
+        self.slept: float = 0
+
+    def now(self) -> float:
+        return self._ns / 1e9
+
+    def nowNs(self) -> int:
+        return self._ns
+
+    def wall(self) -> float:
+        return self._ns / 1e9 + self._wallOffset
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+
+    def advance(self, seconds: float) -> None:
+        """
+        Advance the clock by `seconds` seconds.
+
+        Parameters
+        ----------
+        seconds : float.
+            Seconds to advance. Negative values are ignored.
+
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            # Round up, so waiting until a deadline always reaches it
+            self._ns += math.ceil(seconds * 1e9)
+            self.slept += seconds
+
+
+Clock.set(RealClock())
+
+
+################################################################################
+################################## Scheduler ###################################
+################################################################################
+class Scheduler:
+    """
+    A drift-free scheduler running actions at absolute deadlines measured from the run start.
+
+    Every action is scheduled at an offset from the run start instead of after the previous action,
+    so the time spent in sleeping, inputs and logging never accumulates. Late actions are handled
+    by the policy:
+        "compensate" - run a late action immediately; the following deadlines are unchanged, so the
+        following waits are shortened to catch up.\n
+        "skip" - skip an action later than `maxLateness` seconds, and keep the following deadlines.
+    """
+    POLICY_COMPENSATE = "compensate"
+    POLICY_SKIP = "skip"
+
+    def __init__(self, duration: float, policy: Literal["compensate", "skip"] = "compensate", maxLateness: float = 1.0) -> None:
+        """
+        Construct a Scheduler.
+
+        Parameters
+        ----------
+        duration : float.
+            Planned duration of the run in seconds.
+        policy : Literal["compensate", "skip"], optional.
+            How to handle late actions (default: "compensate").
+        maxLateness : float, optional.
+            Seconds an action can be late before it is skipped in policy "skip" (default: 1.0).
+
+        """
+        self.duration: float = duration
+        self.policy: str = policy
+        self.maxLateness: float = maxLateness
+
+        self._start: float = None
+        self._end: float = None
+        self._lateness = array.array('d')
+        self._skipped: int = 0
+        self._waits = WaitStats()
+
+    def start(self) -> None:
+        """Start the run now. Called automatically by the first wait if not called."""
+        self._start = Clock.get().now()
+        self._end = None
+        self._waits.clear()
+        PreciseWait.get().detach(self._waits)
+        PreciseWait.get().attach(self._waits)
+
+    def elapsed(self) -> float:
+        """Return the seconds elapsed since the run start."""
+        if self._start is None:
+            return 0
+        return (self._end if self._end is not None else Clock.get().now()) - self._start
+
+    def remaining(self) -> float:
+        """Return the planned seconds remaining."""
+        return max(self.duration - self.elapsed(), 0)
+
+    def waitUntil(self, offset: float) -> float:
+        """
+        Wait until `offset` seconds after the run start.
+
+        Parameters
+        ----------
+        offset : float.
+            Deadline in seconds from the run start.
+
+        Returns
+        -------
+        waitUntil : float.
+            Lateness in seconds, which is 0 if the deadline has not passed when called.
+
+        """
+        if self._start is None:
+            self.start()
+        clock = Clock.get()
+        deadline = self._start + offset
+        now = clock.now()
+        if now >= deadline:
+            return now - deadline
+        while now < deadline:
+            clock.sleep(deadline - now)
+            now = clock.now()
+        return 0
+
+    def run(self, offset: float, action: Callable, *args: Any) -> bool:
+        """
+        Run an action at `offset` seconds after the run start, and record its lateness.
+
+        Parameters
+        ----------
+        offset : float.
+            Deadline in seconds from the run start.
+        action : Callable.
+            The action to be run.
+        args : Any.
+            Arguments passed to the action.
+
+        Returns
+        -------
+        run : bool.
+            Return True if the action is run; otherwise, it is skipped and return False.
+
+        """
+        self.waitUntil(offset)
+        lateness = Clock.get().now() - self._start - offset
+        self._lateness.append(lateness)
+        if self.policy == Scheduler.POLICY_SKIP and lateness > self.maxLateness:
+            self._skipped += 1
+            return False
+        action(*args)
+        return True
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Wait until the planned end of the run, and stop the run.
+
+        Returns
+        -------
+        finish : Dict[str, Any].
+            The report of the run, please see more in `Scheduler.getReport()`.
+
+        """
+        self.waitUntil(self.duration)
+        self._end = Clock.get().now()
+        PreciseWait.get().detach(self._waits)
+        return self.getReport()
+
+    def getReport(self) -> Dict[str, Any]:
+        """
+        Get the report of the run.
+
+        Returns
+        -------
+        getReport : Dict[str, Any].
+            A dictionary with the following keys:
+                planned - planned duration in seconds.\n
+                achieved - achieved duration in seconds.\n
+                overrun - achieved minus planned duration in seconds.\n
+                actions - actions scheduled.\n
+                skipped - actions skipped by policy "skip".\n
+                latenessMean / latenessMax / latenessP95 - lateness of actions in seconds.\n
+                waitOvershoot - overshoot of the precise waits during the run, please see more in `WaitStats.getStats()`.
+
+        """
+        lateness = sorted(self._lateness)
+        count = len(lateness)
+        achieved = self.elapsed()
+        return {
+            "planned": self.duration,
+            "achieved": achieved,
+            "overrun": achieved - self.duration,
+            "actions": count,
+            "skipped": self._skipped,
+            "latenessMean": sum(lateness) / count if count else 0,
+            "latenessMax": lateness[-1] if count else 0,
+            "latenessP95": lateness[min(int(count * 0.95), count - 1)] if count else 0,
+            "waitOvershoot": self._waits.getStats(),
+        }
+
+
+################################################################################
+############################## BenchmarkSchedule ###############################
+################################################################################
+class BenchmarkSchedule:
+    """
+    A seeded, precomputed action schedule of a random Benchmarking mode.
+
+    The whole schedule is generated ahead of time from a seed, and stored as compact parallel arrays:
+        offsets - start offset of each action in seconds from the run start.\n
+        actionIds - index of each action in `actions`.\n
+        holds - hold time of each action in seconds.
+    The same mode, duration and seed always produce the same schedule and the same `getHash()`,
+    so the input workloads of different machines can be compared.
+    """
+
+    def __init__(self, mode: Literal[0, 1, 2, 3, 4], duration: float, seed: int, actions: List[str]) -> None:
+        """
+        Construct an empty BenchmarkSchedule.
+
+        Parameters
+        ----------
+        mode : Literal[0, 1, 2, 3, 4].
+            The Benchmarking Mode, please see more in `Game.setBenchmarkingMode()`.
+        duration : float.
+            Planned duration of the run in seconds.
+        seed : int.
+            The seed the schedule is generated from.
+        actions : List[str].
+            Names of actions referred by `actionIds`.
+
+        """
+        self.mode: int = mode
+        self.duration: float = duration
+        self.seed: int = seed
+        self.actions: List[str] = actions
+
+        self.offsets = array.array('d')
+        self.actionIds = array.array('H')
+        self.holds = array.array('d')
+        self._hash: str = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def append(self, offset: float, actionId: int, hold: float) -> None:
+        """Append an action to the schedule."""
+        self.offsets.append(offset)
+        self.actionIds.append(actionId)
+        self.holds.append(hold)
+        self._hash = None
+
+    def getHash(self) -> str:
+        """
+        Get the content hash of the schedule.
+
+        Returns
+        -------
+        getHash : str.
+            SHA-256 hex digest over the mode, duration, actions and the arrays in little-endian.
+
+        """
+        if self._hash is None:
+            h = hashlib.sha256(json.dumps(
+                [self.mode, self.duration, self.actions]).encode('utf-8'))
+            for arr in (self.offsets, self.actionIds, self.holds):
+                if sys.byteorder != 'little':
+                    arr = array.array(arr.typecode, arr)
+                    arr.byteswap()
+                h.update(arr.tobytes())
+            self._hash = h.hexdigest()
+        return self._hash
+
+    def describe(self) -> Dict[str, Any]:
+        """Return the seed, content hash and length of the schedule, to be recorded in results."""
+        return {"seed": self.seed, "scheduleHash": self.getHash(), "scheduleLength": len(self)}
+
+    @staticmethod
+    def generate(mode: Literal[0, 1, 2, 3, 4], duration: float, seed: int = None) -> 'BenchmarkSchedule':
+        """
+        Generate the schedule of a Benchmarking Mode.
+
+        Parameters
+        ----------
+        mode : Literal[0, 1, 2, 3, 4].
+            The Benchmarking Mode, please see more in `Game.setBenchmarkingMode()`.
+            Normal Test (0) generates an empty schedule.
+        duration : float.
+            Planned duration of the run in seconds.
+        seed : int, optional.
+            The seed (default: None, a random seed which is recorded in the schedule).
+
+        Returns
+        -------
+        generate : BenchmarkSchedule.
+            The generated schedule.
+
+        """
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+        rng = random.Random(seed)
+        uniform = rng.uniform
+
+        if mode == 1:
+            actions = ["alt_tab"]
+        elif mode == 2:
+            actions = list(Benchmarking._RANDOM_KEY_LIST)
+        elif mode == 3:
+            actions = sorted(_RANDOM_WORD_LIST)
+        elif mode == 4:
+            actions = [str(angle) for angle in Benchmarking._ROTATE_ANGLE]
+        else:
+            actions = []
+        schedule = BenchmarkSchedule(mode, duration, seed, actions)
+        if not actions:
+            return schedule
+
+        offset = 0
+        while offset < duration:
+            if mode == 4:
+                schedule.append(offset, rng.randrange(len(actions)), 0)
+                offset += uniform(5, 20)
+                continue
+
+            waitTime = uniform(Benchmarking._BM_WAIT_TIME_MIN,
+                               Benchmarking._BM_WAIT_TIME_MAX)
+            keyTime = uniform(Benchmarking._KEY_PRESS_WAIT_TIME_MIN,
+                              Benchmarking._KEY_PRESS_WAIT_TIME_MAX)
+            actionId = rng.randrange(len(actions))
+
+            if offset + keyTime > duration:
+                keyTime = int((duration - offset) / 2)
+                waitTime = duration - offset - keyTime
+
+            # ALT+TAB of Stress Test (1) is a single unit away and back after the key time, please see more in
+            # `Benchmarking.altTabAway()`
+            schedule.append(offset, actionId, keyTime)
+            offset += keyTime + waitTime
+        return schedule
+
+
+################################################################################
+############################## WorkloadGenerator ###############################
+################################################################################
+class WorkloadGenerator:
+    """
+    A vectorized generator of long random workloads, for multi-hour soak runs and parameter sweeps.
+
+    Hold and wait times are drawn in blocks with NumPy from configurable distributions:
+        ("uniform", low, high) - uniformly between `low` and `high` seconds.\n
+        ("exponential", mean) or ("exponential", mean, maxValue) - exponentially with `mean` seconds,
+        clipped to `maxValue` seconds if given.\n
+        ("empirical", samples) - resampled from recorded durations in seconds, e.g. of human play.
+    Actions are drawn from a weighted mix. Start offsets are the cumulative sum of hold and wait times,
+    clipped to the duration by `searchsorted`, so no Python code runs per action while generating.
+
+    Records are structured arrays of `WorkloadGenerator.DTYPE`, 14 bytes per action:
+        offset - start offset in seconds from the run start.\n
+        action - index of the action in `actions`.\n
+        hold - hold time in seconds.
+    The same settings and seed always produce the same records, whether generated at once or streamed by blocks.
+
+    Requires NumPy ('pip install numpy').
+    """
+    DTYPE = np.dtype([('offset', np.float64), ('action', np.uint16), ('hold', np.float32)]) if np is not None else None
+
+    DISTRIBUTIONS = ("uniform", "exponential", "empirical")
+
+    def __init__(self, actions: List[str], weights: List[float] = None,
+                 hold: tuple = ("uniform", 0, 2), wait: tuple = ("uniform", 0, 3),
+                 seed: int = None, blockSize: int = 65536) -> None:
+        """
+        Construct a WorkloadGenerator.
+
+        Parameters
+        ----------
+        actions : List[str].
+            Names of actions referred by the `action` field of records. At most 65536 actions.
+        weights : List[float], optional.
+            Relative weight of each action (default: None, uniformly weighted).
+        hold : tuple, optional.
+            Distribution of hold times (default: ("uniform", 0, 2)), please see more in `WorkloadGenerator`.
+        wait : tuple, optional.
+            Distribution of wait times after holds (default: ("uniform", 0, 3)).
+        seed : int, optional.
+            The seed (default: None, a random seed which is recorded in `WorkloadGenerator.seed`).
+        blockSize : integer, optional.
+            Actions drawn per block (default: 65536). Records of different block sizes are different.
+
+        """
+        if np is None:
+            raise ImportError("WorkloadGenerator requires NumPy, please 'pip install numpy'")
+        if not actions or len(actions) > 65536:
+            raise ValueError("WorkloadGenerator needs 1 to 65536 actions, got %s" % len(actions))
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+
+        self.actions: List[str] = list(actions)
+        self.seed: int = seed
+        self.blockSize: int = max(int(blockSize), 1)
+        self.hold: tuple = WorkloadGenerator._checkDistribution(hold)
+        self.wait: tuple = WorkloadGenerator._checkDistribution(wait)
+
+        self._p = None
+        if weights is not None:
+            p = np.asarray(weights, dtype=np.float64)
+            if p.shape != (len(self.actions),) or (p < 0).any() or p.sum() <= 0:
+                raise ValueError("WorkloadGenerator weights must be %s non-negative numbers with a positive sum" % len(self.actions))
+            self._p = p / p.sum()
+
+    @staticmethod
+    def _checkDistribution(spec: tuple) -> tuple:
+        """Validate a distribution, and convert empirical samples to an array."""
+        if not spec or spec[0] not in WorkloadGenerator.DISTRIBUTIONS:
+            raise ValueError("Unknown distribution %r, should be one of %s" % (spec, WorkloadGenerator.DISTRIBUTIONS))
+        if spec[0] == "empirical":
+            samples = np.asarray(spec[1], dtype=np.float64).ravel()
+            if not samples.size or (samples < 0).any():
+                raise ValueError("Empirical distribution needs non-negative samples")
+            return ("empirical", samples)
+        return tuple(spec)
+
+    def _draw(self, rng: 'np.random.Generator', spec: tuple, size: int) -> 'np.ndarray':
+        """Draw `size` durations in seconds from a distribution."""
+        kind = spec[0]
+        if kind == "uniform":
+            return rng.uniform(spec[1], spec[2], size)
+        if kind == "exponential":
+            values = rng.exponential(spec[1], size)
+            if len(spec) > 2 and spec[2] is not None:
+                np.minimum(values, spec[2], out=values)
+            return values
+        return rng.choice(spec[1], size)
+
+    def iterBlocks(self, duration: float) -> Iterator['np.ndarray']:
+        """
+        Generate the records of a run block by block, with bounded memory.
+
+        Parameters
+        ----------
+        duration : float.
+            Planned duration of the run in seconds. Actions starting at or after it are dropped,
+            and the hold of the last action is clipped to it.
+
+        Yields
+        ------
+        iterBlocks : np.ndarray.
+            Records of up to `blockSize` actions in start order.
+
+        """
+        rng = np.random.default_rng(self.seed)
+        count = len(self.actions)
+        size = self.blockSize
+        offset = 0.0
+        while offset < duration:
+            if self._p is None:
+                actionIds = rng.integers(count, size=size)
+            else:
+                actionIds = rng.choice(count, size, p=self._p)
+            holds = self._draw(rng, self.hold, size)
+            steps = holds + self._draw(rng, self.wait, size)
+
+            ends = np.cumsum(steps)
+            ends += offset
+            starts = np.empty_like(ends)
+            starts[0] = offset
+            starts[1:] = ends[:-1]
+            if ends[-1] <= offset:
+                raise ValueError("WorkloadGenerator hold and wait times are all zero")
+
+            # Actions are in start order, so the run ends at the first start past the duration
+            n = int(np.searchsorted(starts, duration, side='left'))
+            block = np.empty(n, dtype=WorkloadGenerator.DTYPE)
+            block['offset'] = starts[:n]
+            block['action'] = actionIds[:n]
+            block['hold'] = np.minimum(holds[:n], duration - starts[:n])
+            offset = ends[-1]
+            if n:
+                yield block
+
+    def generate(self, duration: float) -> 'np.ndarray':
+        """
+        Generate all records of a run at once.
+
+        Parameters
+        ----------
+        duration : float.
+            Planned duration of the run in seconds.
+
+        Returns
+        -------
+        generate : np.ndarray.
+            Records of `WorkloadGenerator.DTYPE`, please see more in `WorkloadGenerator.iterBlocks()`.
+
+        """
+        blocks = list(self.iterBlocks(duration))
+        if not blocks:
+            return np.empty(0, dtype=WorkloadGenerator.DTYPE)
+        return np.concatenate(blocks)
+
+    def hashBlocks(self) -> 'hashlib._Hash':
+        """Return a SHA-256 object fed with the settings, to be updated with the bytes of every block."""
+        settings = [self.actions, self.seed, self.blockSize,
+                    None if self._p is None else self._p.tolist()]
+        for spec in (self.hold, self.wait):
+            settings.append([spec[0]] + [v.tolist() if isinstance(v, np.ndarray) else v for v in spec[1:]])
+        return hashlib.sha256(json.dumps(settings).encode('utf-8'))
+
+    def toSchedule(self, mode: Literal[0, 1, 2, 3, 4], duration: float) -> BenchmarkSchedule:
+        """
+        Generate a run into a BenchmarkSchedule, to be replayed by `Benchmarking.replay()`.
+
+        Parameters
+        ----------
+        mode : Literal[0, 1, 2, 3, 4].
+            The Benchmarking Mode the actions are resolved with, please see more in `Game.setBenchmarkingMode()`.
+        duration : float.
+            Planned duration of the run in seconds.
+
+        Returns
+        -------
+        toSchedule : BenchmarkSchedule.
+            The schedule holding all records of the run.
+
+        """
+        schedule = BenchmarkSchedule(mode, duration, self.seed, self.actions)
+        for block in self.iterBlocks(duration):
+            schedule.offsets.frombytes(block['offset'].astype(np.float64).tobytes())
+            schedule.actionIds.frombytes(block['action'].astype(np.uint16).tobytes())
+            schedule.holds.frombytes(block['hold'].astype(np.float64).tobytes())
+        return schedule
+
+    @staticmethod
+    def forMode(mode: Literal[1, 2, 3, 4], seed: int = None, weights: List[float] = None,
+                hold: tuple = None, wait: tuple = None, blockSize: int = 65536) -> 'WorkloadGenerator':
+        """
+        Construct a WorkloadGenerator with the actions and default timings of a Benchmarking Mode.
+
+        Parameters
+        ----------
+        mode : Literal[1, 2, 3, 4].
+            The Benchmarking Mode, please see more in `Game.setBenchmarkingMode()`.
+        seed : int, optional.
+            The seed (default: None, a random seed).
+        weights : List[float], optional.
+            Relative weight of each action of the mode (default: None, uniformly weighted).
+        hold : tuple, optional.
+            Distribution of hold times (default: None, uniform in the key press time range of `Benchmarking`).
+            For Stress Test, the time away from the game.
+        wait : tuple, optional.
+            Distribution of wait times (default: None, uniform in the wait time range of `Benchmarking`;
+            for Random Rotate Test, uniform in 5 to 20 seconds). For Stress Test, the time back in the game.
+        blockSize : integer, optional.
+            Actions drawn per block (default: 65536).
+
+        Returns
+        -------
+        forMode : WorkloadGenerator.
+            The generator.
+
+        Notes
+        -----
+        A record of Stress Test is a single unit of ALT+TAB away, hold and ALT+TAB back, as the records of
+        `BenchmarkSchedule.generate()`, please see more in `Benchmarking.altTabAway()`.
+
+        """
+        if mode == 1:
+            actions = ["alt_tab"]
+        elif mode == 2:
+            actions = list(Benchmarking._RANDOM_KEY_LIST)
+        elif mode == 3:
+            actions = sorted(_RANDOM_WORD_LIST)
+        elif mode == 4:
+            actions = [str(angle) for angle in Benchmarking._ROTATE_ANGLE]
+        else:
+            raise ValueError("Benchmarking Mode %s has no actions" % mode)
+
+        if hold is None:
+            hold = ("uniform", 0, 0) if mode == 4 else (
+                "uniform", Benchmarking._KEY_PRESS_WAIT_TIME_MIN, Benchmarking._KEY_PRESS_WAIT_TIME_MAX)
+        if wait is None:
+            wait = ("uniform", 5, 20) if mode == 4 else (
+                "uniform", Benchmarking._BM_WAIT_TIME_MIN, Benchmarking._BM_WAIT_TIME_MAX)
+        return WorkloadGenerator(actions, weights, hold, wait, seed, blockSize)
+
+
+################################################################################
+################################# Benchmarking #################################
+################################################################################
+class Benchmarking:
+    """Benchmarking Methods for Automation Testing"""
+    # BM stands for BenchMarking
+    _ROTATE_ANGLE = [0, 90, 180, 270]
+
+    _BM_WAIT_TIME_MIN = 0
+    _BM_WAIT_TIME_MAX = 3
+
+    _KEY_PRESS_WAIT_TIME_MIN = 0
+    _KEY_PRESS_WAIT_TIME_MAX = 2
+
+    _RANDOM_KEY_LIST = [
+        "w",
+        "a",
+        "s",
+        "d",
+        "e",
+        "space",
+        "left_click",
+        "right_click",
+        "view_upward",
+        "view_downward",
+        "view_leftward",
+        "view_rightward"
+    ]
+    # "spacebar",
+
+    _MOUSE_LIST = [
+        "left_click",
+        "right_click",
+        "view_upward",
+        "view_downward",
+        "view_leftward",
+        "view_rightward"
+    ]
+
+    # Camera curves of view actions, and their speed in mouse counts per second
+    _VIEW_CURVE = {
+        "view_upward": "panUp",
+        "view_downward": "panDown",
+        "view_leftward": "panLeft",
+        "view_rightward": "panRight"
+    }
+    _VIEW_SPEED = 400
+
+    # Logger Progress Bar width
+    _WIDTH = 50
+
+    @staticmethod
+    def NormalTest(duration: float) -> Dict[str, Any]:
+        """
+        Perform a normal Benchmarking. No actions would be made.
+
+        Parameters
+        ----------
+        duration : float.
+            Time to perform the normal benchmarking.
+
+        Returns
+        -------
+        NormalTest : Dict[str, Any].
+            The report of planned and achieved duration, please see more in `Scheduler.getReport()`.
+
+        """
+        scheduler = Scheduler(duration)
+        bar = ProgressBar(duration, width=Benchmarking._WIDTH, unit="s")
+        scheduler.start()
+        for counts in range(0, int(duration)):
+            scheduler.waitUntil(counts)
+            bar.update(counts)
+        report = scheduler.finish()
+        bar.update(duration)
+        return report
+
+    @staticmethod
+    def RandomControlTest(duration: float, policy: Literal["compensate", "skip"] = "compensate", seed: int = None) -> Dict[str, Any]:
+        """
+        Perform a random Character Control for games: movement keys, clicks and relative camera motion.
+
+        Parameters
+        ----------
+        duration : float.
+            Time to perform the random character control.
+        policy : Literal["compensate", "skip"], optional.
+            How to handle late actions (default: "compensate"), please see more in `Scheduler`.
+        seed : int, optional.
+            Seed of the action schedule (default: None, a random seed), please see more in `BenchmarkSchedule`.
+
+        Returns
+        -------
+        RandomControlTest : Dict[str, Any].
+            The report of the run, please see more in `Benchmarking.replay()`.
+
+        """
+        return Benchmarking.replay(BenchmarkSchedule.generate(2, duration, seed), policy)
+
+    @staticmethod
+    def RandomInputTest(duration: float, policy: Literal["compensate", "skip"] = "compensate", seed: int = None) -> Dict[str, Any]:
+        """
+        Perform a random Typing Words for Office.
+
+        Parameters
+        ----------
+        duration : float.
+            Time to perform the random typing.
+        policy : Literal["compensate", "skip"], optional.
+            How to handle late actions (default: "compensate"), please see more in `Scheduler`.
+        seed : int, optional.
+            Seed of the action schedule (default: None, a random seed), please see more in `BenchmarkSchedule`.
+
+        Returns
+        -------
+        RandomInputTest : Dict[str, Any].
+            The report of the run, please see more in `Benchmarking.replay()`.
+
+        """
+        return Benchmarking.replay(BenchmarkSchedule.generate(3, duration, seed), policy)
+
+    @staticmethod
+    def RandomRotateTest(duration: float, policy: Literal["compensate", "skip"] = "compensate", seed: int = None) -> Dict[str, Any]:
+        """
+        Perform a random screen rotating.
+
+        Parameters
+        ----------
+        duration : float.
+            Time to perform the random screen rotating.
+        policy : Literal["compensate", "skip"], optional.
+            How to handle late actions (default: "compensate"), please see more in `Scheduler`.
+        seed : int, optional.
+            Seed of the action schedule (default: None, a random seed), please see more in `BenchmarkSchedule`.
+
+        Returns
+        -------
+        RandomRotateTest : Dict[str, Any].
+            The report of the run, please see more in `Benchmarking.replay()`.
+
+        """
+        report = Benchmarking.replay(
+            BenchmarkSchedule.generate(4, duration, seed), policy)
+        Benchmarking.changeDisplayDirection(0, 0)
+        return report
+
+    @staticmethod
+    def StressTest(duration: float, policy: Literal["compensate", "skip"] = "compensate", seed: int = None) -> Dict[str, Any]:
+        """
+        Perform a stressed Benchmarking. Randomly performing an ALT+TAB away from the game and back.
+
+        Parameters
+        ----------
+        duration : float.
+            Time to perform the stressed benchmarking.
+        policy : Literal["compensate", "skip"], optional.
+            How to handle late actions (default: "compensate"), please see more in `Scheduler`.
+        seed : int, optional.
+            Seed of the action schedule (default: None, a random seed), please see more in `BenchmarkSchedule`.
+
+        Returns
+        -------
+        StressTest : Dict[str, Any].
+            The report of the run, please see more in `Benchmarking.replay()`.
+
+        """
+        return Benchmarking.replay(BenchmarkSchedule.generate(1, duration, seed), policy)
+
+    @staticmethod
+    def CameraTest(duration: float, curve: str = "figure8", rate: float = 1000, amplitude: float = 800,
+                   period: float = 4, seed: int = 0) -> Dict[str, Any]:
+        """
+        Perform a reproducible camera motion, to stress geometry streaming of 3D games.
+
+        Parameters
+        ----------
+        duration : float.
+            Time to perform the camera motion.
+        curve : string, optional.
+            Name of the curve (default: "figure8"), please see more parameters in `CameraMotion.compile()`.
+
+        Returns
+        -------
+        CameraTest : Dict[str, Any].
+            The report of `Scheduler.getReport()`, with the report of `CameraMotion.play()` under "camera".
+
+        """
+        scheduler = Scheduler(duration)
+        scheduler.start()
+        camera = CameraMotion.play(curve, duration, rate, amplitude, period, seed)
+        report = scheduler.finish()
+        report["camera"] = camera
+        return report
+
+    @staticmethod
+    def ReplayTest(duration: float, path: str, loop: bool = True) -> Dict[str, Any]:
+        """
+        Replay a recording of real play, made by `MacroRecorder`.
+
+        Parameters
+        ----------
+        duration : float.
+            Time to perform the replay.
+        path : string.
+            Path of the recording file.
+        loop : bool, optional.
+            True to replay the recording again from its start until `duration` (default: True).
+
+        Returns
+        -------
+        ReplayTest : Dict[str, Any].
+            The report of the run, please see more in `MacroRecording.play()`.
+
+        """
+        with MacroRecording(path) as recording:
+            return recording.play(duration, loop)
+
+    @staticmethod
+    def replay(schedule: BenchmarkSchedule, policy: Literal["compensate", "skip"] = "compensate") -> Dict[str, Any]:
+        """
+        Replay a precomputed action schedule at its deadlines.
+
+        Parameters
+        ----------
+        schedule : BenchmarkSchedule.
+            The schedule to be replayed.
+        policy : Literal["compensate", "skip"], optional.
+            How to handle late actions (default: "compensate"), please see more in `Scheduler`.
+
+        Returns
+        -------
+        replay : Dict[str, Any].
+            The report of `Scheduler.getReport()`, with the seed, content hash and length of the schedule.
+
+        """
+        handlers = [Benchmarking._getHandler(schedule.mode, action)
+                    for action in schedule.actions]
+
+        scheduler = Scheduler(schedule.duration, policy)
+        bar = ProgressBar(schedule.duration,
+                          width=Benchmarking._WIDTH, unit="s")
+        bar.update(0)
+        scheduler.start()
+        run = scheduler.run
+        for offset, actionId, hold in zip(schedule.offsets, schedule.actionIds, schedule.holds):
+            run(offset, handlers[actionId], hold)
+            bar.update(scheduler.elapsed())
+
+        report = scheduler.finish()
+        bar.update(schedule.duration)
+        report.update(schedule.describe())
+        return report
+
+    @staticmethod
+    def replayWorkload(generator: WorkloadGenerator, mode: Literal[1, 2, 3, 4], duration: float,
+                       policy: Literal["compensate", "skip"] = "compensate") -> Dict[str, Any]:
+        """
+        Stream the workload of a generator block by block, and run its actions at their deadlines.
+
+        Only one block of records is held at a time, so a multi-hour workload uses bounded memory.
+
+        Parameters
+        ----------
+        generator : WorkloadGenerator.
+            The generator of the workload, please see more in `WorkloadGenerator`.
+        mode : Literal[1, 2, 3, 4].
+            The Benchmarking Mode the actions are resolved with, please see more in `Game.setBenchmarkingMode()`.
+        duration : float.
+            Planned duration of the run in seconds.
+        policy : Literal["compensate", "skip"], optional.
+            How to handle late actions (default: "compensate"), please see more in `Scheduler`.
+
+        Returns
+        -------
+        replayWorkload : Dict[str, Any].
+            The report of `Scheduler.getReport()`, with the seed, content hash and length of the workload.
+
+        """
+        handlers = [Benchmarking._getHandler(mode, action)
+                    for action in generator.actions]
+        h = generator.hashBlocks()
+        length = 0
+
+        scheduler = Scheduler(duration, policy)
+        bar = ProgressBar(duration, width=Benchmarking._WIDTH, unit="s")
+        bar.update(0)
+        scheduler.start()
+        run = scheduler.run
+        for block in generator.iterBlocks(duration):
+            h.update(block.tobytes())
+            length += len(block)
+            for offset, actionId, hold in zip(block['offset'].tolist(), block['action'].tolist(), block['hold'].tolist()):
+                run(offset, handlers[actionId], hold)
+                bar.update(scheduler.elapsed())
+
+        report = scheduler.finish()
+        bar.update(duration)
+        report.update(seed=generator.seed,
+                      scheduleHash=h.hexdigest(), scheduleLength=length)
+        return report
+
+    @staticmethod
+    def _getHandler(mode: int, action: str) -> Callable[[float], Any]:
+        """Resolve an action of a schedule to a callable taking its hold time."""
+        if mode == 1:
+            return Benchmarking.altTabAway
+        if mode == 4:
+            angle = int(action)
+            return lambda hold: Benchmarking.changeDisplayDirection(0, angle)
+        if action in Benchmarking._MOUSE_LIST:
+            return lambda hold: Benchmarking.mouseCharacterControl(action, hold)
+        # The key time is kept by the next deadline. An enabled macro returns after its last event instead of at
+        # once, so a macro longer than the hold makes the next action late, as counted by the `Scheduler`
+        return lambda hold: Input.callTinyTask(action)
+
+    @staticmethod
+    def altTabAway(keyTime: float) -> None:
+        """
+        Perform an ALT+TAB away from the game, and ALT+TAB back `keyTime` seconds after the away one starts.
+
+        The away and back switches are a single action, so a skipped late action never leaves the game in the
+        background.
+
+        Parameters
+        ----------
+        keyTime: float.
+            Time in seconds away from the game.
+
+        """
+        clock = Clock.get()
+        back = clock.now() + keyTime
+        Input.key_alt_tab()
+        clock.sleep(max(0, back - clock.now()))
+        Input.key_alt_tab()
+
+    @staticmethod
+    def mouseCharacterControl(action: str, keyTime: int) -> None:
+        """
+        A method called by randomCharacterControl() to perform mouse control for characters.
+
+        Parameters
+        ----------
+        action : string.
+            Action to be perform. Action should in the following list:
+                ["view_upward", "view_downward", "view_leftward",
+                 "view_rightward", "left_click", "right_click"]
+        keyTime: integer.
+            duration to perform the key time.
+
+        """
+        if action in Benchmarking._VIEW_CURVE:
+            # Games read relative motion for the camera, please see more in `CameraMotion`
+            CameraMotion.play(Benchmarking._VIEW_CURVE[action], keyTime,
+                              amplitude=Benchmarking._VIEW_SPEED)
+        if action == "left_click":
+            Input.clickLeft(None, None, keyTime)
+        if action == "right_click":
+            Input.clickRight(None, None, keyTime)
+
+    @staticmethod
+    def keyCharacterControl(action: str, keyTime: float, WriteProgress: bool = False) -> None:
+        """
+        A method called by randomCharacterControl() to perform keyboard control for characters.
+
+        Parameters
+        ----------
+        action : string.
+            Action to be perform. Action should in the following list:
+                ["view_upward", "view_downward", "view_leftward",
+                 "view_rightward", "left_click", "right_click"]
+        keyTime: integer.
+            duration to perform the key time
+        WriteProgress : bool, optional.
+            True to show a console progress bar (default : True).
+
+        """
+        # utils.input.key_input(action, keyTime)
+        Input.callTinyTask(action)
+        if WriteProgress:
+            Logger.CountProgress(
+                0, keyTime, width=Benchmarking._WIDTH)
+        else:
+            Clock.get().sleep(keyTime)
+
+    @staticmethod
+    def changeDisplayDirection(deviceIndex: int, angle: int) -> bool:
+        """
+        Rotate the Display Screen's Direction.
+
+        @param:
+            - deviceIndex - display device index.
+            - angle - angle to be rotated.
+
+        @RETURN:
+            - True - succeed in rotating the screen.
+            - False - failed to rotate the screen.
+        """
+        # if not hasDisplayDevice(deviceIndex):
+        #     return
+        return InputBackend.get().setDisplayOrientation(deviceIndex, angle)
+
+
+############################################################################
 ################################## VK_Code #################################
 ############################################################################
 class VK_CODE():
     """VK Codes for Input operation by Win32"""
 
-    _VK_CODE1 = {
-        'backspace': 0x08,
-        'tab': 0x09,
-        'clear': 0x0C,
-        'enter': 0x0D,
-        'shift': 0x10,
-        'ctrl': 0x11,
-        'alt': 0x12,
-        'pause': 0x13,
-        'caps_lock': 0x14,
-        'esc': 0x1B,
-        'spacebar': 0x20,
-        'page_up': 0x21,
-        'page_down': 0x22,
-        'end': 0x23,
-        'home': 0x24,
-        'left_arrow': 0x25,
-        'up_arrow': 0x26,
-        'right_arrow': 0x27,
-        'down_arrow': 0x28,
-        'select': 0x29,
-        'print': 0x2A,
-        'execute': 0x2B,
-        'print_screen': 0x2C,
-        'ins': 0x2D,
-        'del': 0x2E,
-        'help': 0x2F,
-        '0': 0x30,
-        '1': 0x31,
-        '2': 0x32,
-        '3': 0x33,
-        '4': 0x34,
-        '5': 0x35,
-        '6': 0x36,
-        '7': 0x37,
-        '8': 0x38,
-        '9': 0x39,
-        'a': 0x41,
-        'b': 0x42,
-        'c': 0x43,
-        'd': 0x44,
-        'e': 0x45,
-        'f': 0x46,
-        'g': 0x47,
-        'h': 0x48,
-        'i': 0x49,
-        'j': 0x4A,
-        'k': 0x4B,
-        'l': 0x4C,
-        'm': 0x4D,
-        'n': 0x4E,
-        'o': 0x4F,
-        'p': 0x50,
-        'q': 0x51,
-        'r': 0x52,
-        's': 0x53,
-        't': 0x54,
-        'u': 0x55,
-        'v': 0x56,
-        'w': 0x57,
-        'x': 0x58,
-        'y': 0x59,
-        'z': 0x5A,
-        'numpad_0': 0x60,
-        'numpad_1': 0x61,
-        'numpad_2': 0x62,
-        'numpad_3': 0x63,
-        'numpad_4': 0x64,
-        'numpad_5': 0x65,
-        'numpad_6': 0x66,
-        'numpad_7': 0x67,
-        'numpad_8': 0x68,
-        'numpad_9': 0x69,
-        'multiply_key': 0x6A,
-        'add_key': 0x6B,
-        'separator_key': 0x6C,
-        'subtract_key': 0x6D,
-        'decimal_key': 0x6E,
-        'divide_key': 0x6F,
-        'F1': 0x70,
-        'F2': 0x71,
-        'F3': 0x72,
-        'F4': 0x73,
-        'F5': 0x74,
-        'F6': 0x75,
-        'F7': 0x76,
-        'F8': 0x77,
-        'F9': 0x78,
-        'F10': 0x79,
-        'F11': 0x7A,
-        'F12': 0x7B,
-        'F13': 0x7C,
-        'F14': 0x7D,
-        'F15': 0x7E,
-        'F16': 0x7F,
-        'F17': 0x80,
-        'F18': 0x81,
-        'F19': 0x82,
-        'F20': 0x83,
-        'F21': 0x84,
-        'F22': 0x85,
-        'F23': 0x86,
-        'F24': 0x87,
-        'num_lock': 0x90,
-        'scroll_lock': 0x91,
-        'left_shift': 0xA0,
-        'right_shift ': 0xA1,
-        'left_control': 0xA2,
-        'right_control': 0xA3,
-        'left_menu': 0xA4,
-        'right_menu': 0xA5,
-        'browser_back': 0xA6,
-        'browser_forward': 0xA7,
-        'browser_refresh': 0xA8,
-        'browser_stop': 0xA9,
-        'browser_search': 0xAA,
-        'browser_favorites': 0xAB,
-        'browser_start_and_home': 0xAC,
-        'volume_mute': 0xAD,
-        'volume_Down': 0xAE,
-        'volume_up': 0xAF,
-        'next_track': 0xB0,
-        'previous_track': 0xB1,
-        'stop_media': 0xB2,
-        'play/pause_media': 0xB3,
-        'start_mail': 0xB4,
-        'select_media': 0xB5,
-        'start_application_1': 0xB6,
-        'start_application_2': 0xB7,
-        'attn_key': 0xF6,
-        'crsel_key': 0xF7,
-        'exsel_key': 0xF8,
-        'play_key': 0xFA,
-        'zoom_key': 0xFB,
-        'clear_key': 0xFE,
-        '+': 0xBB,
-        ',': 0xBC,
-        '-': 0xBD,
-        '.': 0xBE,
-        '/': 0xBF,
-        '`': 0xC0,
-        ';': 0xBA,
-        '[': 0xDB,
-        '\\': 0xDC,
-        ']': 0xDD,
-        "'": 0xDE
-    }
+    _VK_CODE1 = {
+        'backspace': 0x08,
+        'tab': 0x09,
+        'clear': 0x0C,
+        'enter': 0x0D,
+        'shift': 0x10,
+        'ctrl': 0x11,
+        'alt': 0x12,
+        'pause': 0x13,
+        'caps_lock': 0x14,
+        'esc': 0x1B,
+        'spacebar': 0x20,
+        'page_up': 0x21,
+        'page_down': 0x22,
+        'end': 0x23,
+        'home': 0x24,
+        'left_arrow': 0x25,
+        'up_arrow': 0x26,
+        'right_arrow': 0x27,
+        'down_arrow': 0x28,
+        'select': 0x29,
+        'print': 0x2A,
+        'execute': 0x2B,
+        'print_screen': 0x2C,
+        'ins': 0x2D,
+        'del': 0x2E,
+        'help': 0x2F,
+        '0': 0x30,
+        '1': 0x31,
+        '2': 0x32,
+        '3': 0x33,
+        '4': 0x34,
+        '5': 0x35,
+        '6': 0x36,
+        '7': 0x37,
+        '8': 0x38,
+        '9': 0x39,
+        'a': 0x41,
+        'b': 0x42,
+        'c': 0x43,
+        'd': 0x44,
+        'e': 0x45,
+        'f': 0x46,
+        'g': 0x47,
+        'h': 0x48,
+        'i': 0x49,
+        'j': 0x4A,
+        'k': 0x4B,
+        'l': 0x4C,
+        'm': 0x4D,
+        'n': 0x4E,
+        'o': 0x4F,
+        'p': 0x50,
+        'q': 0x51,
+        'r': 0x52,
+        's': 0x53,
+        't': 0x54,
+        'u': 0x55,
+        'v': 0x56,
+        'w': 0x57,
+        'x': 0x58,
+        'y': 0x59,
+        'z': 0x5A,
+        'numpad_0': 0x60,
+        'numpad_1': 0x61,
+        'numpad_2': 0x62,
+        'numpad_3': 0x63,
+        'numpad_4': 0x64,
+        'numpad_5': 0x65,
+        'numpad_6': 0x66,
+        'numpad_7': 0x67,
+        'numpad_8': 0x68,
+        'numpad_9': 0x69,
+        'multiply_key': 0x6A,
+        'add_key': 0x6B,
+        'separator_key': 0x6C,
+        'subtract_key': 0x6D,
+        'decimal_key': 0x6E,
+        'divide_key': 0x6F,
+        'F1': 0x70,
+        'F2': 0x71,
+        'F3': 0x72,
+        'F4': 0x73,
+        'F5': 0x74,
+        'F6': 0x75,
+        'F7': 0x76,
+        'F8': 0x77,
+        'F9': 0x78,
+        'F10': 0x79,
+        'F11': 0x7A,
+        'F12': 0x7B,
+        'F13': 0x7C,
+        'F14': 0x7D,
+        'F15': 0x7E,
+        'F16': 0x7F,
+        'F17': 0x80,
+        'F18': 0x81,
+        'F19': 0x82,
+        'F20': 0x83,
+        'F21': 0x84,
+        'F22': 0x85,
+        'F23': 0x86,
+        'F24': 0x87,
+        'num_lock': 0x90,
+        'scroll_lock': 0x91,
+        'left_shift': 0xA0,
+        'right_shift ': 0xA1,
+        'left_control': 0xA2,
+        'right_control': 0xA3,
+        'left_menu': 0xA4,
+        'right_menu': 0xA5,
+        'browser_back': 0xA6,
+        'browser_forward': 0xA7,
+        'browser_refresh': 0xA8,
+        'browser_stop': 0xA9,
+        'browser_search': 0xAA,
+        'browser_favorites': 0xAB,
+        'browser_start_and_home': 0xAC,
+        'volume_mute': 0xAD,
+        'volume_Down': 0xAE,
+        'volume_up': 0xAF,
+        'next_track': 0xB0,
+        'previous_track': 0xB1,
+        'stop_media': 0xB2,
+        'play/pause_media': 0xB3,
+        'start_mail': 0xB4,
+        'select_media': 0xB5,
+        'start_application_1': 0xB6,
+        'start_application_2': 0xB7,
+        'attn_key': 0xF6,
+        'crsel_key': 0xF7,
+        'exsel_key': 0xF8,
+        'play_key': 0xFA,
+        'zoom_key': 0xFB,
+        'clear_key': 0xFE,
+        '+': 0xBB,
+        ',': 0xBC,
+        '-': 0xBD,
+        '.': 0xBE,
+        '/': 0xBF,
+        '`': 0xC0,
+        ';': 0xBA,
+        '[': 0xDB,
+        '\\': 0xDC,
+        ']': 0xDD,
+        "'": 0xDE
+    }
+
+    _VK_CODE2 = {
+        'A': 'a',
+        'B': 'b',
+        'C': 'c',
+        'D': 'd',
+        'E': 'e',
+        'F': 'f',
+        'G': 'g',
+        'H': 'h',
+        'I': 'i',
+        'J': 'j',
+        'K': 'k',
+        'L': 'l',
+        'M': 'm',
+        'N': 'n',
+        'O': 'o',
+        'P': 'p',
+        'Q': 'q',
+        'R': 'r',
+        'S': 's',
+        'T': 't',
+        'U': 'u',
+        'V': 'v',
+        'W': 'w',
+        'X': 'x',
+        'Y': 'y',
+        'Z': 'z',
+        ')': '0',
+        '!': '1',
+        '@': '2',
+        '#': '3',
+        '$': '4',
+        '%': '5',
+        '^': '6',
+        '&': '7',
+        '*': '8',
+        '(': '9',
+        '=': '+',
+        '<': ',',
+        '_': '-',
+        '>': '.',
+        '?': '/',
+        '~': '`',
+        ':': ';',
+        '{': '[',
+        '|': '\\',
+        '}': ']',
+        '"': "'"
+    }
+
+    @staticmethod
+    def getVK_CODE1() -> Dict[str, str]:
+        """
+        Get the first VK Code list of original Keys.
+
+        Returns
+        -------
+        getVK_CODE1 : Dict[str, str]
+            The original representation of VK_CODE.
+
+        """
+        return dict(VK_CODE._VK_CODE1)
+
+    @staticmethod
+    def getVK_CODE2() -> Dict[str, str]:
+        """
+        Get the second VK Code list of upper-cased Keys.
+
+        Returns
+        -------
+        getVK_CODE1 : Dict[str, str]
+            The Upper-cased representation of VK_CODE.
+
+        """
+        return dict(VK_CODE._VK_CODE2)
+
+
+_RANDOM_WORD_LIST = VK_CODE.getVK_CODE2().copy()
+_RANDOM_WORD_LIST.update(VK_CODE.getVK_CODE1())
+_RANDOM_WORD_LIST = list(_RANDOM_WORD_LIST.keys())
+
+
+################################################################################
+################################## InputBatch ##################################
+################################################################################
+class InputBatch:
+    """
+    A compiled sequence of input events, submitted at once by `InputBackend.sendBatch()`.
+
+    Events are stored as compact parallel arrays:
+        kinds - kind of each event, such as `InputBatch.KEY_DOWN` or `InputBatch.LEFT_UP`.\n
+        codes - virtual key code of key events.\n
+        xs / ys - cursor position of `InputBatch.MOVE_TO`, or mouse motion of `InputBatch.MOVE_BY`.\n
+        delays - seconds to wait after the previous event, or after the submission for the first event.
+    Consecutive events without delay are injected together by one backend call, like a chord.
+    """
+    KEY_DOWN = 0
+    KEY_UP = 1
+    LEFT_DOWN = 2
+    LEFT_UP = 3
+    RIGHT_DOWN = 4
+    RIGHT_UP = 5
+    MOVE_TO = 6
+    MOVE_BY = 7
+
+    def __init__(self) -> None:
+        self.kinds = array.array('B')
+        self.codes = array.array('H')
+        self.xs = array.array('i')
+        self.ys = array.array('i')
+        self.delays = array.array('d')
+        self._groups: List[Tuple[float, int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def append(self, kind: int, code: int = 0, delay: float = 0, x: int = 0, y: int = 0) -> 'InputBatch':
+        """Append an event `delay` seconds after the previous event, and return the batch itself."""
+        self.kinds.append(kind)
+        self.codes.append(code)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.delays.append(delay)
+        self._groups = None
+        return self
+
+    def extend(self, batch: 'InputBatch', delay: float = 0) -> 'InputBatch':
+        """Append all events of another batch, starting `delay` seconds after the last event."""
+        if len(batch):
+            self.kinds.extend(batch.kinds)
+            self.codes.extend(batch.codes)
+            self.xs.extend(batch.xs)
+            self.ys.extend(batch.ys)
+            self.delays.extend(batch.delays)
+            self.delays[len(self) - len(batch)] += delay
+            self._groups = None
+        return self
+
+    def getDuration(self) -> float:
+        """Return the seconds from the submission to the last event."""
+        return sum(self.delays)
+
+    def groups(self) -> List[Tuple[float, int, int]]:
+        """
+        Return the events grouped by time.
+
+        Returns
+        -------
+        groups : List[Tuple[float, int, int]].
+            A list of (offset, start, end), where events from index `start` to `end` (excluded)
+            are injected together at `offset` seconds after the submission.
+
+        """
+        if self._groups is None:
+            groups = []
+            offset = 0
+            for i, delay in enumerate(self.delays):
+                if i == 0 or delay > 0:
+                    offset += delay
+                    groups.append([offset, i, i + 1])
+                else:
+                    groups[-1][2] = i + 1
+            self._groups = [tuple(group) for group in groups]
+        return self._groups
+
+    @staticmethod
+    def toCode(key: str) -> int:
+        """
+        Resolve a key name or character to its virtual key code.
+
+        Upper-cased and shifted characters are resolved to their original keys, as `Input.key_input()` does.
+
+        Returns
+        -------
+        toCode : integer.
+            The virtual key code, or None if the key is not recognized.
+
+        """
+        key = VK_CODE._VK_CODE2.get(key, key)
+        return VK_CODE._VK_CODE1.get(key)
+
+    @staticmethod
+    def fromKey(key: str, hold: float = 0.05, delay: float = 0) -> 'InputBatch':
+        """
+        Compile a key pressdown and pressup.
+
+        Parameters
+        ----------
+        key : string.
+            A key to be pressed, please see more in `Input.key_input()`.
+        hold : float, optional.
+            A time period in second between pressdown and pressup (default: 0.05).
+        delay : float, optional.
+            A time period in second before the pressdown (default: 0).
+
+        Returns
+        -------
+        fromKey : InputBatch.
+            The compiled batch, which is empty if the key is not recognized.
+
+        """
+        batch = InputBatch()
+        code = InputBatch.toCode(key)
+        if code is not None:
+            batch.append(InputBatch.KEY_DOWN, code, delay)
+            batch.append(InputBatch.KEY_UP, code, hold)
+        return batch
+
+    @staticmethod
+    def fromString(keys: str, hold: float = 0.05, interval: float = 0.5) -> 'InputBatch':
+        """
+        Compile a string of keys, pressed one after another.
+
+        Parameters
+        ----------
+        keys : string.
+            String of keys to be pressed. Keys not recognized are skipped.
+        hold : float, optional.
+            A time period in second between pressdown and pressup (default: 0.05).
+        interval : float, optional.
+            A time period in second between each key (default: 0.5).
+
+        Returns
+        -------
+        fromString : InputBatch.
+            The compiled batch.
+
+        """
+        batch = InputBatch()
+        for key in keys:
+            code = InputBatch.toCode(key)
+            if code is None:
+                continue
+            batch.append(InputBatch.KEY_DOWN, code, interval if len(batch) else 0)
+            batch.append(InputBatch.KEY_UP, code, hold)
+        return batch
+
+    @staticmethod
+    def chord(keys: List[str], hold: float = 0.05, stagger: float = 0) -> 'InputBatch':
+        """
+        Compile a key chord, such as ALT + TAB. Keys are pressed down in order and up in reverse order.
+
+        Parameters
+        ----------
+        keys : List[str].
+            Keys of the chord.
+        hold : float, optional.
+            A time period in second between the last pressdown and the first pressup (default: 0.05).
+        stagger : float, optional.
+            A time period in second between pressdowns, and between pressups (default: 0).
+
+        Returns
+        -------
+        chord : InputBatch.
+            The compiled batch, which is empty if any key is not recognized.
+
+        """
+        codes = [InputBatch.toCode(key) for key in keys]
+        batch = InputBatch()
+        if None in codes or not codes:
+            return batch
+        for i, code in enumerate(codes):
+            batch.append(InputBatch.KEY_DOWN, code, stagger if i else 0)
+        for i, code in enumerate(reversed(codes)):
+            batch.append(InputBatch.KEY_UP, code, stagger if i else hold)
+        return batch
+
+    @staticmethod
+    def click(button: Literal["left", "right"] = "left", hold: float = 0) -> 'InputBatch':
+        """
+        Compile a mouse click at the current cursor position.
+
+        Parameters
+        ----------
+        button : Literal["left", "right"], optional.
+            The mouse button (default: "left").
+        hold : float, optional.
+            A time period in second between pressdown and pressup (default: 0).
+
+        Returns
+        -------
+        click : InputBatch.
+            The compiled batch.
+
+        """
+        down = InputBatch.LEFT_DOWN if button == "left" else InputBatch.RIGHT_DOWN
+        return InputBatch().append(down).append(down + 1, delay=hold)
+
+
+################################################################################
+################################# InputBackend #################################
+################################################################################
+class InputBackend(abc.ABC):
+    """
+    Backend of every interaction with the OS: input events, the cursor, the display and launching.
+
+    The current backend is got by `InputBackend.get()` and replaced by `InputBackend.set()`, which also
+    accepts a name in `InputBackend.BACKENDS`:
+        "win32" - `Win32InputBackend`, injecting into Windows.\n
+        "recording" - `RecordingInputBackend`, capturing events for checking and replaying.\n
+        "null" - `NullInputBackend`, doing nothing, for measuring the overhead of BMAutomation.
+    The default is named by the environment variable `BMAUTOMATION_BACKEND`, or "win32" if pywin32,
+    pyautogui and uiautomation are installed; otherwise "null".
+    """
+    _Current: 'InputBackend' = None
+
+    BACKENDS: Dict[str, Callable[[], 'InputBackend']] = {}
+
+    CONTROL_TYPES = ("PaneControl", "WindowControl", "ImageControl", "ButtonControl", "CustomControl")
+
+    def __init__(self) -> None:
+        self._cursor: Tuple[int, int] = (0, 0)
+        # The batch reused by `InputBackend.inject()`
+        self._one: InputBatch = InputBatch().append(InputBatch.KEY_DOWN)
+
+    def inject(self, kind: int, code: int = 0, x: int = 0, y: int = 0) -> int:
+        """
+        Inject one event at once, without allocating a batch, for callers pacing events themselves.
+
+        Parameters
+        ----------
+        kind : integer.
+            One of the event kinds of `InputBatch`.
+        code : integer, optional.
+            Virtual-key code of a key event (default: 0).
+        x, y : integer, optional.
+            Position of `InputBatch.MOVE_TO`, or deltas of `InputBatch.MOVE_BY` (default: 0).
+
+        Returns
+        -------
+        inject : integer.
+            Events injected.
+
+        """
+        one = self._one
+        one.kinds[0] = kind
+        one.codes[0] = code
+        one.xs[0] = x
+        one.ys[0] = y
+        return self._inject(one, 0, 1)
+
+    def sendBatch(self, batch: InputBatch, start: float = None) -> int:
+        """
+        Inject a batch of events, waiting between events by their delays.
+
+        Each group of events without delay in between is injected by one call of `InputBackend._inject()`,
+        at its offset from the submission measured by the current `Clock`, so waits never drift.
+
+        Parameters
+        ----------
+        batch : InputBatch.
+            The batch to be injected.
+        start : float, optional.
+            `Clock.now()` time the delays are measured from (default: None, now). Batches played
+            one after another pass the same time line, so waits never drift between batches.
+
+        Returns
+        -------
+        sendBatch : integer.
+            Events injected.
+
+        """
+        clock = Clock.get()
+        if start is None:
+            start = clock.now()
+        injected = 0
+        for offset, begin, end in batch.groups():
+            delay = start + offset - clock.now()
+            if delay > 0:
+                clock.sleep(delay)
+            injected += self._inject(batch, begin, end)
+        return injected
+
+    @abc.abstractmethod
+    def _inject(self, batch: InputBatch, begin: int, end: int) -> int:
+        """Inject events of `batch` from index `begin` to `end` (excluded) at once, and return events injected."""
+
+    def getCursorPos(self) -> Tuple[int, int]:
+        """Return the cursor position (x, y)."""
+        return self._cursor
+
+    def setCursorPos(self, x: int, y: int) -> None:
+        """Place the cursor at (x, y) at once."""
+        self._cursor = (x, y)
+
+    def moveCursor(self, x: int, y: int, duration: float = 0) -> None:
+        """Move the cursor from its position to (x, y) in `duration` seconds, please see more in `Trajectory`."""
+        Trajectory.play(self.getCursorPos(), (x, y), duration)
+
+    def getScreenSize(self) -> Tuple[int, int]:
+        """Return the screen size (width, height)."""
+        return (1920, 1080)
+
+    def shellExecute(self, file: str, params: str = "") -> int:
+        """
+        Open a file, such as an executor, with parameters.
+
+        Returns
+        -------
+        shellExecute : integer.
+            A non-0 instance handle if succeed; otherwise, 0.
+
+        """
+        return 1
+
+    def startProcess(self, file: str, params: str = "") -> 'ProcessManager':
+        """
+        Start an executor with parameters as a process tracked by its PID.
+
+        Returns
+        -------
+        startProcess : ProcessManager.
+            The tracked process; or None if the backend does not start processes, where
+            `InputBackend.shellExecute()` is used instead.
+
+        Raises
+        ------
+        OSError
+            If the executor cannot be started, such as it requires elevation.
+
+        """
+        return None
+
+    def setDisplayOrientation(self, deviceIndex: int, angle: Literal[0, 90, 180, 270]) -> bool:
+        """Rotate a display device to `angle` degrees, and return True if succeed."""
+        return True
+
+    def clickControl(self, appControlType: str, appName: str, controlType: str, foundIndex: int, name: str) -> bool:
+        """
+        Bring a window to the top and click a control by UIAutomation.
+
+        Parameters
+        ----------
+        appControlType : string.
+            The ControlType of the window, in `InputBackend.CONTROL_TYPES`.
+        appName : string.
+            The Name of the window.
+        controlType : string.
+            The ControlType of the control to click, in `InputBackend.CONTROL_TYPES`.
+        foundIndex : integer.
+            The Index of the control.
+        name : string.
+            The Name of the control.
+
+        Returns
+        -------
+        clickControl : bool.
+            Return True if succeed; otherwise, return False.
+
+        """
+        return True
+
+    @staticmethod
+    def get() -> 'InputBackend':
+        """Return the current backend."""
+        return InputBackend._Current
+
+    @staticmethod
+    def set(backend: 'InputBackend' = None) -> 'InputBackend':
+        """
+        Replace the current backend.
+
+        Parameters
+        ----------
+        backend : InputBackend | string, optional.
+            The new backend or its name in `InputBackend.BACKENDS`, or None to restore the default backend (default: None):
+            the name in the environment variable BMAUTOMATION_BACKEND, or "win32" if pywin32 is installed, otherwise
+            "null", with a warning on Windows as no input is injected.
+
+        Returns
+        -------
+        set : InputBackend.
+            The previous backend.
+
+        """
+        if backend is None:
+            backend = os.environ.get("BMAUTOMATION_BACKEND") or (
+                "win32" if win32api is not None else "null")
+            if backend == "null" and sys.platform == "win32":
+                # Without pywin32, no input would reach the games and every run would look successful
+                Logger.WriteLine('INPUT WARNING: pywin32 is not installed, falling back to the "null" backend, '
+                                 'which injects NO input; please \'pip install pywin32\'', ConsoleColor.Red)
+        if isinstance(backend, str):
+            backend = InputBackend.BACKENDS[backend.lower()]()
+        previous = InputBackend._Current
+        InputBackend._Current = backend
+        return previous
+
+    @staticmethod
+    @contextlib.contextmanager
+    def use(backend: 'InputBackend') -> Iterator['InputBackend']:
+        """Use a backend within a `with` block, and restore the previous backend afterward."""
+        previous = InputBackend.set(backend)
+        try:
+            yield InputBackend._Current
+        finally:
+            InputBackend.set(previous)
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", ctypes.wintypes.WORD),
+                ("wScan", ctypes.wintypes.WORD),
+                ("dwFlags", ctypes.wintypes.DWORD),
+                ("time", ctypes.wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", ctypes.wintypes.LONG),
+                ("dy", ctypes.wintypes.LONG),
+                ("mouseData", ctypes.wintypes.DWORD),
+                ("dwFlags", ctypes.wintypes.DWORD),
+                ("time", ctypes.wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("ki", _KEYBDINPUT), ("mi", _MOUSEINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.wintypes.DWORD), ("u", _INPUTUNION)]
+
+
+class Win32InputBackend(InputBackend):
+    """The Win32 backend, injecting every group of events by one `SendInput()` call."""
+    _INPUT_MOUSE = 0
+    _INPUT_KEYBOARD = 1
+    _KEYEVENTF_KEYUP = 0x0002
+    # MOUSEEVENTF_ flags of InputBatch.LEFT_DOWN to InputBatch.MOVE_BY, MOVE_TO uses SetCursorPos()
+    _MOUSE_FLAGS = {2: 0x0002, 3: 0x0004, 4: 0x0008, 5: 0x0010, 7: 0x0001}
+
+    def __init__(self) -> None:
+        super().__init__()
+        if win32api is None:
+            raise ImportError(
+                "Win32InputBackend requires pywin32, pyautogui and uiautomation on Windows")
+
+    def _inject(self, batch: InputBatch, begin: int, end: int) -> int:
+        inputs = (_INPUT * (end - begin))()
+        count = 0
+        injected = 0
+        kinds = batch.kinds
+        for i in range(begin, end):
+            kind = kinds[i]
+            if kind == InputBatch.MOVE_TO:
+                # Keep the order with events before
+                if count:
+                    injected += ctypes.windll.user32.SendInput(count, inputs, ctypes.sizeof(_INPUT))
+                    count = 0
+                win32api.SetCursorPos((batch.xs[i], batch.ys[i]))
+                injected += 1
+                continue
+            item = inputs[count]
+            count += 1
+            if kind <= InputBatch.KEY_UP:
+                item.type = Win32InputBackend._INPUT_KEYBOARD
+                item.u.ki.wVk = batch.codes[i]
+                item.u.ki.dwFlags = Win32InputBackend._KEYEVENTF_KEYUP if kind == InputBatch.KEY_UP else 0
+            else:
+                item.type = Win32InputBackend._INPUT_MOUSE
+                item.u.mi.dx = batch.xs[i]
+                item.u.mi.dy = batch.ys[i]
+                item.u.mi.dwFlags = Win32InputBackend._MOUSE_FLAGS[kind]
+        if count:
+            injected += ctypes.windll.user32.SendInput(count, inputs, ctypes.sizeof(_INPUT))
+        return injected
+
+    def getCursorPos(self) -> Tuple[int, int]:
+        return win32api.GetCursorPos()
+
+    def setCursorPos(self, x: int, y: int) -> None:
+        win32api.SetCursorPos((x, y))
+
+    def getScreenSize(self) -> Tuple[int, int]:
+        return tuple(pag.size())
+
+    def shellExecute(self, file: str, params: str = "") -> int:
+        return win32api.ShellExecute(1, 'open', file, params, '', 1)
+
+    def startProcess(self, file: str, params: str = "") -> 'ProcessManager':
+        return ProcessManager.start(file, params)
+
+    def setDisplayOrientation(self, deviceIndex: int, angle: Literal[0, 90, 180, 270]) -> bool:
+        try:
+            device = win32api.EnumDisplayDevices(None, deviceIndex)
+            dm = win32api.EnumDisplaySettings(
+                device.DeviceName, win32con.ENUM_CURRENT_SETTINGS)
+            if angle == 90:
+                dm.DisplayOrientation = win32con.DMDO_90  # 待改变的值
+                # 以下的720或者1280 代表我的屏幕的长宽
+                # 在应用项目的时候,建议使用GetSystemMetrics 动态获取长宽
+                # 在每次改变方向的时候,都要判断是否需要交换屏幕的长宽
+                if win32api.GetSystemMetrics(win32con.SM_CXSCREEN) != 720:
+                    dm.PelsWidth, dm.PelsHeight = dm.PelsHeight, dm.PelsWidth
+
+            elif angle == 180:
+                dm.DisplayOrientation = win32con.DMDO_180
+                if win32api.GetSystemMetrics(win32con.SM_CXSCREEN) != 1280:
+                    dm.PelsWidth, dm.PelsHeight = dm.PelsHeight, dm.PelsWidth
+
+            elif angle == 270:
+                dm.DisplayOrientation = win32con.DMDO_270
+                if win32api.GetSystemMetrics(win32con.SM_CXSCREEN) != 720:
+                    dm.PelsWidth, dm.PelsHeight = dm.PelsHeight, dm.PelsWidth
+
+            elif angle == 0:
+                dm.DisplayOrientation = win32con.DMDO_DEFAULT
+                if win32api.GetSystemMetrics(win32con.SM_CXSCREEN) != 1280:
+                    dm.PelsWidth, dm.PelsHeight = dm.PelsHeight, dm.PelsWidth
+
+            win32api.ChangeDisplaySettingsEx(device.DeviceName, dm)
+
+            return True
+
+        except Exception:
+            return False
+
+    def clickControl(self, appControlType: str, appName: str, controlType: str, foundIndex: int, name: str) -> bool:
+        if appControlType not in InputBackend.CONTROL_TYPES or controlType not in InputBackend.CONTROL_TYPES:
+            return False
+        app = getattr(auto, appControlType)(searchDepth=1, Name=appName)
+        # Set the launcher window to the very top of the screen
+        app.SetTopmost(True)
+        # Click on Start Button
+        getattr(auto, controlType)(foundIndex=foundIndex, Name=name).Click()
+        return True
+
+
+class RecordingInputBackend(InputBackend):
+    """
+    A backend capturing events instead of injecting them.
+
+    Events are recorded into compact parallel arrays `times` (`Clock.nowNs()` of injection),
+    `kinds`, `codes`, `xs` and `ys`; `calls` counts the injection calls. Cursor placements are
+    recorded as `InputBatch.MOVE_TO` events; other calls are recorded in `actions` as
+    (time in ns, method name, arguments).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.times = array.array('q')
+        self.kinds = array.array('B')
+        self.codes = array.array('H')
+        self.xs = array.array('i')
+        self.ys = array.array('i')
+        self.calls: int = 0
+        self.actions: List[Tuple[int, str, tuple]] = []
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def _inject(self, batch: InputBatch, begin: int, end: int) -> int:
+        now = Clock.get().nowNs()
+        self.times.extend([now] * (end - begin))
+        self.kinds.extend(batch.kinds[begin:end])
+        self.codes.extend(batch.codes[begin:end])
+        self.xs.extend(batch.xs[begin:end])
+        self.ys.extend(batch.ys[begin:end])
+        self.calls += 1
+        for i in range(begin, end):
+            if batch.kinds[i] == InputBatch.MOVE_TO:
+                self._cursor = (batch.xs[i], batch.ys[i])
+            elif batch.kinds[i] == InputBatch.MOVE_BY:
+                self._cursor = (self._cursor[0] + batch.xs[i], self._cursor[1] + batch.ys[i])
+        return end - begin
+
+    def setCursorPos(self, x: int, y: int) -> None:
+        self.inject(InputBatch.MOVE_TO, x=x, y=y)
+
+    def shellExecute(self, file: str, params: str = "") -> int:
+        self.actions.append((Clock.get().nowNs(), "shellExecute", (file, params)))
+        return 1
+
+    def setDisplayOrientation(self, deviceIndex: int, angle: Literal[0, 90, 180, 270]) -> bool:
+        self.actions.append((Clock.get().nowNs(), "setDisplayOrientation", (deviceIndex, angle)))
+        return True
+
+    def clickControl(self, appControlType: str, appName: str, controlType: str, foundIndex: int, name: str) -> bool:
+        self.actions.append((Clock.get().nowNs(), "clickControl",
+                             (appControlType, appName, controlType, foundIndex, name)))
+        return appControlType in InputBackend.CONTROL_TYPES and controlType in InputBackend.CONTROL_TYPES
+
+    def events(self) -> List[Tuple[int, int, int]]:
+        """Return the recorded events as a list of (time in ns, kind, code)."""
+        return list(zip(self.times, self.kinds, self.codes))
+
+    def toBatch(self) -> InputBatch:
+        """Return the recorded events as a batch with their recorded delays, to be replayed by `InputBackend.sendBatch()`."""
+        batch = InputBatch()
+        previous = self.times[0] if self.times else 0
+        for t, kind, code, x, y in zip(self.times, self.kinds, self.codes, self.xs, self.ys):
+            batch.append(kind, code, (t - previous) / 1e9, x, y)
+            previous = t
+        return batch
+
+    def clear(self) -> None:
+        """Clear the recorded events and actions."""
+        self.__init__()
+
+
+class NullInputBackend(InputBackend):
+    """
+    A backend injecting nothing, for measuring the overhead of BMAutomation without any input.
+
+    Delays of batches are still waited by the current `Clock`, so a run has the same timeline as a real run,
+    and is free under `VirtualClock`.
+    """
+
+    def _inject(self, batch: InputBatch, begin: int, end: int) -> int:
+        for i in range(end - 1, begin - 1, -1):
+            if batch.kinds[i] == InputBatch.MOVE_TO:
+                self._cursor = (batch.xs[i], batch.ys[i])
+                break
+        return end - begin
+
+
+InputBackend.BACKENDS.update(win32=Win32InputBackend,
+                             recording=RecordingInputBackend,
+                             null=NullInputBackend)
+InputBackend.set()
+
+
+################################################################################
+################################# MacroPlayer ##################################
+################################################################################
+class MacroPlayer:
+    """
+    An in-process player of input macros, replacing a TinyTask executor per action.
+
+    A macro is declared as a list of steps, and compiled once into an `InputBatch` played by
+    `InputBackend.sendBatch()`, so no process is created per action. Steps are lists of:
+        ["down", key] / ["up", key] - press down or up a key, by name or virtual key code.\n
+        ["tap", key, hold] - press a key for `hold` seconds.\n
+        ["chord", [keys], hold, stagger] - press a key chord, please see more in `InputBatch.chord()`.\n
+        ["click", "left" | "right", hold] - click a mouse button for `hold` seconds.\n
+        ["buttonDown", "left" | "right"] / ["buttonUp", "left" | "right"] - press down or up a mouse button.\n
+        ["moveTo", x, y] - place the cursor at (x, y).\n
+        ["moveBy", dx, dy, duration, steps] - move the mouse by (dx, dy) in `steps` even steps over `duration` seconds.\n
+        ["wait", seconds] - wait before the next step.
+    Macros are opt-in: none is registered by default, and `Input.callTinyTask()` plays a macro only if
+    `MacroPlayer.Enabled` is True. Macros are declared in a .json file of {name: steps}, and loaded by
+    `MacroPlayer.load()`. Steps of the TinyTask recordings in use are converted by `MacroPlayer.fromTinyTask()`,
+    or for a whole folder by `MacroPlayer.convertTinyTask()`.
+
+    Unlike a TinyTask executor, which runs alongside the caller, a macro is played in the calling thread, so
+    `MacroPlayer.play()` returns after the last event of the macro. "t" actions of `Game` account for it, please
+    see more in `ActionPlan`.
+    """
+    Enabled: bool = False
+
+    _Macros: Dict[str, InputBatch] = {}
+    _Steps: Dict[str, List[list]] = {}
+
+    # Macros registered by `MacroPlayer.reset()`, empty unless converted from the TinyTask recordings in use
+    DEFAULT_MACROS: Dict[str, List[list]] = {}
+
+    _BUTTON_KINDS = {"left": InputBatch.LEFT_DOWN, "right": InputBatch.RIGHT_DOWN}
+    # Window messages recorded by TinyTask, as EVENTMSG of journal hooks
+    _TINYTASK_EVENT = struct.Struct('<5I')
+    _TINYTASK_KEYS = {0x0100: "down", 0x0104: "down", 0x0101: "up", 0x0105: "up"}
+    _TINYTASK_BUTTONS = {0x0201: ("buttonDown", "left"), 0x0202: ("buttonUp", "left"),
+                         0x0204: ("buttonDown", "right"), 0x0205: ("buttonUp", "right")}
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """
+        Normalize a macro or TinyTask file name, so "tinytask//enter.exe", "enter.exe" and "enter" are the same macro.
+
+        Returns
+        -------
+        normalize : string.
+            The lower-cased name relative to the "tinytask" folder, without extension.
+
+        """
+        name = re.sub(r'[\\/]+', '/', name).strip('/').lower()
+        if name.endswith('.exe'):
+            name = name[:-4]
+        while name.startswith('./'):
+            name = name[2:]
+        if name.startswith('tinytask/'):
+            name = name[len('tinytask/'):]
+        return name
+
+    @staticmethod
+    def compile(steps: List[list]) -> InputBatch:
+        """
+        Compile the steps of a macro into a batch.
+
+        Raises
+        ------
+        ValueError
+            If a step is not recognized, with the index of the step.
+
+        """
+        batch = InputBatch()
+        delay = 0
+        for index, step in enumerate(steps):
+            kind, args = step[0], list(step[1:])
+            part = None
+            if kind == "wait":
+                delay += args[0]
+                continue
+            if kind in ("down", "up"):
+                code = args[0] if isinstance(args[0], int) else InputBatch.toCode(args[0])
+                if code is not None:
+                    part = InputBatch().append(
+                        InputBatch.KEY_DOWN if kind == "down" else InputBatch.KEY_UP, code)
+            elif kind in ("buttonDown", "buttonUp"):
+                if args[0] in MacroPlayer._BUTTON_KINDS:
+                    part = InputBatch().append(MacroPlayer._BUTTON_KINDS[args[0]] + (kind == "buttonUp"))
+            elif kind == "tap":
+                part = InputBatch.fromKey(*args)
+            elif kind == "chord":
+                part = InputBatch.chord(*args)
+            elif kind == "click":
+                part = InputBatch.click(*args)
+            elif kind == "moveTo":
+                part = InputBatch().append(InputBatch.MOVE_TO, x=args[0], y=args[1])
+            elif kind == "moveBy":
+                dx, dy, duration, count = args
+                part = InputBatch()
+                for i in range(count):
+                    part.append(InputBatch.MOVE_BY, 0, duration / count if i else 0,
+                                round(dx * (i + 1) / count) - round(dx * i / count),
+                                round(dy * (i + 1) / count) - round(dy * i / count))
+            else:
+                raise ValueError("Macro step %s %r is not recognized" % (index, step))
+            if not part:
+                raise ValueError("Macro step %s %r has an unknown key" % (index, step))
+            batch.extend(part, delay)
+            delay = 0
+        return batch
+
+    @staticmethod
+    def register(name: str, steps: List[list]) -> InputBatch:
+        """Compile and register a macro, and return its batch."""
+        name = MacroPlayer.normalize(name)
+        batch = MacroPlayer._Macros[name] = MacroPlayer.compile(steps)
+        MacroPlayer._Steps[name] = steps
+        return batch
+
+    @staticmethod
+    def load(path: str) -> List[str]:
+        """
+        Load macros from a .json file of {name: steps}.
+
+        Returns
+        -------
+        load : List[str].
+            Names of macros loaded.
+
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            macros = json.load(f)
+        return [MacroPlayer.normalize(name) for name in macros if MacroPlayer.register(name, macros[name]) is not None]
+
+    @staticmethod
+    def fromTinyTask(path: str) -> List[list]:
+        """
+        Convert a TinyTask recording into the steps of a macro.
+
+        A recording is a sequence of journal events (message, paramL, paramH, time in ms, hwnd), saved as a .rec file
+        or appended to a compiled .exe file after its last section. Keys are converted into "down" and "up" steps,
+        mouse motion into "moveTo" steps at the recorded cursor positions, and mouse buttons into "buttonDown" and
+        "buttonUp" steps, with "wait" steps of the recorded times in between. Keys pressed and never released at the
+        end of the recording, such as the hotkey stopping the recording, are dropped.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a TinyTask recording.
+
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        begin = 0
+        if data[:2] == b'MZ':
+            # A compiled recording follows the raw data of the last section of the executor
+            pe = struct.unpack_from('<I', data, 0x3C)[0]
+            sections, optional = struct.unpack_from('<H12xH', data, pe + 6)
+            table = pe + 24 + optional
+            for i in range(sections):
+                size, pointer = struct.unpack_from('<II', data, table + 40 * i + 16)
+                begin = max(begin, pointer + size)
+        size = MacroPlayer._TINYTASK_EVENT.size
+        if begin >= len(data) or (len(data) - begin) % size:
+            raise ValueError("%s is not a TinyTask recording" % path)
+        events = [MacroPlayer._TINYTASK_EVENT.unpack_from(data, pos) for pos in range(begin, len(data), size)]
+        while events and MacroPlayer._TINYTASK_KEYS.get(events[-1][0]) == "down":
+            events.pop()
+
+        names = {}
+        for name, code in VK_CODE._VK_CODE1.items():
+            names.setdefault(code, name)
+        steps = []
+        previous = events[0][3] if events else 0
+        for message, paramL, paramH, t, _ in events:
+            step = None
+            if message in MacroPlayer._TINYTASK_KEYS:
+                code = paramL & 0xFF
+                step = [MacroPlayer._TINYTASK_KEYS[message], names.get(code, code)]
+            elif message == 0x0200:  # WM_MOUSEMOVE
+                step = ["moveTo", paramL, paramH]
+            elif message in MacroPlayer._TINYTASK_BUTTONS:
+                step = list(MacroPlayer._TINYTASK_BUTTONS[message])
+            if step is None:
+                continue
+            # Times are from GetTickCount(), which wraps around every 49.7 days
+            delay = ((t - previous) & 0xFFFFFFFF) / 1000
+            if delay:
+                steps.append(["wait", delay])
+            steps.append(step)
+            previous = t
+        return steps
+
+    @staticmethod
+    def convertTinyTask(folder: str, path: str = None) -> Dict[str, List[list]]:
+        """
+        Convert all TinyTask recordings (.exe and .rec) under a folder, named by their paths relative to the folder.
+
+        Parameters
+        ----------
+        folder : string.
+            The folder of the recordings, such as "tinytask".
+        path : string, optional.
+            A .json file to save the macros into, to be loaded by `MacroPlayer.load()` (default: None, not saved).
+
+        Returns
+        -------
+        convertTinyTask : Dict[str, List[list]].
+            The steps of each recording, by name such as "enter" or "mouse/moveLeftWard".
+
+        """
+        macros = {}
+        for root, dirs, files in os.walk(folder):
+            dirs.sort()
+            for file in sorted(files):
+                name, extension = os.path.splitext(file)
+                if extension.lower() in ('.exe', '.rec'):
+                    relative = os.path.relpath(os.path.join(root, name), folder)
+                    macros[relative.replace(os.sep, '/')] = MacroPlayer.fromTinyTask(os.path.join(root, file))
+        if path is not None:
+            MacroPlayer._dump(macros, path)
+        return macros
+
+    @staticmethod
+    def _dump(macros: Dict[str, List[list]], path: str) -> None:
+        # One step per line, so long recordings stay readable and diff well
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{\n' + ',\n'.join('    %s: [\n%s\n    ]' % (json.dumps(name), ',\n'.join(
+                '        ' + json.dumps(step) for step in steps)) for name, steps in macros.items()) + '\n}\n')
+
+    @staticmethod
+    def save(path: str) -> None:
+        """Save the steps of all registered macros into a .json file, which can be edited and loaded back."""
+        MacroPlayer._dump(MacroPlayer._Steps, path)
+
+    @staticmethod
+    def has(name: str) -> bool:
+        """Return True if a macro is registered under `name` and macros are enabled."""
+        return MacroPlayer.Enabled and MacroPlayer.normalize(name) in MacroPlayer._Macros
+
+    @staticmethod
+    def get(name: str) -> InputBatch:
+        """Return the batch of a macro, or None if not registered."""
+        return MacroPlayer._Macros.get(MacroPlayer.normalize(name))
+
+    @staticmethod
+    def play(name: str) -> int:
+        """
+        Play a macro with the current `InputBackend`, and return after its last event.
+
+        Returns
+        -------
+        play : integer.
+            Events injected, or 0 if the macro is not registered.
+
+        """
+        batch = MacroPlayer.get(name)
+        if batch is None:
+            return 0
+        return InputBackend.get().sendBatch(batch)
+
+    @staticmethod
+    def reset() -> None:
+        """Unregister all macros, and register `MacroPlayer.DEFAULT_MACROS` again."""
+        MacroPlayer._Macros.clear()
+        MacroPlayer._Steps.clear()
+        for name, steps in MacroPlayer.DEFAULT_MACROS.items():
+            MacroPlayer.register(name, steps)
+
+
+MacroPlayer.reset()
+
+
+################################################################################
+################################ MacroRecording ################################
+################################################################################
+class MacroRecording:
+    """
+    A compact binary recording of input events, played back from a memory-mapped file.
+
+    A recording file (.bmr) is a header followed by the records of events in time order.
+
+    The header is 20 bytes, little-endian:
+        magic b'BMAR', version (uint16), flags (uint16), tick in ns (uint32), event count (uint64).
+
+    Every record starts with one byte of the event type in the high 4 bits and the delta time in
+    ticks in the low 4 bits. A delta time of 15 ticks or more is stored as 15, followed by the
+    rest as an unsigned varint. The type decides the fields that follow:
+        `InputBatch.KEY_DOWN` / `InputBatch.KEY_UP` - the key code (1 byte).\n
+        `InputBatch.LEFT_DOWN` to `InputBatch.RIGHT_UP` - nothing.\n
+        `InputBatch.MOVE_TO` / `InputBatch.MOVE_BY` - x and y, or dx and dy, as zigzag varints.\n
+        `MacroRecording.MOVE_SMALL` - dx and dy from -8 to 7 in 4 bits each (1 byte).
+    So a 1 kHz mouse motion takes 2 bytes per event with the default tick of 1 ms, about 7 MB per hour.
+
+    Records are decoded block by block from the mapped file, so playback memory is bounded
+    whatever the length of the recording.
+    """
+    MAGIC = b'BMAR'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHIQ')
+
+    MOVE_SMALL = 8
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a recording file.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a recording of a supported version.
+
+        """
+        self.path: str = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < MacroRecording.HEADER.size:
+            self._file.close()
+            raise ValueError("%s is not a BMAutomation recording" % path)
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.tickNs, self.count = MacroRecording.HEADER.unpack_from(self._map, 0)
+        if magic != MacroRecording.MAGIC or version != MacroRecording.VERSION:
+            self.close()
+            raise ValueError("%s is not a BMAutomation recording of version %s" % (path, MacroRecording.VERSION))
+
+    def __enter__(self) -> 'MacroRecording':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        self._map.close()
+        self._file.close()
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, int, int]]:
+        """Decode events one by one as (time in ns from the start, kind, code, x, y)."""
+        data = self._map
+        pos = MacroRecording.HEADER.size
+        end = len(data)
+        tickNs = self.tickNs
+        ticks = 0
+        while pos < end:
+            head = data[pos]
+            pos += 1
+            kind, dt = head >> 4, head & 0x0F
+            if dt == 15:
+                value, pos = MacroRecording._readVarint(data, pos)
+                dt += value
+            ticks += dt
+            code = x = y = 0
+            if kind <= InputBatch.KEY_UP:
+                code = data[pos]
+                pos += 1
+            elif kind == MacroRecording.MOVE_SMALL:
+                packed = data[pos]
+                pos += 1
+                kind, x, y = InputBatch.MOVE_BY, (packed >> 4) - 8, (packed & 0x0F) - 8
+            elif kind >= InputBatch.MOVE_TO:
+                x, pos = MacroRecording._readVarint(data, pos)
+                y, pos = MacroRecording._readVarint(data, pos)
+                x, y = (x >> 1) ^ -(x & 1), (y >> 1) ^ -(y & 1)
+            yield ticks * tickNs, kind, code, x, y
+
+    @staticmethod
+    def _readVarint(data: mmap.mmap, pos: int) -> Tuple[int, int]:
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, pos
+            shift += 7
+
+    def iterBatches(self, size: int = 4096) -> Iterator[Tuple[int, InputBatch]]:
+        """
+        Decode events into batches of up to `size` events.
+
+        Yields
+        ------
+        iterBatches : Tuple[int, InputBatch].
+            The time in ns from the start that the delays of the batch are measured from, and the batch.
+
+        """
+        batch = InputBatch()
+        base = previous = 0
+        for t, kind, code, x, y in self:
+            if len(batch) >= size:
+                yield base, batch
+                batch = InputBatch()
+                base = previous
+            batch.append(kind, code, (t - previous) / 1e9, x, y)
+            previous = t
+        if len(batch):
+            yield base, batch
+
+    def getDuration(self) -> float:
+        """Return the seconds from the start to the last event, by decoding the whole file."""
+        last = 0
+        for last, _, _, _, _ in self:
+            pass
+        return last / 1e9
+
+    def play(self, duration: float = None, loop: bool = False, blockSize: int = 4096) -> Dict[str, Any]:
+        """
+        Play the recording with the current `InputBackend` at the recorded times.
+
+        Parameters
+        ----------
+        duration : float, optional.
+            Seconds to play (default: None, the whole recording). Events after it are not played.
+        loop : bool, optional.
+            True to play the recording again from its start until `duration` (default: False).
+        blockSize : integer, optional.
+            Events decoded and sent per `InputBackend.sendBatch()` (default: 4096).
+
+        Returns
+        -------
+        play : Dict[str, Any].
+            The report of `Scheduler.getReport()`, where "actions" are events played,
+            with the recording path, "loops" played and "released" keys and buttons.
+
+        Notes
+        -----
+        Keys and mouse buttons still held when playback stops, such as cut at `duration`,
+        are released at once, so no key stays down after playback.
+
+        """
+        backend = InputBackend.get()
+        clock = Clock.get()
+        scheduler = Scheduler(duration if duration is not None else 0)
+        scheduler.start()
+        start = clock.now()
+        played = loops = 0
+        offset = 0.0
+        held: Dict[Tuple[int, int], None] = {}
+        while duration is None or offset < duration:
+            last = 0
+            for base, batch in self.iterBatches(blockSize):
+                last = base + sum(batch.delays) * 1e9
+                if duration is not None and offset + last / 1e9 >= duration:
+                    # Cut the batch at the duration
+                    cut, t = InputBatch(), offset + base / 1e9
+                    for i in range(len(batch)):
+                        t += batch.delays[i]
+                        if t >= duration:
+                            break
+                        cut.append(batch.kinds[i], batch.codes[i], batch.delays[i], batch.xs[i], batch.ys[i])
+                    played += backend.sendBatch(cut, start + offset + base / 1e9)
+                    MacroRecording._hold(cut, held)
+                    break
+                played += backend.sendBatch(batch, start + offset + base / 1e9)
+                MacroRecording._hold(batch, held)
+            loops += 1
+            offset += last / 1e9
+            if not loop or duration is None or not last:
+                break
+        if held:
+            # Release in the reverse order of pressing, like a chord
+            release = InputBatch()
+            for kind, code in reversed(list(held)):
+                release.append(kind, code)
+            backend.sendBatch(release, start + duration if duration is not None else None)
+        if duration is None:
+            scheduler.duration = clock.now() - start
+        report = scheduler.finish()
+        report.update(actions=played, recording=self.path, loops=loops, released=len(held))
+        return report
+
+    @staticmethod
+    def _hold(batch: InputBatch, held: Dict[Tuple[int, int], None]) -> None:
+        """Update `held` as {(release kind, code): None} of keys and buttons held after `batch`."""
+        for kind, code in zip(batch.kinds, batch.codes):
+            if kind >= InputBatch.MOVE_TO:
+                continue
+            # Kinds of pressing are even, and each is followed by its kind of releasing
+            if kind & 1:
+                held.pop((kind, code), None)
+            else:
+                held[(kind + 1, code)] = None
+
+
+class MacroRecorder:
+    """
+    A recorder of input events into a recording file, please see more in `MacroRecording`.
+
+    Events are recorded by `MacroRecorder.record()` or `MacroRecorder.recordBatch()`, or captured from
+    the user on Windows by `MacroRecorder.startCapture()`. Encoded records are buffered and written
+    in blocks; the event count in the header is written by `MacroRecorder.close()`.
+    """
+    _BUFFER_SIZE = 1 << 16
+
+    def __init__(self, path: str, tick: float = 0.001) -> None:
+        """
+        Create a recording file.
+
+        Parameters
+        ----------
+        path : string.
+            Path of the recording file, usually with extension .bmr.
+        tick : float, optional.
+            Time resolution in seconds (default: 0.001).
+
+        """
+        self.path: str = path
+        self.tickNs: int = max(int(round(tick * 1e9)), 1)
+        self.count: int = 0
+
+        self._file = open(path, 'wb')
+        self._file.write(MacroRecording.HEADER.pack(
+            MacroRecording.MAGIC, MacroRecording.VERSION, 0, self.tickNs, 0))
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._startNs: int = None
+        self._ticks: int = 0
+        self._capture: threading.Thread = None
+        self._captureThreadId: int = 0
+
+    def __enter__(self) -> 'MacroRecorder':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def record(self, kind: int, code: int = 0, x: int = 0, y: int = 0, timeNs: int = None) -> None:
+        """
+        Record an event.
+
+        Parameters
+        ----------
+        kind : integer.
+            Kind of the event, such as `InputBatch.KEY_DOWN`.
+        code : integer, optional.
+            Virtual key code of key events (default: 0).
+        x, y : integer, optional.
+            Cursor position of `InputBatch.MOVE_TO`, or mouse motion of `InputBatch.MOVE_BY` (default: 0).
+        timeNs : integer, optional.
+            `Clock.nowNs()` time of the event (default: None, now). The first event starts the recording.
+
+        """
+        if timeNs is None:
+            timeNs = Clock.get().nowNs()
+        with self._lock:
+            if self._startNs is None:
+                self._startNs = timeNs
+            # Round absolute ticks, so rounding errors never accumulate
+            ticks = max((timeNs - self._startNs + self.tickNs // 2) // self.tickNs, self._ticks)
+            dt = ticks - self._ticks
+            self._ticks = ticks
+
+            out = self._buffer
+            small = kind == InputBatch.MOVE_BY and -8 <= x <= 7 and -8 <= y <= 7
+            out.append(((MacroRecording.MOVE_SMALL if small else kind) << 4) | min(dt, 15))
+            if dt >= 15:
+                MacroRecorder._writeVarint(out, dt - 15)
+            if kind <= InputBatch.KEY_UP:
+                out.append(code & 0xFF)
+            elif small:
+                out.append(((x + 8) << 4) | (y + 8))
+            elif kind >= InputBatch.MOVE_TO:
+                MacroRecorder._writeVarint(out, (x << 1) ^ (x >> 63))
+                MacroRecorder._writeVarint(out, (y << 1) ^ (y >> 63))
+            self.count += 1
+            if len(out) >= MacroRecorder._BUFFER_SIZE:
+                self._file.write(out)
+                out.clear()
+
+    @staticmethod
+    def _writeVarint(out: bytearray, value: int) -> None:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def recordBatch(self, batch: InputBatch, timeNs: int = None) -> None:
+        """Record all events of a batch at their delays, the first one at `timeNs` (default: None, now)."""
+        t = Clock.get().nowNs() if timeNs is None else timeNs
+        for kind, code, x, y, delay in zip(batch.kinds, batch.codes, batch.xs, batch.ys, batch.delays):
+            t += int(delay * 1e9)
+            self.record(kind, code, x, y, t)
+
+    def startCapture(self) -> None:
+        """
+        Start capturing the keyboard and mouse of the user on Windows, by low-level hooks in a thread.
+
+        Events injected by programs, such as BMAutomation itself, are not captured.
+        Mouse motion is recorded as `InputBatch.MOVE_BY` from the previous cursor position.
+        """
+        if self._capture is not None:
+            return
+        ready = threading.Event()
+        self._capture = threading.Thread(target=self._captureLoop, args=(ready,),
+                                         name="BMAutomation-MacroRecorder", daemon=True)
+        self._capture.start()
+        ready.wait()
+
+    def stopCapture(self) -> None:
+        """Stop capturing started by `MacroRecorder.startCapture()`."""
+        if self._capture is None:
+            return
+        ctypes.windll.user32.PostThreadMessageW(self._captureThreadId, 0x0012, 0, 0)  # WM_QUIT
+        self._capture.join()
+        self._capture = None
+
+    def _captureLoop(self, ready: threading.Event) -> None:
+        user32 = ctypes.windll.user32
+        LRESULT = ctypes.c_ssize_t
+        HOOKPROC = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, ctypes.wintypes.WPARAM, ctypes.wintypes.LPARAM)
+        user32.SetWindowsHookExW.restype = ctypes.wintypes.HHOOK
+        user32.SetWindowsHookExW.argtypes = (ctypes.c_int, HOOKPROC, ctypes.wintypes.HINSTANCE, ctypes.wintypes.DWORD)
+        user32.CallNextHookEx.restype = LRESULT
+        user32.CallNextHookEx.argtypes = (ctypes.wintypes.HHOOK, ctypes.c_int, ctypes.wintypes.WPARAM, ctypes.wintypes.LPARAM)
+
+        class KBDLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [("vkCode", ctypes.wintypes.DWORD), ("scanCode", ctypes.wintypes.DWORD),
+                        ("flags", ctypes.wintypes.DWORD), ("time", ctypes.wintypes.DWORD),
+                        ("dwExtraInfo", ctypes.c_size_t)]
+
+        class MSLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [("pt", ctypes.wintypes.POINT), ("mouseData", ctypes.wintypes.DWORD),
+                        ("flags", ctypes.wintypes.DWORD), ("time", ctypes.wintypes.DWORD),
+                        ("dwExtraInfo", ctypes.c_size_t)]
+
+        keyKinds = {0x0100: InputBatch.KEY_DOWN, 0x0104: InputBatch.KEY_DOWN,
+                    0x0101: InputBatch.KEY_UP, 0x0105: InputBatch.KEY_UP}
+        buttonKinds = {0x0201: InputBatch.LEFT_DOWN, 0x0202: InputBatch.LEFT_UP,
+                       0x0204: InputBatch.RIGHT_DOWN, 0x0205: InputBatch.RIGHT_UP}
+        cursor = [None]
+
+        def onKey(nCode, wParam, lParam):
+            if nCode == 0:
+                info = ctypes.cast(lParam, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+                # Skip LLKHF_INJECTED
+                if not info.flags & 0x10 and wParam in keyKinds:
+                    self.record(keyKinds[wParam], info.vkCode)
+            return user32.CallNextHookEx(None, nCode, wParam, lParam)
+
+        def onMouse(nCode, wParam, lParam):
+            if nCode == 0:
+                info = ctypes.cast(lParam, ctypes.POINTER(MSLLHOOKSTRUCT)).contents
+                # Skip LLMHF_INJECTED
+                if not info.flags & 0x01:
+                    if wParam == 0x0200:  # WM_MOUSEMOVE
+                        if cursor[0] is not None:
+                            self.record(InputBatch.MOVE_BY, x=info.pt.x - cursor[0][0], y=info.pt.y - cursor[0][1])
+                        cursor[0] = (info.pt.x, info.pt.y)
+                    elif wParam in buttonKinds:
+                        self.record(buttonKinds[wParam])
+            return user32.CallNextHookEx(None, nCode, wParam, lParam)
+
+        keyProc, mouseProc = HOOKPROC(onKey), HOOKPROC(onMouse)
+        self._captureThreadId = ctypes.windll.kernel32.GetCurrentThreadId()
+        hooks = [user32.SetWindowsHookExW(13, keyProc, None, 0),  # WH_KEYBOARD_LL
+                 user32.SetWindowsHookExW(14, mouseProc, None, 0)]  # WH_MOUSE_LL
+        ready.set()
+        msg = ctypes.wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        for hook in hooks:
+            user32.UnhookWindowsHookEx(hook)
+
+    def close(self) -> None:
+        """Stop capturing, write the buffered records and the event count, and close the file."""
+        if self._file.closed:
+            return
+        self.stopCapture()
+        with self._lock:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+            self._file.seek(0)
+            self._file.write(MacroRecording.HEADER.pack(
+                MacroRecording.MAGIC, MacroRecording.VERSION, 0, self.tickNs, self.count))
+            self._file.close()
+
+
+################################################################################
+################################## Trajectory ##################################
+################################################################################
+class Trajectory:
+    """
+    Precomputed cursor trajectories, played at a fixed rate.
+
+    A trajectory from `start` to `dest` in `duration` seconds is compiled once into a batch of
+    `InputBatch.MOVE_TO` points, `rate` points per second along an easing curve, and cached in an LRU
+    keyed on (start, dest, duration, easing, rate), so recurring moves are never computed again.
+    The points are played by `InputBackend.sendBatch()` at absolute offsets, so the rate never drifts.
+    The achieved rate and the endpoint error of the last move are reported by `Trajectory.getReport()`.
+    """
+    Rate: float = 120
+
+    EASINGS: Dict[str, Callable[[float], float]] = {
+        "linear": lambda t: t,
+        "easeInQuad": lambda t: t * t,
+        "easeOutQuad": lambda t: t * (2 - t),
+        "easeInOutQuad": lambda t: 2 * t * t if t < 0.5 else 1 - 2 * (1 - t) * (1 - t),
+        "easeInOutCubic": lambda t: 4 * t * t * t if t < 0.5 else 1 - 4 * (1 - t) ** 3,
+    }
+
+    _Report: Dict[str, Any] = None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def compile(start: Tuple[int, int], dest: Tuple[int, int], duration: float,
+                easing: str = "easeInOutQuad", rate: float = 120) -> InputBatch:
+        """
+        Compile a trajectory into a batch of cursor positions.
+
+        Parameters
+        ----------
+        start : Tuple[int, int].
+            Position (x, y) to move from. It is not included in the batch.
+        dest : Tuple[int, int].
+            Position (x, y) to move to, which is always the last point.
+        duration : float.
+            Seconds to move.
+        easing : string, optional.
+            Name of the easing curve in `Trajectory.EASINGS` (default: "easeInOutQuad").
+        rate : float, optional.
+            Points per second (default: 120). Repeated positions are merged into one point.
+
+        Returns
+        -------
+        compile : InputBatch.
+            The cached batch, which must not be modified.
+
+        """
+        ease = Trajectory.EASINGS[easing]
+        count = max(int(round(duration * rate)), 1)
+        step = duration / count
+        (x0, y0), (x1, y1) = start, dest
+        batch = InputBatch()
+        last = start
+        delay = 0
+        for i in range(1, count + 1):
+            delay += step
+            progress = ease(i / count)
+            point = (int(round(x0 + (x1 - x0) * progress)), int(round(y0 + (y1 - y0) * progress)))
+            if point != last or i == count:
+                batch.append(InputBatch.MOVE_TO, 0, delay, point[0], point[1])
+                last = point
+                delay = 0
+        return batch
+
+    @staticmethod
+    def play(start: Tuple[int, int], dest: Tuple[int, int], duration: float,
+             easing: str = "easeInOutQuad", rate: float = None) -> Dict[str, Any]:
+        """
+        Play a trajectory with the current `InputBackend`, from the cursor placed at `start`.
+
+        Parameters
+        ----------
+        rate : float, optional.
+            Points per second (default: None, `Trajectory.Rate`).
+            Please see more parameters in `Trajectory.compile()`.
+
+        Returns
+        -------
+        play : Dict[str, Any].
+            The report of the move, please see more in `Trajectory.getReport()`.
+
+        """
+        rate = Trajectory.Rate if rate is None else rate
+        hits = Trajectory.compile.cache_info().hits
+        batch = Trajectory.compile(tuple(start), tuple(dest), duration, easing, rate)
+        cached = Trajectory.compile.cache_info().hits > hits
+
+        backend = InputBackend.get()
+        clock = Clock.get()
+        begin = clock.now()
+        points = backend.sendBatch(batch, begin)
+        elapsed = clock.now() - begin
+        x, y = backend.getCursorPos()
+        Trajectory._Report = {
+            "points": points,
+            "planned": duration,
+            "achieved": elapsed,
+            "rate": points / elapsed if elapsed > 0 else 0,
+            "plannedRate": rate,
+            "endpointError": math.hypot(x - dest[0], y - dest[1]),
+            "cached": cached,
+        }
+        return Trajectory._Report
+
+    @staticmethod
+    def getReport() -> Dict[str, Any]:
+        """
+        Get the report of the last move.
+
+        Returns
+        -------
+        getReport : Dict[str, Any].
+            A dictionary with the following keys, or None if no move is played:
+                points - points played.\n
+                planned / achieved - planned and achieved seconds of the move.\n
+                rate / plannedRate - achieved and planned points per second.\n
+                endpointError - distance in pixels from the final cursor position to the destination.\n
+                cached - True if the trajectory was found in the cache.
+
+        """
+        return Trajectory._Report
+
+
+################################################################################
+################################# CameraMotion #################################
+################################################################################
+class CameraMotion:
+    """
+    A camera motion engine streaming relative mouse motion at a high fixed rate.
+
+    3D games read raw relative motion instead of the cursor position, so the camera is turned by
+    `InputBatch.MOVE_BY` deltas. A curve is precomputed once into cumulative integer positions per tick,
+    so deltas never accumulate rounding errors, and cached by `CameraMotion.compile()` in whole seconds, so
+    motions of random durations share the curves. Curves are:
+        "sweep" - sweeping left and right, `amplitude` counts each side, once per `period` seconds.\n
+        "figure8" - a figure-eight of `amplitude` counts wide, once per `period` seconds.\n
+        "randomwalk" - a smooth seeded random walk at about `amplitude` counts per second.\n
+        "panLeft" / "panRight" / "panUp" / "panDown" - turning at `amplitude` counts per second.
+    While playing, ticks already due are merged into one injection, so the cost per tick is capped
+    and a slow tick never makes the motion fall behind.
+    """
+    CURVES = ("sweep", "figure8", "randomwalk", "panLeft", "panRight", "panUp", "panDown")
+
+    _PAN = {"panLeft": (-1, 0), "panRight": (1, 0), "panUp": (0, -1), "panDown": (0, 1)}
+
+    @staticmethod
+    def compile(curve: str, duration: float, rate: float = 1000, amplitude: float = 800,
+                period: float = 4, seed: int = 0) -> Tuple[array.array, array.array]:
+        """
+        Compile a curve into cumulative integer positions per tick.
+
+        Parameters
+        ----------
+        curve : string.
+            Name of the curve in `CameraMotion.CURVES`.
+        duration : float.
+            Seconds of the motion.
+        rate : float, optional.
+            Ticks per second (default: 1000).
+        amplitude : float, optional.
+            Size of the curve in mouse counts, or speed in counts per second (default: 800).
+        period : float, optional.
+            Seconds of one cycle of "sweep" and "figure8" (default: 4).
+        seed : int, optional.
+            The seed of "randomwalk" (default: 0).
+
+        Returns
+        -------
+        compile : Tuple[array.array, array.array].
+            The cached positions (x, y) at ticks 0 to at least n, where tick 0 is (0, 0). They must not be modified.
+
+        Raises
+        ------
+        ValueError
+            If the curve is not recognized.
+
+        Notes
+        -----
+        A position only depends on its tick, not on the duration, so the curve is compiled and cached for the
+        duration rounded up to whole seconds, and its first n + 1 positions are those of the duration.
+
+        """
+        if curve not in CameraMotion.CURVES:
+            raise ValueError("Camera curve %r is not one of %s" % (curve, CameraMotion.CURVES))
+        return CameraMotion._compile(curve, max(math.ceil(duration - 1e-9), 1), rate, amplitude, period, seed)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _compile(curve: str, seconds: int, rate: float, amplitude: float,
+                 period: float, seed: int) -> Tuple[array.array, array.array]:
+        """Compile a curve of whole `seconds`, please see `CameraMotion.compile()`."""
+        count = max(int(round(seconds * rate)), 1)
+        xs = array.array('i', [0])
+        ys = array.array('i', [0])
+        omega = 2 * math.pi / period
+        if curve in CameraMotion._PAN:
+            ux, uy = CameraMotion._PAN[curve]
+            for i in range(1, count + 1):
+                d = amplitude * i / rate
+                xs.append(int(round(ux * d)))
+                ys.append(int(round(uy * d)))
+        elif curve == "randomwalk":
+            rng = random.Random(seed)
+            vx = vy = x = y = 0.0
+            # Velocity follows a damped random walk, so the direction changes smoothly
+            sigma = amplitude * math.sqrt(2.0 / rate)
+            for i in range(1, count + 1):
+                vx += rng.gauss(0, sigma) - vx * 2.0 / rate
+                vy += rng.gauss(0, sigma) * 0.3 - vy * 2.0 / rate
+                x += vx / rate
+                y += vy / rate
+                xs.append(int(round(x)))
+                ys.append(int(round(y)))
+        else:
+            for i in range(1, count + 1):
+                t = i / rate
+                xs.append(int(round(amplitude * math.sin(omega * t))))
+                ys.append(int(round(amplitude / 2 * math.sin(2 * omega * t))) if curve == "figure8" else 0)
+        return xs, ys
+
+    @staticmethod
+    def play(curve: str, duration: float, rate: float = 1000, amplitude: float = 800,
+             period: float = 4, seed: int = 0) -> Dict[str, Any]:
+        """
+        Play a curve with the current `InputBackend`. Please see parameters in `CameraMotion.compile()`.
+
+        Returns
+        -------
+        play : Dict[str, Any].
+            A dictionary with the following keys:
+                curve / planned - the curve and its planned seconds.\n
+                achieved - achieved seconds.\n
+                ticks - ticks of the curve.\n
+                injections - injections made; ticks merged into others are counted in "merged".\n
+                rate / plannedRate - achieved injections and planned ticks per second.\n
+                tickCostMean / tickCostMax - seconds spent in each injection.
+
+        """
+        xs, ys = CameraMotion.compile(curve, duration, rate, amplitude, period, seed)
+        count = max(int(round(duration * rate)), 1)
+        backend = InputBackend.get()
+        clock = Clock.get()
+        step = 1 / rate
+        injections = 0
+        costTotal = costMax = 0
+        start = clock.now()
+        i = 0
+        while i < count:
+            now = clock.now()
+            deadline = start + (i + 1) * step
+            if now < deadline:
+                clock.sleep(deadline - now)
+                now = clock.now()
+            # Merge every tick due by now
+            j = min(max(int((now - start) / step + 1e-9), i + 1), count)
+            dx = xs[j] - xs[i]
+            dy = ys[j] - ys[i]
+            before = time.perf_counter_ns()
+            backend.inject(InputBatch.MOVE_BY, x=dx, y=dy)
+            cost = time.perf_counter_ns() - before
+            costTotal += cost
+            costMax = max(costMax, cost)
+            injections += 1
+            i = j
+        achieved = clock.now() - start
+        return {
+            "curve": curve,
+            "planned": duration,
+            "achieved": achieved,
+            "ticks": count,
+            "injections": injections,
+            "merged": count - injections,
+            "rate": injections / achieved if achieved > 0 else 0,
+            "plannedRate": rate,
+            "tickCostMean": costTotal / injections / 1e9 if injections else 0,
+            "tickCostMax": costMax / 1e9,
+        }
+
+
+################################################################################
+#################################### Input #####################################
+################################################################################
+class Input:
+    """Input Method for Input operations."""
+
+    @staticmethod
+    def key_input(key: str, t: float = 0.05) -> Literal[0, 1]:
+        """
+        Perform a key pressdown and pressup.
+
+        Parameters
+        ----------
+        key : string.
+            A key to be pressed.
+        t : float, optional.
+            A time period in second between pressdown and pressup (default: 0.05).
+
+
+        Returns
+        -------
+        key_input : Literal[0, 1]
+            Return 1, if succeed to input the key; otherwise, return 0.
+        """
+        batch = InputBatch.fromKey(key, t)
+        if len(batch):
+            InputBackend.get().sendBatch(batch)
+            return 1
+        return 0
+
+    @staticmethod
+    def key_inputs(str_input: str, t: float = 0.05, duration: float = 0.5) -> None:
+        """
+        Perform a serious of key pressdowns and pressups.
+
+        Parameters
+        ----------
+        key : string.
+            String of keys to be pressed.
+        t : float, optional.
+            A time period in second between pressdown and pressup (default: 0.05).
+        duration : float, optional.
+            A time period in second between each string of keys (default: 0.5).
+
+        Notes
+        -----
+        * The whole string is compiled by `InputBatch.fromString()` and injected by one `InputBackend.sendBatch()`.
+        * Each key of `str_input` must satisfy Input.key_input() specification; other keys are skipped.
+
+        """
+        InputBackend.get().sendBatch(InputBatch.fromString(str_input, t, duration))
+        if str_input:
+            Clock.get().sleep(duration)
+
+    @staticmethod
+    def key_alt_tab(t=0.5) -> None:
+        """
+        Perform a key action of ALT + TAB.
+
+        Parameters
+        ----------
+        t : float, optional.
+            A time period in second between pressdown and pressup (default: 0.5).
+
+        """
+        InputBackend.get().sendBatch(InputBatch.chord(["alt", "tab"], t))
+
+    @staticmethod
+    def key_alt_f4(t: float = 0.6) -> None:
+        """
+        Perform a key action of ALT + F4.
+
+        Parameters
+        ----------
+        t : float, optional.
+            A time period in second between pressdown and pressup (default: 0.6).
+
+        """
+        duration = float('%.1f' % (t / 3))
+        InputBackend.get().sendBatch(
+            InputBatch.chord(["alt", "F4"], duration, stagger=duration))
+
+    @staticmethod
+    def clickLeft(x: int = None, y: int = None, t: float = 0) -> Tuple[int, int]:
+        """
+        Left click on screen position (x, y).
+
+        Parameters
+        ----------
+        x : integer, optional.
+            Horizontal position to be clicked (default: None).
+            If None, use the current horizontal position.
+        y : integer, optional.
+            Vertical position to be clicked (default: None).
+            If None, use the current vertical position.
+        t : float, optional.
+            A time period in second between pressdown and pressup (default: 0).
+
+        Returns
+        -------
+        clickLeft : Tuple[int, int]
+            A tuple (x, y) representing the clicked position.
+
+        """
+        backend = InputBackend.get()
+        if x == None and y == None:
+            x, y = backend.getCursorPos()
+        # backend.setCursorPos(x, y)
+        backend.sendBatch(InputBatch.click("left", t))
+        return x, y
+
+    @staticmethod
+    def clickRight(x: int = None, y: int = None, t: float = 0) -> Tuple[int, int]:
+        """
+        Right click on screen position (x, y).
+
+        Parameters
+        ----------
+        x : integer, optional.
+            Horizontal position to be clicked (default: None).
+            If None, use the current horizontal position.
+        y : integer, optional.
+            Vertical position to be clicked (default: None).
+            If None, use the current vertical position.
+        t : float, optional.
+            A time period in second between pressdown and pressup (default: 0).
+
+        Returns
+        -------
+        clickRight : Tuple[int, int]
+            A tuple (x, y) representing the clicked position.
+
+        """
+        backend = InputBackend.get()
+        if x == None and y == None:
+            x, y = backend.getCursorPos()
+        # backend.setCursorPos(x, y)
+        backend.sendBatch(InputBatch.click("right", t))
+        return x, y
+
+    @staticmethod
+    def move(dest_x: int, dest_y: int, start_x: int = None, start_y: int = None, duration: float = 0) -> Tuple[int, int]:
+        """
+        Move the mouse from (start_x, start_y) to (dest_x, dest_y) in duration time.
+
+        Parameters
+        ----------
+        @param:
+        dest_x : integer.
+            Horizontal position to move to.
+        dest_y : integer.
+            Vertical position to move to.
+        start_x : integer, optional.
+            Horizontal position to move from (default: None).
+            If None, use the current horizontal position.
+        start_y : integer, optional.
+            Horizontal position to move from (default: None).
+            If None, use the current horizontal position.
+        duration : float, optional.
+            A time period in second between pressdown and pressup (default: 0.5).
+
+        Returns
+        -------
+        move : Tuple[int, int]
+            A tuple (x, y) representing the final mouse position.
+
+        """
+        backend = InputBackend.get()
+        if start_x == None or start_y == None:
+            x, y = backend.getCursorPos()
+            start_x = x if start_x == None else start_x
+            start_y = y if start_y == None else start_y
+            if (start_x, start_y) != (x, y):
+                backend.setCursorPos(start_x, start_y)
+        else:
+            backend.setCursorPos(start_x, start_y)
+        Trajectory.play((start_x, start_y), (dest_x, dest_y), duration)
+        return dest_x, dest_y
+
+    @staticmethod
+    def moveTo(dest_x: int, dest_y: int, duration: float = 0) -> Tuple[int, int]:
+        """
+        Move the mouse from current position to (dest_x, dest_y) in duration time.
+
+        Parameters
+        ----------
+        @param:
+        dest_x : integer.
+            Horizontal position to move to.
+        dest_y : integer.
+            Vertical position to move to.
+        duration : float, optional.
+            A time period in second between pressdown and pressup (default: 0.5).
+
+        Notes
+        -----
+        * This function utilize Input.Move(), please see more details in Input.Move().
+        * Parameters of this functions must fully satisfy Input.Move() specification.
+
+        Returns
+        -------
+        move : Tuple[int, int]
+            A tuple (x, y) representing the final mouse position.
+
+        """
+        return Input.move(dest_x, dest_y, duration=duration)
+
+    @staticmethod
+    def getMouse(t: float = 0.5) -> None:
+        """
+        Get the mouse position and print in the console.
+
+        Parameters
+        ----------
+        t : float, optional.
+            A time period in second to get the mouse position (default: 0.5).
+
+        Notes
+        -----
+        To end this function, please press Ctrl+C.
+
+        Examples
+        --------
+        The output format would be the following:
+
+        >>> Input.logMouse()
+        Press Ctrl-C to end
+        Screen Size: (2560, 1440);  Mouse Position: (114, 514)
+
+        """
+        try:
+            while True:
+                print("Press Ctrl-C to end")
+                screenWidth, screenHeight = InputBackend.get().getScreenSize()  # 获取屏幕的尺寸
+                x, y = InputBackend.get().getCursorPos()  # 返回鼠标的坐标
+                print("Screen Size: (%s, %s);  Mouse Position: (%s, %s)\n" %
+                      (screenWidth, screenHeight, x, y))  # 打印坐标
+
+                Clock.get().sleep(t)  # 每个1s中打印一次 , 并执行清屏
+                os.system('cls')  # 执行系统清屏指令
+
+        except KeyboardInterrupt:
+            print('end')
+
+    @staticmethod
+    def logMouse(t: float = 0, clear: bool = True) -> None:
+        """
+        Get the mouse position and print in the console only when the mouse position changes.
+
+        Parameters
+        ----------
+        t : float, optional.
+            A time period in second to get the mouse position (default: 0).
+        clear : bool, optional.
+            If True, the console will be cleared when the program is ended (default: True).
+
+        Notes
+        -----
+        To end this function, please press Ctrl+C.
+
+        Examples
+        --------
+        The output format would be the following:
+
+        >>> Input.logMouse()
+        Screen Size: (2560, 1440);  Mouse Position: (114, 514)
+
+        """
+        try:
+            backend = InputBackend.get()
+            x, y = backend.getCursorPos()  # 返回鼠标的坐标
+            while True:
+                screenWidth, screenHeight = backend.getScreenSize()  # 获取屏幕的尺寸
+                xNew, yNew = backend.getCursorPos()  # 返回鼠标的坐标
+                if xNew != x and yNew != y:
+                    print("Screen Size: (%s, %s);  Mouse Position :(%s, %s)\n" %
+                          (screenWidth, screenHeight, x, y))  # 打印坐标
+                    x, y = (xNew, yNew)
+
+        except KeyboardInterrupt:
+            if clear:
+                os.system('cls')  # 执行系统清屏指令
+            print('end')
+
+    @staticmethod
+    def callTinyTask(file: str) -> int:
+        """
+        Calling the .exe file made by TinyTask under the current working directory.
+
+        If `MacroPlayer.Enabled` is True and a macro of the same name is registered in `MacroPlayer`, the macro
+        is played in-process instead, without creating a process. A TinyTask file returns at once and runs alongside,
+        while a macro returns after its last event.
+
+        Parameters
+        ----------
+        file : string.
+            A TinyTask File Name to be performed.
+
+        Returns
+        -------
+        callTinyTask : integer.
+            If 0, something went wrong in calling TinyTask file; otherwise, succeed with a non-0 code.
+
+        Examples
+        --------
+        Directly calling a TinyTask file under the current working directory.
+
+        >>> Input.callTinyTask("Test.exe")
+
+        Calling a TinyTask file in a folder under the current working directory.
+
+        >>> Input.callTinyTask("foo/Test.exe")
+
+        """
+        if MacroPlayer.has(file):
+            return MacroPlayer.play(file)
+        return InputBackend.get().shellExecute(os.path.join(os.getcwd(), file))
+
 
-    _VK_CODE2 = {
-        'A': 'a',
-        'B': 'b',
-        'C': 'c',
-        'D': 'd',
-        'E': 'e',
-        'F': 'f',
-        'G': 'g',
-        'H': 'h',
-        'I': 'i',
-        'J': 'j',
-        'K': 'k',
-        'L': 'l',
-        'M': 'm',
-        'N': 'n',
-        'O': 'o',
-        'P': 'p',
-        'Q': 'q',
-        'R': 'r',
-        'S': 's',
-        'T': 't',
-        'U': 'u',
-        'V': 'v',
-        'W': 'w',
-        'X': 'x',
-        'Y': 'y',
-        'Z': 'z',
-        ')': '0',
-        '!': '1',
-        '@': '2',
-        '#': '3',
-        '$': '4',
-        '%': '5',
-        '^': '6',
-        '&': '7',
-        '*': '8',
-        '(': '9',
-        '=': '+',
-        '<': ',',
-        '_': '-',
-        '>': '.',
-        '?': '/',
-        '~': '`',
-        ':': ';',
-        '{': '[',
-        '|': '\\',
-        '}': ']',
-        '"': "'"
-    }
+################################################################################
+################################## Condition ###################################
+################################################################################
+class ConditionProvider(abc.ABC):
+    """
+    Provider of the system state polled by `Condition`: processes, windows, files and screen regions.
+
+    The current provider is got by `ConditionProvider.get()` and replaced by `ConditionProvider.set()`, which also
+    accepts a name in `ConditionProvider.PROVIDERS`:
+        "system" - `SystemConditionProvider`, reading Windows, or /proc and the file system elsewhere.\n
+        "fake" - `FakeConditionProvider`, a scripted state following the current `Clock`, for tests.
+    """
+    _Current: 'ConditionProvider' = None
+
+    PROVIDERS: Dict[str, Callable[[], 'ConditionProvider']] = {}
+
+    @abc.abstractmethod
+    def listProcesses(self) -> List[Tuple[int, int, str]]:
+        """Return the running processes as a list of (pid, parent pid, executor name)."""
+
+    def processStarted(self, pid: int) -> float:
+        """
+        Return the creation time of a running process in seconds, comparable between processes of the provider,
+        or None if it is unknown.
+        """
+        return None
+
+    def processExists(self, name: str) -> bool:
+        """Return True if a process of the executor name exists, case-insensitively."""
+        name = name.lower()
+        return any(exe.lower() == name for _, _, exe in self.listProcesses())
+
+    @abc.abstractmethod
+    def windowExists(self, title: str = None, className: str = None) -> bool:
+        """Return True if a top-level window of the title and class name exists; None matches any."""
+
+    @abc.abstractmethod
+    def controlExists(self, controlType: str, name: str, childType: str = None, childIndex: int = 0,
+                      childName: str = '') -> bool:
+        """
+        Return True if a top-level UIAutomation control of the ControlType and Name exists, such as a launcher window,
+        and a control of `childType` (None for none) found as `InputBackend.clickControl()` does, such as its START button.
+        """
+
+    def fileSize(self, path: str) -> int:
+        """Return the size of the file in bytes, or None if it does not exist."""
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return None
+
+    @abc.abstractmethod
+    def captureRegion(self, region: Tuple[int, int, int, int]) -> Any:
+        """
+        Return the pixels of the screen region (left, top, width, height), as an array in shape
+        (height, width, channels) or raw bytes; or None if the screen cannot be captured.
+        """
+
+    @staticmethod
+    def get() -> 'ConditionProvider':
+        """Return the current provider."""
+        return ConditionProvider._Current
+
+    @staticmethod
+    def set(provider: 'ConditionProvider' = None) -> 'ConditionProvider':
+        """
+        Replace the current provider.
+
+        Parameters
+        ----------
+        provider : ConditionProvider | string, optional.
+            The new provider or its name in `ConditionProvider.PROVIDERS`, or None to restore "system" (default: None).
+
+        Returns
+        -------
+        set : ConditionProvider.
+            The previous provider.
+
+        """
+        if provider is None:
+            provider = "system"
+        if isinstance(provider, str):
+            provider = ConditionProvider.PROVIDERS[provider.lower()]()
+        previous = ConditionProvider._Current
+        ConditionProvider._Current = provider
+        return previous
+
+    @staticmethod
+    @contextlib.contextmanager
+    def use(provider: 'ConditionProvider') -> Iterator['ConditionProvider']:
+        """Use a provider within a `with` block, and restore the previous provider afterward."""
+        previous = ConditionProvider.set(provider)
+        try:
+            yield ConditionProvider._Current
+        finally:
+            ConditionProvider.set(previous)
+
+
+class _PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [("dwSize", ctypes.wintypes.DWORD),
+                ("cntUsage", ctypes.wintypes.DWORD),
+                ("th32ProcessID", ctypes.wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_size_t),
+                ("th32ModuleID", ctypes.wintypes.DWORD),
+                ("cntThreads", ctypes.wintypes.DWORD),
+                ("th32ParentProcessID", ctypes.wintypes.DWORD),
+                ("pcPriClassBase", ctypes.wintypes.LONG),
+                ("dwFlags", ctypes.wintypes.DWORD),
+                ("szExeFile", ctypes.wintypes.WCHAR * 260)]
+
+
+class SystemConditionProvider(ConditionProvider):
+    """
+    A provider reading the running system.
+
+    Processes are listed by a Toolhelp snapshot on Windows, or from /proc elsewhere. Windows are found by
+    `FindWindowW`, and controls by UIAutomation; both never exist off Windows. Screen regions are captured by pyautogui,
+    taking tens of milliseconds per capture, please see more in `ScreenObserver`.
+    """
+
+    def listProcesses(self) -> List[Tuple[int, int, str]]:
+        if sys.platform == "win32":
+            return self._listWin32()
+        processes = []
+        try:
+            pids = [pid for pid in os.listdir("/proc") if pid.isdigit()]
+        except OSError:
+            return processes
+        for pid in pids:
+            try:
+                with open("/proc/%s/stat" % pid, "rb") as f:
+                    stat = f.read().decode(errors="replace")
+                with open("/proc/%s/cmdline" % pid, "rb") as f:
+                    argv0 = f.read().split(b"\0", 1)[0].decode(errors="replace")
+            except OSError:
+                continue
+            # The name in stat is truncated to 15 characters, prefer the executor of the command line
+            name = os.path.basename(argv0) or stat[stat.find("(") + 1:stat.rfind(")")]
+            state, ppid = stat[stat.rfind(")") + 2:].split()[:2]
+            if state != "Z":
+                # Zombies have exited, and are only waiting to be reaped
+                processes.append((int(pid), int(ppid), name))
+        return processes
+
+    def processStarted(self, pid: int) -> float:
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+            if not handle:
+                return None
+            try:
+                times = [ctypes.wintypes.FILETIME() for _ in range(4)]
+                if not kernel32.GetProcessTimes(handle, *[ctypes.byref(t) for t in times]):
+                    return None
+                return (times[0].dwHighDateTime << 32 | times[0].dwLowDateTime) / 1e7
+            finally:
+                kernel32.CloseHandle(handle)
+        try:
+            with open("/proc/%s/stat" % pid, "rb") as f:
+                stat = f.read()
+        except OSError:
+            return None
+        # starttime, the 22nd field, in clock ticks after boot
+        return int(stat[stat.rfind(b")") + 2:].split()[19]) / os.sysconf("SC_CLK_TCK")
+
+    @staticmethod
+    def _listWin32() -> List[Tuple[int, int, str]]:
+        kernel32 = ctypes.windll.kernel32
+        kernel32.CreateToolhelp32Snapshot.restype = ctypes.wintypes.HANDLE
+        snapshot = kernel32.CreateToolhelp32Snapshot(0x00000002, 0)  # TH32CS_SNAPPROCESS
+        processes = []
+        if snapshot in (None, ctypes.wintypes.HANDLE(-1).value):
+            return processes
+        try:
+            entry = _PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(_PROCESSENTRY32W)
+            more = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while more:
+                processes.append((entry.th32ProcessID, entry.th32ParentProcessID, entry.szExeFile))
+                more = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            kernel32.CloseHandle(snapshot)
+        return processes
+
+    def windowExists(self, title: str = None, className: str = None) -> bool:
+        if sys.platform != "win32":
+            return False
+        return bool(ctypes.windll.user32.FindWindowW(className, title))
+
+    def controlExists(self, controlType: str, name: str, childType: str = None, childIndex: int = 0,
+                      childName: str = '') -> bool:
+        if auto is None or controlType not in InputBackend.CONTROL_TYPES:
+            return False
+        if not getattr(auto, controlType)(searchDepth=1, Name=name).Exists(0, 0):
+            return False
+        if childType is None:
+            return True
+        if childType not in InputBackend.CONTROL_TYPES:
+            return False
+        return bool(getattr(auto, childType)(foundIndex=childIndex, Name=childName).Exists(0, 0))
 
-    @staticmethod
-    def getVK_CODE1() -> Dict[str, str]:
-        """
-        Get the first VK Code list of original Keys.
+    def captureRegion(self, region: Tuple[int, int, int, int]) -> Any:
+        if pag is None:
+            return None
+        image = pag.screenshot(region=tuple(region))
+        return image.tobytes() if np is None else np.asarray(image)
 
-        Returns
-        -------
-        getVK_CODE1 : Dict[str, str]
-            The original representation of VK_CODE.
 
-        """
-        return dict(VK_CODE._VK_CODE1)
+class FakeConditionProvider(ConditionProvider):
+    """
+    A scripted provider for tests, whose state follows the current `Clock`.
+
+    Times are seconds from the construction of the provider. Use it with a `VirtualClock`,
+    so conditions are met without waiting.
+
+    Examples
+    --------
+    >>> fake = FakeConditionProvider()
+    >>> fake.addProcess("Fallout4.exe", start=12, end=300)
+    >>> fake.addFile("save.log", [(5, 100), (9, 400)])
+    >>> with ConditionProvider.use(fake):
+    >>>     Condition.wait(("process", "Fallout4.exe"), 60)
+    """
+
+    def __init__(self) -> None:
+        self._origin = Clock.get().now()
+        self._processes: List[Tuple[int, int, str, float, float]] = []
+        self._windows: List[Tuple[str, str, float, float]] = []
+        self._controls: List[Tuple[str, str, float, float]] = []
+        self._files: Dict[str, List[Tuple[float, int]]] = {}
+        self._frames: Dict[Tuple[int, int, int, int], Any] = {}
+
+    def _elapsed(self) -> float:
+        return Clock.get().now() - self._origin
 
     @staticmethod
-    def getVK_CODE2() -> Dict[str, str]:
+    def _at(timeline: List[Tuple[float, Any]], elapsed: float) -> Any:
+        value = None
+        for at, item in timeline:
+            if at > elapsed:
+                break
+            value = item
+        return value
+
+    def addProcess(self, name: str, start: float = 0, end: float = None, pid: int = None, ppid: int = 0) -> int:
         """
-        Get the second VK Code list of upper-cased Keys.
+        Run a process from `start` to `end` (None for ever) seconds, and return its pid. A pid may be added again
+        after its previous process ends, as pids are reused.
+        """
+        if pid is None:
+            pid = 1000 + len(self._processes)
+        self._processes.append((pid, ppid, name, start, end))
+        return pid
 
-        Returns
-        -------
-        getVK_CODE1 : Dict[str, str]
-            The Upper-cased representation of VK_CODE.
+    def addWindow(self, title: str, className: str = None, start: float = 0, end: float = None) -> None:
+        """Show a window from `start` to `end` (None for ever) seconds."""
+        self._windows.append((title, className, start, end))
+
+    def addControl(self, controlType: str, name: str, start: float = 0, end: float = None) -> None:
+        """Show a UIAutomation control from `start` to `end` (None for ever) seconds; child indexes are not scripted."""
+        self._controls.append((controlType, name, start, end))
 
+    def addFile(self, path: str, sizes: List[Tuple[float, int]]) -> None:
+        """Create a file, whose size changes at each (seconds, size); it does not exist before the first."""
+        self._files[path] = sorted(sizes)
+
+    def addFrames(self, region: Tuple[int, int, int, int],
+                  frames: Union[List[Tuple[float, Any]], Callable[[float, Tuple[int, int, int, int]], Any]]) -> None:
         """
-        return dict(VK_CODE._VK_CODE2)
+        Show each (seconds, pixels) in a screen region, or the frames of a source called with (seconds, region),
+        such as `SyntheticFrameSource`. The region is None for any region.
+        """
+        self._frames[None if region is None else tuple(region)] = frames if callable(frames) else sorted(frames)
 
+    def listProcesses(self) -> List[Tuple[int, int, str]]:
+        elapsed = self._elapsed()
+        return [(pid, ppid, name) for pid, ppid, name, start, end in self._processes
+                if start <= elapsed and (end is None or elapsed < end)]
 
-_RANDOM_WORD_LIST = VK_CODE.getVK_CODE2().copy()
-_RANDOM_WORD_LIST.update(VK_CODE.getVK_CODE1())
-_RANDOM_WORD_LIST = list(_RANDOM_WORD_LIST.keys())
+    def processStarted(self, pid: int) -> float:
+        elapsed = self._elapsed()
+        for p, _, _, start, end in self._processes:
+            if p == pid and start <= elapsed and (end is None or elapsed < end):
+                return start
+        return None
 
+    def windowExists(self, title: str = None, className: str = None) -> bool:
+        elapsed = self._elapsed()
+        return any((title is None or title == t) and (className is None or className == c)
+                   and start <= elapsed and (end is None or elapsed < end)
+                   for t, c, start, end in self._windows)
 
-################################################################################
-#################################### Input #####################################
-################################################################################
-class Input:
-    """Input Method for Input operations."""
+    def controlExists(self, controlType: str, name: str, childType: str = None, childIndex: int = 0,
+                      childName: str = '') -> bool:
+        elapsed = self._elapsed()
+        shown = [(c, n) for c, n, start, end in self._controls if start <= elapsed and (end is None or elapsed < end)]
+        return (controlType, name) in shown and (childType is None or (childType, childName) in shown)
+
+    def fileSize(self, path: str) -> int:
+        return self._at(self._files.get(path, ()), self._elapsed())
+
+    def captureRegion(self, region: Tuple[int, int, int, int]) -> Any:
+        frames = self._frames.get(tuple(region), self._frames.get(None, ()))
+        if callable(frames):
+            return frames(self._elapsed(), tuple(region))
+        return self._at(frames, self._elapsed())
+
+
+ConditionProvider.PROVIDERS.update(system=SystemConditionProvider, fake=FakeConditionProvider)
+ConditionProvider.set()
+
+
+class Condition:
+    """
+    Conditions polled by "u" actions of `Game`, to proceed as soon as the condition holds instead of waiting a fixed time.
+
+    A condition is a tuple with its kind first, read from the current `ConditionProvider`:
+        ("process", name) - a process of the executor name exists.\n
+        ("exited", name) - no process of the executor name exists.\n
+        ("window", title[, className]) - a window of the title (None for any) and class name exists.\n
+        ("control", controlType, name[, childType, childIndex, childName]) - a top-level UIAutomation control exists,
+        such as ("WindowControl", "Fallout 4"), and its child control if given, such as the START button.\n
+        ("spawned", pid) - a process not running at the start of the wait is spawned by the launched process of the pid,
+        or by its children, as tracked by `ProcessManager`.\n
+        ("file", path) - the file exists.\n
+        ("fileStable", path[, seconds]) - the file exists and its size has not changed for `seconds`.\n
+        ("regionChanged", (left, top, width, height)) - the screen region differs from its first capture.\n
+        ("regionStable", (left, top, width, height)[, seconds]) - the screen region has not changed for `seconds`.\n
+        ("regionMatches", (left, top, width, height), name[, game]) - the screen region is the same as a reference
+        saved by `ScreenObserver.saveReference()`.
+    `seconds` is `Condition.StableTime` by default, and conditions are polled every `Condition.Interval` seconds.
+    Screen regions are compared by `ScreenObserver` if NumPy is installed; otherwise, by their exact pixels.
+    """
+    KINDS = ("process", "exited", "window", "control", "spawned", "file", "fileStable", "regionChanged", "regionStable",
+             "regionMatches")
+
+    Interval: float = 0.5
+    StableTime: float = 2
+
+    _Report: Dict[str, Any] = None
 
     @staticmethod
-    def key_input(key: str, t: float = 0.05) -> Literal[0, 1]:
+    def parse(condition: tuple) -> tuple:
+        """
+        Validate a condition, and return it as a tuple.
+
+        Raises
+        ------
+        ValueError
+            If the condition is invalid.
+
+        """
+        if isinstance(condition, str):
+            condition = (condition,)
+        if not isinstance(condition, (tuple, list)) or not condition or condition[0] not in Condition.KINDS:
+            raise ValueError("Invalid Condition %r, expected (kind, ...) of kind in %s" % (condition, Condition.KINDS))
+        kind, args = condition[0], tuple(condition[1:])
+        if kind in ("process", "exited", "file") and (len(args) != 1 or not isinstance(args[0], str)):
+            raise ValueError("Invalid Condition %r, expected (%r, name)" % (condition, kind))
+        if kind == "control" and (len(args) not in (2, 5) or args[0] not in InputBackend.CONTROL_TYPES or
+                                  len(args) == 5 and args[2] not in InputBackend.CONTROL_TYPES):
+            raise ValueError("Invalid Condition %r, expected ('control', controlType, name[, childType, childIndex, "
+                             "childName]) of controlType in %s" % (condition, InputBackend.CONTROL_TYPES))
+        if kind == "spawned" and (len(args) != 1 or not isinstance(args[0], int)):
+            raise ValueError("Invalid Condition %r, expected ('spawned', pid)" % (condition,))
+        if kind == "window" and not 1 <= len(args) <= 2:
+            raise ValueError("Invalid Condition %r, expected ('window', title[, className])" % (condition,))
+        if kind == "fileStable" and (not 1 <= len(args) <= 2 or not isinstance(args[0], str)):
+            raise ValueError("Invalid Condition %r, expected ('fileStable', path[, seconds])" % (condition,))
+        if kind in ("regionChanged", "regionStable", "regionMatches"):
+            if not 1 <= len(args) <= {"regionChanged": 1, "regionStable": 2, "regionMatches": 3}[kind] or \
+                    not isinstance(args[0], (tuple, list)) or len(args[0]) != 4:
+                raise ValueError("Invalid Condition %r, expected (%r, (left, top, width, height), ...)" % (condition, kind))
+            if kind == "regionMatches" and (len(args) < 2 or not isinstance(args[1], str)):
+                raise ValueError("Invalid Condition %r, expected ('regionMatches', region, name[, game])" % (condition,))
+            args = (tuple(int(v) for v in args[0]),) + args[1:]
+        return (kind,) + args
+
+    @staticmethod
+    def probe(condition: tuple) -> Callable[[], bool]:
+        """
+        Return a predicate of a condition. Predicates of "fileStable", "regionChanged" and "regionStable" keep
+        the previous polls, so a new predicate is needed for every wait.
+        """
+        kind, args = condition[0], condition[1:]
+        provider = ConditionProvider.get()
+        if kind == "process":
+            return functools.partial(provider.processExists, args[0])
+        if kind == "exited":
+            return lambda: not provider.processExists(args[0])
+        if kind == "window":
+            return functools.partial(provider.windowExists, *args)
+        if kind == "control":
+            return functools.partial(provider.controlExists, *args)
+        if kind == "spawned":
+            return Condition._spawned(args[0])
+        if kind == "file":
+            return lambda: provider.fileSize(args[0]) is not None
+        if kind == "fileStable":
+            return Condition._stable(functools.partial(provider.fileSize, args[0]),
+                                     args[1] if len(args) > 1 else Condition.StableTime)
+        if np is not None and kind.startswith("region"):
+            observer = ScreenObserver(args[0], game=args[2] if len(args) > 2 else "")
+            if kind == "regionChanged":
+                return observer.changed
+            if kind == "regionStable":
+                return functools.partial(observer.stable, args[1] if len(args) > 1 else Condition.StableTime)
+            return functools.partial(observer.matches, args[1])
+        if kind == "regionMatches":
+            raise ImportError("Condition 'regionMatches' requires NumPy, please 'pip install numpy'")
+        if kind == "regionStable":
+            return Condition._stable(functools.partial(provider.captureRegion, args[0]),
+                                     args[1] if len(args) > 1 else Condition.StableTime)
+        first = []
+
+        def changed() -> bool:
+            frame = provider.captureRegion(args[0])
+            if frame is None:
+                return False
+            if not first:
+                first.append(frame)
+            return frame != first[0]
+        return changed
+
+    @staticmethod
+    def _spawned(pid: int) -> Callable[[], bool]:
+        process = ProcessManager.Launched.get(pid)
+        if process is not None:
+            tree = process.tree
+            refresh = process.refresh
+        else:
+            # Not launched by this run, follow the parent PIDs of the provider instead
+            def tree() -> List[Tuple[int, str]]:
+                children: Dict[int, List[Tuple[int, str]]] = {}
+                for child, ppid, name in ConditionProvider.get().listProcesses():
+                    children.setdefault(ppid, []).append((child, name))
+                found, pending = [], [pid]
+                while pending:
+                    for child in children.get(pending.pop(), ()):
+                        if child[0] != pid and child not in found:
+                            found.append(child)
+                            pending.append(child[0])
+                return found
+            refresh = tree
+        before = set(tree())
+
+        def spawned() -> bool:
+            return any(child not in before for child in refresh())
+        return spawned
+
+    @staticmethod
+    def _stable(read: Callable[[], Any], seconds: float) -> Callable[[], bool]:
+        state = [None, None]  # last value, since when
+
+        def stable() -> bool:
+            value = read()
+            now = Clock.get().now()
+            if value is None or value != state[0]:
+                state[0], state[1] = value, now
+                return False
+            return now - state[1] >= seconds
+        return stable
+
+    @staticmethod
+    def wait(condition: tuple, timeout: float, interval: float = None, backoff: float = 1,
+             maxInterval: float = None) -> Dict[str, Any]:
         """
-        Perform a key pressdown and pressup.
+        Poll a condition until it holds, or until the timeout.
 
         Parameters
         ----------
-        key : string.
-            A key to be pressed.
-        t : float, optional.
-            A time period in second between pressdown and pressup (default: 0.05).
-
+        condition : tuple.
+            The condition, please see the format in `Condition`.
+        timeout : float.
+            Maximum seconds to wait.
+        interval : float, optional.
+            Seconds between polls (default: None, `Condition.Interval`).
+        backoff : float, optional.
+            Factor the interval is multiplied by after each poll, for conditions that usually take long (default: 1).
+        maxInterval : float, optional.
+            Maximum seconds between polls with backoff (default: None, no maximum).
 
         Returns
         -------
-        key_input : Literal[0, 1]
-            Return 1, if succeed to input the key; otherwise, return 0.
-        """
-        if key in VK_CODE._VK_CODE2:
-            key = VK_CODE._VK_CODE2[key]
-        if key in VK_CODE._VK_CODE1:
-            # Pressdown
-            win32api.keybd_event(VK_CODE._VK_CODE1[key], 0, 0, 0)
-            # Duration between pressdown and pressup
-            time.sleep(t)
-            # Pressup
-            win32api.keybd_event(
-                VK_CODE._VK_CODE1[key], 0, win32con.KEYEVENTF_KEYUP, 0)
-            return 1
-        return 0
+        wait : Dict[str, Any].
+            A dictionary with the following keys:
+                condition - the condition.\n
+                met - whether the condition holds.\n
+                elapsed - seconds to the condition, or to the timeout.\n
+                polls - times the condition was polled.\n
+                timeout - the timeout.
+
+        """
+        condition = Condition.parse(condition)
+        predicate = Condition.probe(condition)
+        interval = Condition.Interval if interval is None else interval
+        clock = Clock.get()
+        start = clock.now()
+        polls = 0
+        offset = 0
+        while True:
+            polls += 1
+            met = bool(predicate())
+            now = clock.now()
+            if met or now - start >= timeout:
+                break
+            # Polls are at fixed offsets from the start, so slow polls never delay the next
+            offset += interval
+            interval = interval * backoff if maxInterval is None else min(interval * backoff, maxInterval)
+            deadline = min(start + offset, start + timeout)
+            if deadline > now:
+                clock.sleep(deadline - now)
+        report = {
+            "condition": condition,
+            "met": met,
+            "elapsed": now - start,
+            "polls": polls,
+            "timeout": timeout,
+        }
+        Condition._Report = report
+        EventLog.Emit("condition", condition=list(condition), met=met, elapsed=report["elapsed"], polls=polls)
+        return report
 
     @staticmethod
-    def key_inputs(str_input: str, t: float = 0.05, duration: float = 0.5) -> None:
-        """
-        Perform a serious of key pressdowns and pressups.
+    def getReport() -> Dict[str, Any]:
+        """Return the report of the last `Condition.wait()`, or None."""
+        return Condition._Report
 
-        Parameters
-        ----------
-        key : string.
-            String of keys to be pressed.
-        t : float, optional.
-            A time period in second between pressdown and pressup (default: 0.05).
-        duration : float, optional.
-            A time period in second between each string of keys (default: 0.5).
 
-        Notes
-        -----
-        * This function utilize Input.key_input(), please see more details in Input.key_input().
-        * Parameter, `str_input` and `t`, must fully satisfy Input.key_input() specification.
+################################################################################
+################################ ProcessManager ################################
+################################################################################
+class ProcessManager:
+    """
+    A launched executor, tracked by its PID together with every process it spawns.
+
+    Launchers often start the real game as a child and exit, so the tree is tracked by the parent PIDs listed by
+    the current `ConditionProvider`, and processes stay tracked after their parent exits. While launching, a
+    background thread refreshes the tree every `ProcessManager.Interval` seconds, so children are found before they
+    are orphaned. Each refresh lists every process of the system, so the thread is stopped by
+    `ProcessManager.stopWatching()` once the game is found, such as by `Game.launch()`, and the tree is then only
+    refreshed on demand, such as by `ProcessManager.wait()` and `ProcessManager.terminate()`. As PIDs are reused, a process is only adopted while its tracked parent runs,
+    and if it is created after the parent; a tracked PID created again is a new process. Processes are waited by
+    their exit handles, and terminated by PID: gracefully first, then forcibly after a deadline. Every launch,
+    spawn, exit and termination is recorded in the timeline, as seconds from the launch.
+
+    Examples
+    --------
+    >>> process = ProcessManager.start("C:/Games/Fallout 4/Fallout4Launcher.exe")
+    >>> process.refresh()
+    >>> process.find("Fallout4.exe")
+    10244
+    >>> process.terminate(grace=10)
+    {'pid': 9528, 'file': '...', 'seconds': 512.3, 'forced': [], 'processes': [...]}
+    """
 
-        """
-        for k in str_input:
-            Input.key_input(k, t)
-            time.sleep(duration)
+    Interval: float = 0.25
+
+    # Tracked processes by their launched pid, for the "spawned" condition of `Condition`
+    Launched: 'weakref.WeakValueDictionary[int, ProcessManager]' = weakref.WeakValueDictionary()
+
+    def __init__(self, popen: subprocess.Popen, file: str) -> None:
+        """Track a process started by `subprocess.Popen`, please use `ProcessManager.start()` instead."""
+        self._lock = threading.RLock()
+        self.popen = popen
+        self.file = file
+        self.pid: int = popen.pid
+        self._launched = Clock.get().now()
+        # pid: [name, spawned, exited]
+        self._processes: Dict[int, list] = {}
+        # pid: creation time of `ConditionProvider.processStarted()`
+        self._created: Dict[int, float] = {}
+        self.timeline: List[Dict[str, Any]] = []
+        self.forced: List[int] = []
+        self._track(self.pid, os.path.basename(file), "launch")
+        ProcessManager.Launched[self.pid] = self
+        self._stopped = threading.Event()
+        threading.Thread(target=self._watch, name="ProcessManager-%s" % self.pid, daemon=True).start()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(ProcessManager.Interval):
+            try:
+                if not self.refresh():
+                    return
+            except Exception:
+                return
+
+    def stopWatching(self) -> None:
+        """Stop refreshing the tree in the background, so no process is listed until the next refresh on demand."""
+        self._stopped.set()
 
     @staticmethod
-    def key_alt_tab(t=0.5) -> None:
+    def start(file: str, params: str = "", cwd: str = None) -> 'ProcessManager':
         """
-        Perform a key action of ALT + TAB.
+        Start an executor with parameters, and track it.
 
-        Parameters
-        ----------
-        t : float, optional.
-            A time period in second between pressdown and pressup (default: 0.5).
+        Raises
+        ------
+        OSError
+            If the executor cannot be started, such as it requires elevation.
 
         """
-        win32api.keybd_event(VK_CODE._VK_CODE1["alt"], 0, 0, 0)
-        win32api.keybd_event(VK_CODE._VK_CODE1["tab"], 0, 0, 0)
-        time.sleep(t)
-        win32api.keybd_event(
-            VK_CODE._VK_CODE1["tab"], 0, win32con.KEYEVENTF_KEYUP, 0)
-        win32api.keybd_event(
-            VK_CODE._VK_CODE1["alt"], 0, win32con.KEYEVENTF_KEYUP, 0)
+        if sys.platform == "win32":
+            command = '"%s" %s' % (file, params) if params else '"%s"' % file
+        else:
+            command = [file] + shlex.split(params)
+        return ProcessManager(subprocess.Popen(command, cwd=cwd, close_fds=True), file)
 
-    @staticmethod
-    def key_alt_f4(t: float = 0.6) -> None:
-        """
-        Perform a key action of ALT + F4.
+    def _event(self, event: str, pid: int, **fields: Any) -> None:
+        record = {"t": Clock.get().now() - self._launched, "event": event, "pid": pid}
+        record.update(fields)
+        with self._lock:
+            self.timeline.append(record)
+        EventLog.Emit("process", state=event, pid=pid, **fields)
 
-        Parameters
-        ----------
-        t : float, optional.
-            A time period in second between pressdown and pressup (default: 0.6).
+    def _track(self, pid: int, name: str, event: str = "spawn", created: float = None) -> None:
+        self._processes[pid] = [name, Clock.get().now() - self._launched, None]
+        self._created[pid] = ConditionProvider.get().processStarted(pid) if created is None else created
+        self._event(event, pid, name=name)
+
+    def _exit(self, pid: int) -> None:
+        if self._processes[pid][2] is None:
+            self._processes[pid][2] = Clock.get().now() - self._launched
+            self._event("exit", pid, name=self._processes[pid][0])
 
+    def refresh(self) -> List[Tuple[int, str]]:
         """
-        duration = float('%.1f' % (t / 3))
-        win32api.keybd_event(VK_CODE._VK_CODE1["alt"], 0, 0, 0)
-        time.sleep(duration)
-        win32api.keybd_event(VK_CODE._VK_CODE1["F4"], 0, 0, 0)
-        time.sleep(duration)
-        win32api.keybd_event(
-            VK_CODE._VK_CODE1["F4"], 0, win32con.KEYEVENTF_KEYUP, 0)
-        time.sleep(duration)
-        win32api.keybd_event(
-            VK_CODE._VK_CODE1["alt"], 0, win32con.KEYEVENTF_KEYUP, 0)
+        Track the processes spawned since the last refresh, and record the exited ones.
+
+        Returns
+        -------
+        refresh : List[Tuple[int, str]].
+            The (pid, executor name) of tracked processes running.
+
+        """
+        provider = ConditionProvider.get()
+        running = {pid: (ppid, name) for pid, ppid, name in provider.listProcesses()}
+        with self._lock:
+            if self.popen.poll() is not None:
+                running.pop(self.pid, None)
+            # Exits are recorded first, so children are only adopted by parents still running
+            for pid, (name, _, exited) in list(self._processes.items()):
+                if exited is None and (pid not in running or self._created[pid] is not None and
+                                       provider.processStarted(pid) != self._created[pid]):
+                    # The process exited, or exited and its pid is reused by another one
+                    self._exit(pid)
+            found = True
+            while found:
+                found = False
+                for pid, (ppid, name) in running.items():
+                    if pid in self._processes or ppid not in self._processes or self._processes[ppid][2] is not None:
+                        continue
+                    created, parentCreated = provider.processStarted(pid), self._created[ppid]
+                    # Creation times are in clock ticks on Linux, so a child may share the tick of its parent
+                    if created is not None and parentCreated is not None and created < parentCreated:
+                        continue
+                    self._track(pid, name, created=created)
+                    found = True
+            return self.tree()
+
+    def tree(self) -> List[Tuple[int, str]]:
+        """Return the (pid, executor name) of tracked processes running, as of the last refresh."""
+        with self._lock:
+            return [(pid, name) for pid, (name, _, exited) in self._processes.items() if exited is None]
+
+    def find(self, name: str) -> int:
+        """Return the pid of a tracked process running of the executor name, case-insensitively; or None."""
+        name = name.lower()
+        for pid, exe in self.tree():
+            if exe.lower() == name:
+                return pid
+        return None
+
+    def tracked(self, name: str) -> bool:
+        """Return True if a process of the executor name has ever been tracked, case-insensitively."""
+        name = name.lower()
+        with self._lock:
+            return any(exe.lower() == name for exe, _, _ in self._processes.values())
+
+    def alive(self) -> bool:
+        """Return True if any tracked process is running."""
+        return bool(self.refresh())
 
     @staticmethod
-    def clickLeft(x: int = None, y: int = None, t: float = 0) -> Tuple[int, int]:
+    def _waitPid(pid: int, timeout: float) -> bool:
+        """Wait for a process which is not a child to exit, and return True if it exited."""
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.OpenProcess(0x00100000, False, pid)  # SYNCHRONIZE
+            if not handle:
+                return True
+            try:
+                return kernel32.WaitForSingleObject(handle, int(max(timeout, 0) * 1000)) == 0  # WAIT_OBJECT_0
+            finally:
+                kernel32.CloseHandle(handle)
+        # No exit handles of other processes on POSIX, poll with backoff instead
+        deadline = time.monotonic() + timeout
+        interval = 0.005
+        while True:
+            try:
+                os.kill(pid, 0)
+                with open("/proc/%s/stat" % pid, "rb") as f:
+                    if f.read().rsplit(b")", 1)[-1].split()[0] == b"Z":
+                        return True
+            except ProcessLookupError:
+                return True
+            except OSError:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, 0.2)
+
+    def wait(self, timeout: float = None) -> bool:
         """
-        Left click on screen position (x, y).
+        Wait for every tracked process to exit.
 
         Parameters
         ----------
-        x : integer, optional.
-            Horizontal position to be clicked (default: None).
-            If None, use the current horizontal position.
-        y : integer, optional.
-            Vertical position to be clicked (default: None).
-            If None, use the current vertical position.
-        t : float, optional.
-            A time period in second between pressdown and pressup (default: 0).
+        timeout : float, optional.
+            Maximum seconds to wait (default: None, for ever).
 
         Returns
         -------
-        clickLeft : Tuple[int, int]
-            A tuple (x, y) representing the clicked position.
+        wait : bool.
+            Return True if every tracked process exited; otherwise, return False.
 
         """
-        if x == None and y == None:
-            x, y = win32api.GetCursorPos()
-        # win32api.SetCursorPos((x, y))
-        # time.sleep(0.1)
-        win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, x, y, 0, 0)
-        time.sleep(t)
-        win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, x, y, 0, 0)
-        return x, y
+        clock = Clock.get()
+        # One deadline by the current `Clock` is shared by the launched process and the processes it spawned
+        deadline = None if timeout is None else clock.now() + timeout
+        self.refresh()
+        try:
+            self.popen.wait(None if deadline is None else max(deadline - clock.now(), 0))
+        except subprocess.TimeoutExpired:
+            self.refresh()
+            return False
+        while True:
+            # The launched process may spawn others until it exits
+            pending = [pid for pid, _ in self.refresh() if pid != self.pid]
+            if not pending:
+                return True
+            for pid in pending:
+                remaining = 3600 * 24 if deadline is None else deadline - clock.now()
+                if not self._waitPid(pid, remaining):
+                    self.refresh()
+                    return False
 
-    @staticmethod
-    def clickRight(x: int = None, y: int = None, t: float = 0) -> Tuple[int, int]:
-        """
-        Right click on screen position (x, y).
+    def _signal(self, pid: int, force: bool) -> None:
+        if pid == self.pid and self.popen.poll() is not None:
+            return
+        try:
+            if sys.platform == "win32":
+                if force:
+                    kernel32 = ctypes.windll.kernel32
+                    handle = kernel32.OpenProcess(0x0001, False, pid)  # PROCESS_TERMINATE
+                    if handle:
+                        kernel32.TerminateProcess(handle, 1)
+                        kernel32.CloseHandle(handle)
+                else:
+                    # Ask the windows of the process to close, as taskkill without /F does
+                    subprocess.run(["taskkill", "/PID", str(pid)], capture_output=True)
+            else:
+                os.kill(pid, signal.SIGKILL if force else signal.SIGTERM)
+        except OSError:
+            pass
 
-        Parameters
-        ----------
-        x : integer, optional.
-            Horizontal position to be clicked (default: None).
-            If None, use the current horizontal position.
-        y : integer, optional.
-            Vertical position to be clicked (default: None).
-            If None, use the current vertical position.
-        t : float, optional.
-            A time period in second between pressdown and pressup (default: 0).
+    def terminate(self, grace: float = 10) -> Dict[str, Any]:
+        """
+        Terminate every tracked process: gracefully first, and forcibly after `grace` seconds.
 
         Returns
         -------
-        clickRight : Tuple[int, int]
-            A tuple (x, y) representing the clicked position.
+        terminate : Dict[str, Any].
+            The report of `ProcessManager.getReport()`.
 
         """
-        if x == None and y == None:
-            x, y = win32api.GetCursorPos()
-        # win32api.SetCursorPos((x, y))
-        # time.sleep(0.1)
-        win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTDOWN, x, y, 0, 0)
-        time.sleep(t)
-        win32api.mouse_event(win32con.MOUSEEVENTF_RIGHTUP, x, y, 0, 0)
-        return x, y
+        for pid, _ in self.refresh():
+            self._event("terminate", pid)
+            self._signal(pid, False)
+        if not self.wait(grace):
+            for pid, _ in self.refresh():
+                self._event("kill", pid)
+                self.forced.append(pid)
+                self._signal(pid, True)
+            self.wait(5)
+        # Nothing is left to watch, and the watcher must not keep listing processes
+        self.stopWatching()
+        return self.getReport()
 
-    @staticmethod
-    def move(dest_x: int, dest_y: int, start_x: int = None, start_y: int = None, duration: float = 0) -> Tuple[int, int]:
+    def getReport(self) -> Dict[str, Any]:
         """
-        Move the mouse from (start_x, start_y) to (dest_x, dest_y) in duration time.
+        Get the timeline from the launch to the exit.
+
+        Returns
+        -------
+        getReport : Dict[str, Any].
+            A dictionary with the following keys:
+                pid / file - the launched process.\\n
+                exitCode - the exit code of the launched process, or None if running.\\n
+                seconds - seconds from the launch to the exit of the last process, or None if any is running.\\n
+                forced - pids killed forcibly.\\n
+                processes - a list of {"pid", "name", "spawned", "exited"} in seconds from the launch.\\n
+                timeline - the events in order.
+
+        """
+        with self._lock:
+            processes = dict((pid, list(process)) for pid, process in self._processes.items())
+            timeline = list(self.timeline)
+        exits = [exited for _, _, exited in processes.values()]
+        return {
+            "pid": self.pid,
+            "file": self.file,
+            "exitCode": self.popen.poll(),
+            "seconds": None if None in exits else max(exits),
+            "forced": list(self.forced),
+            "processes": [{"pid": pid, "name": name, "spawned": spawned, "exited": exited}
+                          for pid, (name, spawned, exited) in processes.items()],
+            "timeline": timeline,
+        }
+
+
+################################################################################
+################################ ScreenObserver ################################
+################################################################################
+class ScreenObserver:
+    """
+    An observer of a screen region, telling loading screens and menus apart without blind waits.
+
+    Each capture of the current `ConditionProvider` is sampled and block-averaged into a small gray
+    fingerprint of `size` (default: 16 x 16) pixels. Two fingerprints differ by their mean absolute
+    difference scaled to [0, 1], and are the same if it is not above `threshold`, so noise and
+    compression never count as changes. A poll costs the capture by the `ConditionProvider` and well below
+    1 millisecond to fingerprint. With `SystemConditionProvider`, the capture by `pyautogui.screenshot()` dominates,
+    taking tens of milliseconds on Windows, as it grabs the whole screen before cropping the region, so polls
+    run at a few tens of Hz at most. Please measure it on the machine with dev-tools/bench_capture.py.
+
+    Reference fingerprints are saved by `ScreenObserver.saveReference()` into `ScreenObserver.ReferenceFile`,
+    per game, and compared by `ScreenObserver.matches()`.
+
+    Examples
+    --------
+    >>> menu = ScreenObserver((760, 400, 400, 300), game="Fallout 4")
+    >>> menu.saveReference("main menu")  # once, while the main menu is shown
+    >>> menu.matches("main menu")
+    True
+    """
+    ReferenceFile = '@ScreenReferences.json'
+
+    _References: Dict[str, Dict[str, Dict[str, Any]]] = None
+
+    def __init__(self, region: Tuple[int, int, int, int], game: str = "", size: Tuple[int, int] = (16, 16),
+                 threshold: float = 0.02) -> None:
+        """
+        Construct a ScreenObserver.
 
         Parameters
         ----------
-        @param:
-        dest_x : integer.
-            Horizontal position to move to.
-        dest_y : integer.
-            Vertical position to move to.
-        start_x : integer, optional.
-            Horizontal position to move from (default: None).
-            If None, use the current horizontal position.
-        start_y : integer, optional.
-            Horizontal position to move from (default: None).
-            If None, use the current horizontal position.
-        duration : float, optional.
-            A time period in second between pressdown and pressup (default: 0.5).
+        region : Tuple[int, int, int, int].
+            The screen region (left, top, width, height).
+        game : string, optional.
+            Name of the game the references are saved for (default: "").
+        size : Tuple[int, int], optional.
+            Width and height of fingerprints (default: (16, 16)).
+        threshold : float, optional.
+            Maximum difference of fingerprints of the same image, from 0 to 1 (default: 0.02).
+
+        Raises
+        ------
+        ImportError
+            If NumPy is not installed.
+
+        """
+        if np is None:
+            raise ImportError("ScreenObserver requires NumPy, please 'pip install numpy'")
+        self.region = tuple(int(v) for v in region)
+        self.game = game
+        self.size = tuple(size)
+        self.threshold = threshold
+        self.captures = 0
+        self._baseline = None
+        self._anchor = None
+        self._since = None
+
+    def capture(self) -> 'np.ndarray':
+        """
+        Capture the region, and return its fingerprint.
 
         Returns
         -------
-        move : Tuple[int, int]
-            A tuple (x, y) representing the final mouse position.
+        capture : np.ndarray.
+            The fingerprint, an array of `uint8` in shape (height, width) of `size`; or None if the region cannot be captured.
 
         """
-        if start_x == None:
-            start_x = win32api.GetCursorPos()[0]
-        if start_y == None:
-            start_y = win32api.GetCursorPos()[1]
-        win32api.SetCursorPos((start_x, start_y))
-        pag.moveTo(dest_x, dest_y, duration=duration, tween=pag.easeInOutQuad)
-        return dest_x, dest_y
+        frame = ConditionProvider.get().captureRegion(self.region)
+        self.captures += 1
+        if frame is None:
+            return None
+        return self.fingerprint(frame)
+
+    def fingerprint(self, frame: Any) -> 'np.ndarray':
+        """
+        Return the fingerprint of a frame of the region, which is an array in shape (height, width[, channels]),
+        or its raw bytes of 8-bit gray, RGB or RGBA pixels.
+        """
+        if isinstance(frame, (bytes, bytearray, memoryview)):
+            frame = self.toArray(frame, self.region[2], self.region[3])
+        frame = np.asarray(frame)
+        fw, fh = self.size
+        # Sample at most 4 pixels per fingerprint pixel on each side, before averaging
+        sy = max(frame.shape[0] // (fh * 4), 1)
+        sx = max(frame.shape[1] // (fw * 4), 1)
+        frame = frame[::sy, ::sx]
+        if frame.ndim == 3:
+            frame = frame[:, :, :3].mean(axis=2)
+        h = frame.shape[0] - frame.shape[0] % fh
+        w = frame.shape[1] - frame.shape[1] % fw
+        if h == 0 or w == 0:
+            # Smaller than the fingerprint, repeat pixels instead
+            rows = np.arange(fh) * frame.shape[0] // fh
+            cols = np.arange(fw) * frame.shape[1] // fw
+            return frame[rows][:, cols].astype(np.uint8)
+        blocks = frame[:h, :w].reshape(fh, h // fh, fw, w // fw)
+        return blocks.mean(axis=(1, 3)).astype(np.uint8)
 
     @staticmethod
-    def moveTo(dest_x: int, dest_y: int, duration: float = 0) -> Tuple[int, int]:
-        """
-        Move the mouse from current position to (dest_x, dest_y) in duration time.
+    def toArray(frame: bytes, width: int, height: int) -> 'np.ndarray':
+        """Return raw bytes of 8-bit gray, RGB or RGBA pixels as an array in shape (height, width, channels)."""
+        frame = np.frombuffer(frame, np.uint8)
+        channels = len(frame) // max(width * height, 1)
+        if channels and len(frame) == width * height * channels:
+            return frame.reshape(height, width, channels)
+        return frame.reshape(1, -1, 1)
 
-        Parameters
-        ----------
-        @param:
-        dest_x : integer.
-            Horizontal position to move to.
-        dest_y : integer.
-            Vertical position to move to.
-        duration : float, optional.
-            A time period in second between pressdown and pressup (default: 0.5).
+    @staticmethod
+    def difference(a: 'np.ndarray', b: 'np.ndarray') -> float:
+        """Return the mean absolute difference of two fingerprints, from 0 (same) to 1."""
+        if a is None or b is None or a.shape != b.shape:
+            return 1.0
+        return float(np.abs(a.astype(np.int16) - b).mean()) / 255
+
+    def reset(self) -> None:
+        """Forget the baseline of `ScreenObserver.changed()` and the history of `ScreenObserver.stable()`."""
+        self._baseline = self._anchor = self._since = None
+
+    def changed(self) -> bool:
+        """Capture the region, and return True if it differs from the first capture since the last reset."""
+        current = self.capture()
+        if current is None:
+            return False
+        if self._baseline is None:
+            self._baseline = current
+        return self.difference(current, self._baseline) > self.threshold
+
+    def stable(self, seconds: float) -> bool:
+        """Capture the region, and return True if it has not changed for `seconds` seconds."""
+        current = self.capture()
+        now = Clock.get().now()
+        if current is None:
+            self._anchor = self._since = None
+            return False
+        if self._anchor is None or self.difference(current, self._anchor) > self.threshold:
+            self._anchor, self._since = current, now
+            return False
+        return now - self._since >= seconds
 
-        Notes
-        -----
-        * This function utilize Input.Move(), please see more details in Input.Move().
-        * Parameters of this functions must fully satisfy Input.Move() specification.
+    @staticmethod
+    def _loadReferences() -> Dict[str, Dict[str, Dict[str, Any]]]:
+        if ScreenObserver._References is None:
+            try:
+                with open(ScreenObserver.ReferenceFile, 'r', encoding='utf-8') as f:
+                    ScreenObserver._References = json.load(f)
+            except (OSError, ValueError):
+                ScreenObserver._References = {}
+        return ScreenObserver._References
+
+    def saveReference(self, name: str) -> bool:
+        """
+        Capture the region, and save its fingerprint as reference `name` of the game.
 
         Returns
         -------
-        move : Tuple[int, int]
-            A tuple (x, y) representing the final mouse position.
+        saveReference : bool.
+            Return True if the region is captured and saved; otherwise, return False.
 
         """
-        start_x, start_y = win32api.GetCursorPos()
-        return Input.move(start_x, start_y, dest_x, dest_y, duration)
+        current = self.capture()
+        if current is None:
+            return False
+        references = self._loadReferences()
+        references.setdefault(self.game, {})[name] = {
+            "region": list(self.region),
+            "size": list(self.size),
+            "fingerprint": current.ravel().tolist(),
+        }
+        with open(ScreenObserver.ReferenceFile, 'w', encoding='utf-8') as f:
+            json.dump(references, f)
+        return True
 
-    @staticmethod
-    def getMouse(t: float = 0.5) -> None:
-        """
-        Get the mouse position and print in the console.
+    def getReference(self, name: str) -> 'np.ndarray':
+        """Return the saved fingerprint of reference `name` of the game, or None if not saved for this region and size."""
+        reference = self._loadReferences().get(self.game, {}).get(name)
+        if reference is None or tuple(reference["region"]) != self.region or tuple(reference["size"]) != self.size:
+            return None
+        return np.array(reference["fingerprint"], np.uint8).reshape(self.size[1], self.size[0])
 
-        Parameters
-        ----------
-        t : float, optional.
-            A time period in second to get the mouse position (default: 0.5).
+    def matches(self, name: str) -> bool:
+        """Capture the region, and return True if it is the same as reference `name` of the game."""
+        reference = self.getReference(name)
+        if reference is None:
+            return False
+        return self.difference(self.capture(), reference) <= self.threshold
 
-        Notes
-        -----
-        To end this function, please press Ctrl+C.
 
-        Examples
-        --------
-        The output format would be the following:
+class SyntheticFrameSource:
+    """
+    Synthetic frames of a game, for testing `ScreenObserver` and `Condition` without a screen.
 
-        >>> Input.logMouse()
-        Press Ctrl-C to end
-        Screen Size: (2560, 1440);  Mouse Position: (114, 514)
+    It shows a loading screen, whose spinner moves every frame, for `loadTime` seconds, and then a still menu.
+    Every frame has noise of `noise` levels, as video compression does. Add it to a `FakeConditionProvider`:
 
-        """
-        try:
-            while True:
-                print("Press Ctrl-C to end")
-                screenWidth, screenHeight = pag.size()  # 获取屏幕的尺寸
-                x, y = pag.position()  # 返回鼠标的坐标
-                print("Screen Size: (%s, %s);  Mouse Position: (%s, %s)\n" %
-                      (screenWidth, screenHeight, x, y))  # 打印坐标
+    >>> fake = FakeConditionProvider()
+    >>> fake.addFrames(None, SyntheticFrameSource(loadTime=25))
+    """
 
-                time.sleep(t)  # 每个1s中打印一次 , 并执行清屏
-                os.system('cls')  # 执行系统清屏指令
+    def __init__(self, loadTime: float = 10, noise: int = 2, seed: int = 0) -> None:
+        if np is None:
+            raise ImportError("SyntheticFrameSource requires NumPy, please 'pip install numpy'")
+        self.loadTime = loadTime
+        self.noise = noise
+        self._rng = np.random.default_rng(seed)
+
+    def __call__(self, elapsed: float, region: Tuple[int, int, int, int]) -> 'np.ndarray':
+        """Return the frame of the region at `elapsed` seconds, an array of `uint8` in shape (height, width, 3)."""
+        width, height = region[2], region[3]
+        ys, xs = np.mgrid[0:height, 0:width]
+        if elapsed < self.loadTime:
+            # Dark background with a bright spinner turning once a second
+            angle = 2 * math.pi * elapsed
+            cx = width / 2 + math.cos(angle) * width / 4
+            cy = height / 2 + math.sin(angle) * height / 4
+            frame = np.where((xs - cx) ** 2 + (ys - cy) ** 2 < (min(width, height) / 8) ** 2, 230, 20)
+        else:
+            # Menu: horizontal stripes of buttons on a gradient
+            frame = 60 + (xs * 100 // max(width, 1)) + np.where((ys * 8 // max(height, 1)) % 2 == 1, 80, 0)
+        frame = frame + self._rng.integers(-self.noise, self.noise + 1, frame.shape)
+        frame = np.clip(frame, 0, 255).astype(np.uint8)
+        return np.repeat(frame[:, :, None], 3, axis=2)
+
+
+################################################################################
+############################### TemplateMatcher ################################
+################################################################################
+class TemplateMatcher:
+    """
+    A locator of an image template on the screen, such as the START button of a launcher.
+
+    The screen and the template are matched coarse-to-fine on image pyramids, halved at each level: the whole
+    coarsest screen is searched by normalized cross-correlation, vectorized by NumPy, and the best candidates are
+    refined in a few pixels around them at each finer level. As a launcher is drawn larger under display scaling
+    than when its template was taken, the coarsest screen is searched with the template resized by each of
+    `scales`, and the candidates are refined at their scale. The location and scale found are cached per game
+    and screen resolution in `TemplateMatcher.CacheFile`, so later searches verify the cached location by one
+    correlation before searching the whole screen.
+
+    Examples
+    --------
+    >>> matcher = TemplateMatcher("templates/start.png")
+    >>> matcher.locate(game="Fallout 4")
+    {'found': True, 'x': 1650, 'y': 980, 'confidence': 0.97, 'scale': 1.25, 'seconds': 0.09, 'cached': False, 'resolution': (1920, 1080)}
+    """
+    CacheFile = '@TemplateCache.json'
 
-        except KeyboardInterrupt:
-            print('end')
+    _Cache: Dict[str, list] = None
 
-    @staticmethod
-    def logMouse(t: float = 0, clear: bool = True) -> None:
+    def __init__(self, template: Any, threshold: float = 0.8, levels: int = 3, candidates: int = 3,
+                 scales: Tuple[float, ...] = (0.75, 1, 1.25, 1.5)) -> None:
         """
-        Get the mouse position and print in the console only when the mouse position changes.
+        Construct a TemplateMatcher.
 
         Parameters
         ----------
-        t : float, optional.
-            A time period in second to get the mouse position (default: 0).
-        clear : bool, optional.
-            If True, the console will be cleared when the program is ended (default: True).
+        template : string | np.ndarray.
+            The template, as a path of an image (Pillow is required, except .npy files), or an array in shape
+            (height, width[, channels]).
+        threshold : float, optional.
+            Minimum confidence, the normalized cross-correlation from -1 to 1, of a match (default: 0.8).
+        levels : integer, optional.
+            Maximum levels of the pyramids (default: 3). Levels are fewer for small templates,
+            so the coarsest template is at least 8 pixels on each side.
+        candidates : integer, optional.
+            Candidates at the coarsest level refined to the finest level (default: 3).
+        scales : Tuple[float, ...], optional.
+            Sizes of the template on the screen relative to the template (default: (0.75, 1, 1.25, 1.5)),
+            such as the display scaling of the screen divided by the one the template was taken at.
+            Each scale adds a correlation of the coarsest screen.
+
+        Raises
+        ------
+        ImportError
+            If NumPy, or Pillow for an image file, is not installed.
+
+        """
+        if np is None:
+            raise ImportError("TemplateMatcher requires NumPy, please 'pip install numpy'")
+        if isinstance(template, str):
+            self.path = template
+            if template.lower().endswith(".npy"):
+                template = np.load(template)
+            elif Image is None:
+                raise ImportError("TemplateMatcher requires Pillow to read %s, please 'pip install pillow'" % template)
+            else:
+                template = np.asarray(Image.open(template).convert("L"))
+        else:
+            self.path = None
+        self.template = self.toGray(template)
+        self.threshold = threshold
+        self.candidates = candidates
+        self.scales = tuple(float(scale) for scale in scales)
+        side = max(min(self.template.shape), 1)
+        # The smallest scale may leave fewer pixels at the coarsest level, but at least 4 on each side
+        self.levels = max(min(levels, int(math.log2(side / 8)) + 1,
+                              int(math.log2(max(side * min(self.scales), 1) / 4)) + 1), 1)
+        self._templates = {scale: self.pyramid(self.resize(self.template, scale), self.levels)
+                           for scale in self.scales}
+        self._report: Dict[str, Any] = None
 
-        Notes
-        -----
-        To end this function, please press Ctrl+C.
+    @staticmethod
+    def toGray(frame: Any, width: int = None, height: int = None) -> 'np.ndarray':
+        """Return a frame as a gray `float32` array in shape (height, width); raw bytes need their width and height."""
+        if isinstance(frame, (bytes, bytearray, memoryview)):
+            if width is None or height is None:
+                raise ValueError("A frame of raw bytes requires its width and height")
+            frame = ScreenObserver.toArray(frame, width, height)
+        frame = np.asarray(frame, np.float32)
+        if frame.ndim == 3:
+            frame = frame[:, :, :3].mean(axis=2)
+        return frame
 
-        Examples
-        --------
-        The output format would be the following:
+    @staticmethod
+    def resize(image: 'np.ndarray', scale: float) -> 'np.ndarray':
+        """Return the gray image resized by `scale` with bilinear interpolation."""
+        if scale == 1:
+            return image
+        h, w = image.shape
+        axes = []
+        for size in (h, w):
+            coords = np.clip((np.arange(max(int(round(size * scale)), 1)) + 0.5) / scale - 0.5, 0, size - 1)
+            low = np.floor(coords).astype(np.intp)
+            axes.append((low, np.minimum(low + 1, size - 1), (coords - low).astype(np.float32)))
+        (y0, y1, fy), (x0, x1, fx) = axes
+        top = image[y0][:, x0] * (1 - fx) + image[y0][:, x1] * fx
+        bottom = image[y1][:, x0] * (1 - fx) + image[y1][:, x1] * fx
+        return top * (1 - fy)[:, None] + bottom * fy[:, None]
 
-        >>> Input.logMouse()
-        Screen Size: (2560, 1440);  Mouse Position: (114, 514)
+    @staticmethod
+    def pyramid(image: 'np.ndarray', levels: int) -> List['np.ndarray']:
+        """Return the image followed by its halves, `levels` images in total."""
+        images = [image]
+        for _ in range(levels - 1):
+            last = images[-1]
+            h, w = last.shape[0] // 2 * 2, last.shape[1] // 2 * 2
+            images.append(last[:h, :w].reshape(h // 2, 2, w // 2, 2).mean(axis=(1, 3)))
+        return images
 
+    @staticmethod
+    def correlate(image: 'np.ndarray', template: 'np.ndarray') -> 'np.ndarray':
         """
-        try:
-            x, y = pag.position()  # 返回鼠标的坐标
-            while True:
-                screenWidth, screenHeight = pag.size()  # 获取屏幕的尺寸
-                xNew, yNew = pag.position()  # 返回鼠标的坐标
-                if xNew != x and yNew != y:
-                    print("Screen Size: (%s, %s);  Mouse Position :(%s, %s)\n" %
-                          (screenWidth, screenHeight, x, y))  # 打印坐标
-                    x, y = (xNew, yNew)
+        Return the normalized cross-correlation of the template at every position of the image.
 
-        except KeyboardInterrupt:
-            if clear:
-                os.system('cls')  # 执行系统清屏指令
-            print('end')
+        Returns
+        -------
+        correlate : np.ndarray.
+            Confidences from -1 to 1 in shape (H - h + 1, W - w + 1), where the template is at top-left (x, y) of
+            [y, x]; flat areas have 0.
+
+        """
+        h, w = template.shape
+        if image.shape[0] < h or image.shape[1] < w:
+            return np.zeros((0, 0), np.float32)
+        image = image.astype(np.float64)
+        tz = template - template.mean()
+        tnorm = np.sqrt((tz * tz).sum())
+        # Sums of window pixels from integral images, so window means and norms are computed once
+        ii = np.pad(image.cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+        ii2 = np.pad((image * image).cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+        s = ii[h:, w:] - ii[:-h, w:] - ii[h:, :-w] + ii[:-h, :-w]
+        s2 = ii2[h:, w:] - ii2[:-h, w:] - ii2[h:, :-w] + ii2[:-h, :-w]
+        norm = np.sqrt(np.maximum(s2 - s * s / (h * w), 0)) * tnorm
+        windows = np.lib.stride_tricks.sliding_window_view(image, (h, w))
+        numerator = np.einsum('ijkl,kl->ij', windows, tz)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(norm > 1e-6 * max(tnorm, 1), numerator / norm, 0).astype(np.float32)
+
+    def getTemplate(self, scale: float = 1) -> 'np.ndarray':
+        """Return the gray template resized by a scale of `scales`."""
+        return self._templates[scale][0] if scale in self._templates else self.resize(self.template, scale)
+
+    def score(self, image: 'np.ndarray', x: int, y: int, scale: float = 1) -> float:
+        """
+        Return the confidence of the template resized by `scale` at top-left (x, y) of the gray image,
+        or -1 if it is out of the image.
+        """
+        template = self.getTemplate(scale)
+        h, w = template.shape
+        if x < 0 or y < 0 or y + h > image.shape[0] or x + w > image.shape[1]:
+            return -1.0
+        return float(self.correlate(image[y:y + h, x:x + w], template)[0, 0])
+
+    def search(self, image: 'np.ndarray') -> Tuple[int, int, float, float]:
+        """
+        Search the gray image coarse-to-fine at every scale, and return the top-left (x, y), the confidence and
+        the scale of the best match.
+        """
+        images = self.pyramid(image, self.levels)
+        candidates = []
+        for scale, templates in self._templates.items():
+            scores = self.correlate(images[-1], templates[-1])
+            if not scores.size:
+                continue
+            count = min(self.candidates, scores.size)
+            for flat in np.argpartition(scores.ravel(), -count)[-count:]:
+                y, x = divmod(int(flat), scores.shape[1])
+                candidates.append((float(scores[y, x]), x, y, scale))
+        # Only the best candidates of all scales are refined
+        candidates.sort(reverse=True)
+        best = (0, 0, -1.0, 1.0)
+        for confidence, x, y, scale in candidates[:self.candidates]:
+            for level in range(self.levels - 2, -1, -1):
+                # Refine around the position doubled, within 2 pixels
+                template = self._templates[scale][level]
+                h, w = template.shape
+                x0, y0 = max(x * 2 - 2, 0), max(y * 2 - 2, 0)
+                local = self.correlate(images[level][y0:y0 + h + 4, x0:x0 + w + 4], template)
+                if not local.size:
+                    break
+                dy, dx = np.unravel_index(int(np.argmax(local)), local.shape)
+                x, y, confidence = x0 + int(dx), y0 + int(dy), float(local[dy, dx])
+            if confidence > best[2]:
+                best = (x, y, confidence, scale)
+        return best
 
     @staticmethod
-    def callTinyTask(file: str) -> int:
+    def _loadCache() -> Dict[str, list]:
+        if TemplateMatcher._Cache is None:
+            try:
+                with open(TemplateMatcher.CacheFile, 'r', encoding='utf-8') as f:
+                    TemplateMatcher._Cache = json.load(f)
+            except (OSError, ValueError):
+                TemplateMatcher._Cache = {}
+        return TemplateMatcher._Cache
+
+    def locate(self, screen: Any = None, game: str = "", useCache: bool = True,
+               size: Tuple[int, int] = None) -> Dict[str, Any]:
         """
-        Calling the .exe file made by TinyTask under the current working directory.
+        Locate the template on the screen.
 
         Parameters
         ----------
-        file : string.
-            A TinyTask File Name to be performed.
+        screen : np.ndarray | bytes, optional.
+            The screen in shape (height, width[, channels]), or raw bytes of pixels with `size` (default: None, captured by
+            the current `ConditionProvider` at the size of `InputBackend.getScreenSize()`).
+        game : string, optional.
+            Name of the game the location is cached for (default: "").
+        useCache : bool, optional.
+            Verify and save the cached location (default: True).
+        size : Tuple[int, int], optional.
+            The (width, height) of a screen of raw bytes (default: None).
 
         Returns
         -------
-        callTinyTask : integer.
-            If 0, something went wrong in calling TinyTask file; otherwise, succeed with a non-0 code.
+        locate : Dict[str, Any].
+            A dictionary with the following keys, also returned by `TemplateMatcher.getReport()`:
+                found - whether the confidence is at least the threshold.\\n
+                x / y - the center of the best match on the screen.\\n
+                confidence - the confidence of the best match.\\n
+                scale - the scale of `scales` of the best match.\\n
+                seconds - seconds to match, excluding the capture.\\n
+                cached - whether the match is the cached location.\\n
+                resolution - the (width, height) of the screen.
+
+        Raises
+        ------
+        ValueError
+            If the screen cannot be captured, or a screen of raw bytes is given without `size`.
+
+        """
+        width, height = (None, None) if size is None else size
+        if screen is None:
+            width, height = InputBackend.get().getScreenSize()
+            screen = ConditionProvider.get().captureRegion((0, 0, width, height))
+            if screen is None:
+                raise ValueError("The screen cannot be captured by %s" % type(ConditionProvider.get()).__name__)
+        before = time.perf_counter()
+        if isinstance(screen, (bytes, bytearray, memoryview)):
+            if width is None or height is None:
+                raise ValueError("A screen of raw bytes requires its size (width, height)")
+            screen = ScreenObserver.toArray(screen, width, height)
+        screen = np.asarray(screen)
+        resolution = (screen.shape[1], screen.shape[0])
+        key = "%s|%sx%s|%s" % (game, resolution[0], resolution[1], self.path or "")
+        cached = False
+        location = self._loadCache().get(key) if useCache else None
+        if location is not None:
+            # Only the cached location is converted to gray; locations cached before scales have none
+            scale = float(location[2]) if len(location) > 2 else 1.0
+            h, w = self.getTemplate(scale).shape
+            x, y = location[0] - w // 2, location[1] - h // 2
+            confidence = -1.0
+            if 0 <= x and 0 <= y and y + h <= resolution[1] and x + w <= resolution[0]:
+                confidence = self.score(self.toGray(screen[y:y + h, x:x + w]), 0, 0, scale)
+            cached = confidence >= self.threshold
+        if not cached:
+            x, y, confidence, scale = self.search(self.toGray(screen))
+            h, w = self.getTemplate(scale).shape
+        found = confidence >= self.threshold
+        if found and useCache and not cached:
+            self._loadCache()[key] = [x + w // 2, y + h // 2, scale]
+            with open(TemplateMatcher.CacheFile, 'w', encoding='utf-8') as f:
+                json.dump(TemplateMatcher._Cache, f)
+        self._report = {
+            "found": found,
+            "x": x + w // 2,
+            "y": y + h // 2,
+            "confidence": confidence,
+            "scale": scale,
+            "seconds": time.perf_counter() - before,
+            "cached": cached,
+            "resolution": resolution,
+        }
+        return self._report
+
+    def getReport(self) -> Dict[str, Any]:
+        """Return the report of the last `TemplateMatcher.locate()`, or None."""
+        return self._report
 
-        Examples
-        --------
-        Directly calling a TinyTask file under the current working directory.
 
-        >>> Input.callTinyTask("Test.exe")
+################################################################################
+################################## ActionPlan ##################################
+################################################################################
+class ActionPlan:
+    """
+    An immutable plan of start-up or quit actions, compiled once from an action list of `Game`.
 
-        Calling a TinyTask file in a folder under the current working directory.
+    Each action is validated, its target parsed (key codes and clicks into `InputBatch`, coordinates into
+    integers, TinyTask files into registered macros of `MacroPlayer`, conditions into tuples of `Condition`),
+    and bound into a callable, so running the plan just iterates its steps. A "t" action played as a macro takes
+    `duration` seconds as a TinyTask file does, or the length of the macro if longer.
+    Each step is a tuple (index, actionType, target, duration, call, label).
+    """
+    ACTION_TYPES = ("w", "k", "ks", "cl", "cr", "mv", "t", "s", "u")
+    SPECIALS = ("key_alt_tab", "key_alt_f4")
 
-        >>> Input.callTinyTask("foo/Test.exe")
+    def __init__(self, steps: Tuple[tuple, ...], duration: float) -> None:
+        self._steps = steps
+        self._duration = duration
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self._steps)
+
+    @property
+    def steps(self) -> Tuple[tuple, ...]:
+        """The compiled steps."""
+        return self._steps
+
+    @property
+    def duration(self) -> float:
+        """The total planned seconds of the plan, precomputed for scheduling. "u" actions count their timeouts."""
+        return self._duration
+
+    @staticmethod
+    def _wait(duration: float) -> float:
+        Logger.CountProgress(duration, log="Waiting", consoleColor=ConsoleColor.DarkGray)
+        return duration
+
+    @staticmethod
+    def _send(batch: InputBatch, result: int, wait: float = 0) -> int:
+        InputBackend.get().sendBatch(batch)
+        if wait:
+            Clock.get().sleep(wait)
+        return result
+
+    @staticmethod
+    def _move(x: int, y: int, duration: float) -> int:
+        return sum(Input.moveTo(x, y, duration))
+
+    @staticmethod
+    def _macro(batch: InputBatch, duration: float) -> int:
+        # A TinyTask file runs alongside the wait of `duration`, so the macro is played within it
+        clock = Clock.get()
+        start = clock.now()
+        InputBackend.get().sendBatch(batch, start)
+        remaining = start + duration - clock.now()
+        if remaining > 0:
+            clock.sleep(remaining)
+        return len(batch)
+
+    @staticmethod
+    def _tinyTask(file: str, duration: float) -> int:
+        resCode = Input.callTinyTask(file)
+        Clock.get().sleep(duration)
+        return resCode
+
+    @staticmethod
+    def _until(condition: tuple, timeout: float) -> int:
+        return int(Condition.wait(condition, timeout)["met"])
+
+    @staticmethod
+    def _position(index: int, tar: Any) -> Tuple[int, int]:
+        if not isinstance(tar, (tuple, list)) or len(tar) != 2 or \
+                not all(isinstance(v, (int, float)) for v in tar):
+            raise ValueError("Action %s: Invalid Target %r, expected (x, y)" % (index, tar))
+        return int(tar[0]), int(tar[1])
 
+    @staticmethod
+    def compile(actions: List[List[Any]]) -> 'ActionPlan':
         """
-        return win32api.ShellExecute(1, 'open', os.path.join(os.getcwd(), file), '', '', 1)
+        Compile an action list, please see the action format in `Game.setStartActions()`.
+
+        Returns
+        -------
+        compile : ActionPlan.
+            The compiled plan.
+
+        Raises
+        ------
+        ValueError
+            If an action is invalid, with the index of the action.
+
+        """
+        if actions is None:
+            raise ValueError("Action list is None")
+        steps = []
+        total = 0
+        for index, action in enumerate(actions):
+            if not isinstance(action, (list, tuple)) or len(action) != 3:
+                raise ValueError("Action %s: Invalid Action %r, expected [type, target, duration]" % (index, action))
+            actionType, tar, duration = action
+            if not isinstance(actionType, str) or actionType.lower() not in ActionPlan.ACTION_TYPES:
+                raise ValueError("Action %s: Invalid ActionType %r" % (index, actionType))
+            actionType = actionType.lower()
+            if not isinstance(duration, (int, float)) or duration < 0:
+                raise ValueError("Action %s: Invalid Duration %r" % (index, duration))
+
+            if actionType == "w":
+                # w - Wait
+                call = functools.partial(ActionPlan._wait, duration)
+                planned = duration
+            elif actionType == "k":
+                # k - Single key
+                batch = InputBatch.fromKey(tar, duration) if isinstance(tar, str) else InputBatch()
+                if not len(batch):
+                    raise ValueError("Action %s: Invalid Key %r" % (index, tar))
+                call = functools.partial(ActionPlan._send, batch, 1)
+                planned = batch.getDuration()
+            elif actionType == "ks":
+                # ks - Multiple keys, same as `Input.key_inputs()`
+                if not isinstance(tar, str):
+                    raise ValueError("Action %s: Invalid Keys %r" % (index, tar))
+                batch = InputBatch.fromString(tar, duration)
+                wait = 0.5 if tar else 0
+                call = functools.partial(ActionPlan._send, batch, len(batch), wait)
+                planned = batch.getDuration() + wait
+            elif actionType in ("cl", "cr"):
+                # cl / cr - Left-Click / Right-Click
+                x, y = ActionPlan._position(index, tar)
+                batch = InputBatch.click("left" if actionType == "cl" else "right", duration)
+                call = functools.partial(ActionPlan._send, batch, x + y)
+                planned = batch.getDuration()
+            elif actionType == "mv":
+                # mv - Move mouse position
+                x, y = ActionPlan._position(index, tar)
+                call = functools.partial(ActionPlan._move, x, y, duration)
+                planned = duration
+            elif actionType == "t":
+                # t - Registered macro, or TinyTask file
+                if not isinstance(tar, str):
+                    raise ValueError("Action %s: Invalid TinyTask %r" % (index, tar))
+                if MacroPlayer.has(tar):
+                    batch = MacroPlayer.get(tar)
+                    call = functools.partial(ActionPlan._macro, batch, duration)
+                    planned = max(batch.getDuration(), duration)
+                else:
+                    call = functools.partial(ActionPlan._tinyTask, tar, duration)
+                    planned = duration
+            elif actionType == "u":
+                # u - Wait until a condition holds, or the timeout
+                try:
+                    condition = Condition.parse(tar)
+                except ValueError as e:
+                    raise ValueError("Action %s: %s" % (index, e))
+                call = functools.partial(ActionPlan._until, condition, duration)
+                planned = duration
+            else:
+                # s - Special Function in Input Class
+                if tar not in ActionPlan.SPECIALS:
+                    raise ValueError("Action %s: Invalid Special %r, expected one of %s" % (
+                        index, tar, ActionPlan.SPECIALS))
+                if tar == "key_alt_tab":
+                    batch = InputBatch.chord(["alt", "tab"], duration)
+                else:
+                    hold = float('%.1f' % (duration / 3))
+                    batch = InputBatch.chord(["alt", "F4"], hold, stagger=hold)
+                call = functools.partial(ActionPlan._send, batch, duration)
+                planned = batch.getDuration()
+
+            label = 'Performing Action %s %s : At %s in %s seconds' % (index, actionType, tar, duration)
+            steps.append((index, actionType, tar, duration, call, label))
+            total += planned
+        return ActionPlan(tuple(steps), total)
 
 
 ################################################################################
@@ -1712,11 +7457,22 @@ class Game:
 
         self.LauncherWaitTime: float = 15
         self.launchParam: str = ""
+        self.templateMatcher: TemplateMatcher = None
+        self.launcherReadiness: tuple = None
+        self.gameReadiness: tuple = None
+        self.readinessPolling: Tuple[float, float, float] = (0.25, 1.5, 2)
+        self.launchReport: Dict[str, Any] = None
+        self.process: ProcessManager = None
 
         self._START_ACTIONS = None
         self._QUIT_ACTIONS = None
+        self._START_PLAN: ActionPlan = None
+        self._QUIT_PLAN: ActionPlan = None
 
         self.BenchmarkingTime = BenchmarkingTime
+        self.BenchmarkingSeed: int = None
+        self.BenchmarkingRecording: str = None
+        self.benchmarkReport: Dict[str, Any] = None
 
     ################################ Base Info #################################
     def setGameName(self, name: str) -> None:
@@ -1775,6 +7531,57 @@ class Game:
         """
         return self.BenchmarkingTime
 
+    def setBenchmarkSeed(self, seed: int = None) -> None:
+        """
+        Set the seed of the random Benchmarking action schedule.
+
+        Paremeters
+        ----------
+        seed : int, optional.
+            The seed, so that every machine receives the same input workload;
+            None to use a new random seed for each run (default: None).
+            The seed in use is recorded in `Game.getBenchmarkReport()`.
+
+        """
+        self.BenchmarkingSeed = seed
+
+    def getBenchmarkSeed(self) -> int:
+        """
+        Get the seed of the random Benchmarking action schedule.
+
+        Returns
+        -------
+        getBenchmarkSeed : int.
+            The seed, or None if a new random seed is used for each run.
+
+        """
+        return self.BenchmarkingSeed
+
+    def setBenchmarkRecording(self, path: str = None) -> None:
+        """
+        Set a recording of real play to be replayed in place of the random actions of Random Control Test (mode 2).
+
+        Paremeters
+        ----------
+        path : string, optional.
+            Path of a recording file made by `MacroRecorder`, or None to perform random actions (default: None).
+            The recording is played repeatedly until the Benchmarking Time, please see more in `Benchmarking.ReplayTest()`.
+
+        """
+        self.BenchmarkingRecording = path
+
+    def getBenchmarkRecording(self) -> str:
+        """
+        Get the recording replayed in place of the random actions of Random Control Test.
+
+        Returns
+        -------
+        getBenchmarkRecording : str.
+            Path of the recording file, or None if random actions are performed.
+
+        """
+        return self.BenchmarkingRecording
+
     def setSteamDirectory(self, dir: str) -> None:
         """
         Set the Steam directory.
@@ -2047,13 +7854,13 @@ class Game:
         return self.exePath
 
     ################################# Launcher #################################
-    def setLauncherMode(self, mode: Literal[0, 1, 2, 3]) -> None:
+    def setLauncherMode(self, mode: Literal[0, 1, 2, 3, 4]) -> None:
         """
         Set the Launcher Operation Mode.
 
         Parameters
         ----------
-        mod : Literal[0, 1, 2, 3]
+        mod : Literal[0, 1, 2, 3, 4]
             Set the Launcher Operation Mode, where:
                 0 - There is no launcher.\n
                 1 - There is a launcher, and UIAutomation is supported.
@@ -2062,6 +7869,8 @@ class Game:
                 `Game.setLauncher()` is required (see more in Notes section).\n
                 3 - There is a launcher, and TinyTask can be utilized.
                 `Game.setLauncher()` is required (see more in Notes section).\n
+                4 - There is a launcher, and its START button is located by an image template.
+                `Game.setLauncher()` is required (see more in Notes section).\n
 
         Notes
         -----
@@ -2094,16 +7903,22 @@ class Game:
                 otherwise, it may fail to click on the START button.
             `Game.setLauncher()` MUST be called.
 
+        For mode 4, Template matching:
+            When there is a launcher, and the START button may move with the layout, resolution or DPI.
+            The button is found by a picture of it with `TemplateMatcher`, and then left-clicked.
+            The location found is cached per resolution, so later loops only verify it.
+            `Game.setLauncher()` MUST be called.
+
         """
         self.launcherMode = mode
 
-    def getLauncherMode(self) -> Literal[0, 1, 2, 3]:
+    def getLauncherMode(self) -> Literal[0, 1, 2, 3, 4]:
         """
         Get the Launcher Operation Mode.
 
         Returns
         -------
-        getLauncherMode : Literal[0, 1, 2, 3].
+        getLauncherMode : Literal[0, 1, 2, 3, 4].
             An integer representing the Launcher Operation Mode, where:
                 0 - There is no launcher.\n
                 1 - There is a launcher, and UIAutomation is supported.
@@ -2112,6 +7927,8 @@ class Game:
                 `Game.setLauncher()` is required (see more in Notes section).\n
                 3 - There is a launcher, and TinyTask can be utilized.
                 `Game.setLauncher()` is required (see more in Notes section).\n
+                4 - There is a launcher, and its START button is located by an image template.
+                `Game.setLauncher()` is required (see more in Notes section).\n
 
         Notes
         -----
@@ -2144,6 +7961,12 @@ class Game:
                 otherwise, it may fail to click on the START button.
             `Game.setLauncher()` MUST be called.
 
+        For mode 4, Template matching:
+            When there is a launcher, and the START button may move with the layout, resolution or DPI.
+            The button is found by a picture of it with `TemplateMatcher`, and then left-clicked.
+            The location found is cached per resolution, so later loops only verify it.
+            `Game.setLauncher()` MUST be called.
+
         """
         return self.launcherMode
 
@@ -2151,7 +7974,8 @@ class Game:
                     uiAppControlType: Literal["PaneControl", "WindowControl", "ImageControl", "ButtonControl", "CustomControl"] = None, uiAppName: str = '',
                     uiStartControlType: Literal["PaneControl", "WindowControl", "ImageControl", "ButtonControl", "CustomControl"] = None, uiStartIndex: int = None, uiStartName: str = '',
                     clickPos: tuple = None,
-                    TinyTaskName: str = None) -> None:
+                    TinyTaskName: str = None,
+                    templateImage: str = None, templateThreshold: float = 0.8) -> None:
         """
         Set the Launcher Operation.
 
@@ -2159,6 +7983,7 @@ class Game:
         ----------
         waitTime : float, optional.
             Time to wait for the launcher to be fully started (default: 20).
+            With a condition of the launcher being ready, it is the maximum time, please see `Game.setReadiness()`.
         uiAppControlType : ["PaneControl", "WindowControl", "ImageControl", "ButtonControl", "CustomControl"], optional.
             The ControlType of the Launcher Window (default: None).
             Must be setted if in Launcher Mode 1.
@@ -2180,6 +8005,12 @@ class Game:
         TinyTaskName : string, optional.
             A TinyTask File Name to be performed (default: None).
             Must be setted if in Launcher Mode 3.
+        templateImage : string, optional.
+            A picture file of the Start Button (default: None).
+            Must be setted if in Launcher Mode 4.
+        templateThreshold : float, optional.
+            Minimum confidence from -1 to 1 to find the Start Button (default: 0.8).
+            Only effective in Launcher Mode 4.
 
         Examples
         --------
@@ -2211,6 +8042,14 @@ class Game:
 
         Where the operation will wait for 60 second. Then, call the tiny task test.exe under folder "tinytask".
 
+        For Launcher Mode 4 (`Game.getLauncherMode()` returns 4):
+
+        We can find and click the Start Button by its picture with the following code:
+
+        >>> f4.setLauncher(waitTime=20, templateImage="templates/f4_start.png")
+
+        Where the operation will wait for 20 second. Then, click at the center of the Start Button found on the screen.
+
         """
         self.LauncherWaitTime = waitTime
         if not self.hasLauncher():
@@ -2241,6 +8080,17 @@ class Game:
                     'GAME() ERROR %s: TinyTaskName should not be None.' % self.getGameName(), ConsoleColor.Red)
                 return
             self.TinyTaskName: str = TinyTaskName
+        elif self.getLauncherMode() == 4:
+            # 4 - locate by template
+            if templateImage is None:
+                Logger.WriteLine(
+                    'GAME() ERROR %s: templateImage should not be None.' % self.getGameName(), ConsoleColor.Red)
+                return
+            try:
+                self.templateMatcher = TemplateMatcher(templateImage, templateThreshold)
+            except (ImportError, OSError, ValueError) as e:
+                Logger.WriteLine(
+                    'GAME() ERROR %s: templateImage %s cannot be loaded: %s' % (self.getGameName(), templateImage, e), ConsoleColor.Red)
 
     def hasLauncher(self) -> bool:
         """
@@ -2252,7 +8102,7 @@ class Game:
             Return True if this Game has a launcher; otherwise, return False.
 
         """
-        return self.getLauncherMode() > 0 and self.getLauncherMode() <= 3
+        return self.getLauncherMode() > 0 and self.getLauncherMode() <= 4
 
     ################################## Launch ##################################
     def checkLaunch(self) -> bool:
@@ -2318,6 +8168,12 @@ class Game:
                     Logger.WriteLine(
                         'GAME() ERROR %s: TinyTaskName should not be None.' % self.getGameName(), ConsoleColor.Red)
                     return False
+            # Locating by template
+            elif self.getLauncherMode() == 4:
+                if self.templateMatcher is None:
+                    Logger.WriteLine(
+                        'GAME() ERROR %s: templateImage should not be None.' % self.getGameName(), ConsoleColor.Red)
+                    return False
 
         return True
 
@@ -2333,16 +8189,179 @@ class Game:
         """
         self.launchParam = param
 
+    def setReadiness(self, launcher: tuple = None, game: tuple = None,
+                     interval: float = 0.25, backoff: float = 1.5, maxInterval: float = 2) -> None:
+        """
+        Set the conditions telling the launcher and the game are ready, so `Game.launch()` proceeds as soon as they hold.
+
+        Parameters
+        ----------
+        launcher : tuple, optional.
+            The condition of the launcher (default: None). In Launcher Mode 1, the default is the launcher window with
+            its START button, ("control", uiAppControlType, uiAppName, uiStartControlType, uiStartIndex, uiStartName);
+            otherwise, the default waits the whole launcher wait time.
+        game : tuple, optional.
+            The condition of the game, such as ("process", "Fallout4.exe") or ("window", "Fallout4") (default: None).
+            With a launcher, the default is a new process spawned in the tree of the launched process,
+            ("spawned", pid), please see more in `Game.getGameReadiness()`; otherwise, the default waits the whole
+            game wait time.
+        interval : float, optional.
+            Seconds of the first poll interval (default: 0.25).
+        backoff : float, optional.
+            Factor the interval is multiplied by after each poll (default: 1.5).
+        maxInterval : float, optional.
+            Maximum seconds between polls (default: 2).
+
+        Notes
+        -----
+        Please see conditions in `Condition`. The launcher wait time (`Game.setLauncher()`) and the game wait time
+        (`Game.launch()`) become the maximum time to wait for each condition.
+
+        Examples
+        --------
+        >>> f4.setReadiness(game=("window", "Fallout4"))
+
+        """
+        try:
+            self.launcherReadiness = None if launcher is None else Condition.parse(launcher)
+            self.gameReadiness = None if game is None else Condition.parse(game)
+        except ValueError as e:
+            Logger.WriteLine('GAME() ERROR %s: %s' % (self.getGameName(), e), ConsoleColor.Red)
+            return
+        self.readinessPolling = (interval, backoff, maxInterval)
+
+    def getLauncherReadiness(self) -> tuple:
+        """
+        Get the condition of the launcher being ready.
+
+        Returns
+        -------
+        getLauncherReadiness : tuple.
+            The condition set by `Game.setReadiness()`, or the default of the Launcher Mode; None if there is no condition.
+
+        """
+        if self.launcherReadiness is not None:
+            return self.launcherReadiness
+        if self.getLauncherMode() == 1 and getattr(self, "uiAppControlType", None) in InputBackend.CONTROL_TYPES:
+            # The launcher window is often shown before its START button can be clicked
+            if getattr(self, "uiStartControlType", None) in InputBackend.CONTROL_TYPES:
+                return ("control", self.uiAppControlType, self.uiAppName,
+                        self.uiStartControlType, self.uiStartIndex, self.uiStartName)
+            return ("control", self.uiAppControlType, self.uiAppName)
+        return None
+
+    def getGameReadiness(self) -> tuple:
+        """
+        Get the condition of the game being ready.
+
+        Returns
+        -------
+        getGameReadiness : tuple.
+            The condition set by `Game.setReadiness()`. Otherwise, if there is a launcher and the launched process is
+            tracked, a process spawned by the launcher after the START button is clicked, ("spawned", pid);
+            None if there is no condition.
+
+        """
+        if self.gameReadiness is not None:
+            return self.gameReadiness
+        if self.hasLauncher() and self.process is not None:
+            return ("spawned", self.process.pid)
+        return None
+
+    def getLaunchReport(self) -> Dict[str, Any]:
+        """
+        Get the report of the last launch.
+
+        Returns
+        -------
+        getLaunchReport : Dict[str, Any].
+            None if not launched; otherwise, a dictionary with the following keys:
+                launcher / game - seconds from launching the executor to the launcher / the game being ready,
+                or the end of the wait time; None if there is no launcher.\n
+                launcherReady / gameReady - whether the condition held, or None if there is no condition.
+
+        """
+        return self.launchReport
+
+    def getProcess(self) -> ProcessManager:
+        """
+        Get the process of the last launch.
+
+        Returns
+        -------
+        getProcess : ProcessManager.
+            The launched process tracked with its children, or None if the backend cannot start tracked processes.
+
+        """
+        return self.process
+
+    def terminate(self, grace: float = 10) -> Dict[str, Any]:
+        """
+        Terminate the launched process and every process it spawned: gracefully first, and forcibly after `grace` seconds.
+
+        Returns
+        -------
+        terminate : Dict[str, Any].
+            The launch-to-exit timeline of `ProcessManager.getReport()`; or None if the process is not tracked,
+            where the executor is killed by its name instead. The executor is also killed by its name if no process
+            of it was ever tracked, such as a game relaunched by Steam outside the tree.
+
+        """
+        if self.process is None:
+            killProgress(self.getExecutor())
+            return None
+        report = self.process.terminate(grace)
+        if not self.process.tracked(self.getExecutor()):
+            killProgress(self.getExecutor())
+        Logger.WriteLine('%s exited in %.2f seconds after launch%s' % (
+            self.getGameName(), report["seconds"] or 0,
+            ', forcibly killed %s' % report["forced"] if report["forced"] else ''), ConsoleColor.Gray)
+        return report
+
+    def _waitReady(self, stage: str, condition: tuple, maximum: float, launchStart: float) -> None:
+        """Wait for a stage of launching to be ready, for at most `maximum` seconds, and report it."""
+        met = None
+        if condition is None:
+            Logger.WriteLine(
+                'waiting %s seconds for %s to start......' % (maximum, stage), ConsoleColor.Gray)
+            Logger.CountProgress(maximum)
+        else:
+            Logger.WriteLine(
+                'waiting at most %s seconds for %s to be ready......' % (maximum, stage), ConsoleColor.Gray)
+            interval, backoff, maxInterval = self.readinessPolling
+            met = Condition.wait(condition, maximum, interval, backoff, maxInterval)["met"]
+        elapsed = Clock.get().now() - launchStart
+        if met is not None:
+            Logger.WriteLine('%s is ready in %.2f seconds' % (stage, elapsed) if met else
+                             'GAME() WARNING %s: %s is not ready in %s seconds, continuing' % (
+                                 self.getGameName(), stage, maximum),
+                             ConsoleColor.Gray if met else ConsoleColor.Yellow)
+        key = stage.lower()
+        self.launchReport[key] = elapsed
+        self.launchReport[key + "Ready"] = met
+        EventLog.Emit("ready", stage=key, elapsed=elapsed, met=met)
+
     def launch(self, GameWaitTime: int = 60) -> int:
         """
         Launch the game. If there is a game launcher, will automatically keep launching the game
         by doing pre-setted launcher operation (setted by `Game.setLauncher()`).
 
+        Parameters
+        ----------
+        GameWaitTime : integer, optional.
+            Maximum seconds to wait for the game to be ready (default: 60), please see more in `Game.setReadiness()`.
+
         Returns
         -------
         launch : integer.
             return 0 if the game failed to start;
-            otherwise, the game's app id.
+            otherwise, the game's process id, or its instance handle if the backend cannot start tracked processes.
+
+        Notes
+        -----
+        Seconds to the launcher and the game being ready are reported by `Game.getLaunchReport()`.
+        The launched process, and the game it spawns, are tracked by `Game.getProcess()`. The tree is watched in the
+        background only until the launch ends, please see more in `ProcessManager`.
 
         """
         startGame: int = 0
@@ -2353,60 +8372,34 @@ class Game:
         # Open Game
         exe = os.path.join(self.getExecutorPath(), self.getExecutor())
         try:
-            startGame = win32api.ShellExecute(
-                1, 'open', exe, self.launchParam, '', 1)
+            backend = InputBackend.get()
+            launchStart = Clock.get().now()
+            try:
+                self.process = backend.startProcess(exe, self.launchParam)
+            except OSError as e:
+                self.process = None
+                Logger.WriteLine('GAME() WARNING %s: %s cannot be started with a PID, using ShellExecute: %s' % (
+                    self.getGameName(), exe, e), ConsoleColor.Yellow)
+            if self.process is not None:
+                startGame = self.process.pid
+            else:
+                startGame = backend.shellExecute(exe, self.launchParam)
+            self.launchReport = {"launcher": None, "launcherReady": None, "game": None, "gameReady": None}
 
             if self.hasLauncher():
-                Logger.WriteLine(
-                    'waiting %s seconds for launcher to start......' % self.LauncherWaitTime, ConsoleColor.Gray)
-                Logger.CountProgress(self.LauncherWaitTime)
-                # time.sleep(self.LauncherWaitTime)
+                self._waitReady("launcher", self.getLauncherReadiness(), self.LauncherWaitTime, launchStart)
 
                 # Using UIAutomation
                 if self.getLauncherMode() == 1:
-                    if self.uiAppControlType == "PaneControl":
-                        app = auto.PaneControl(
-                            searchDepth=1, Name=self.uiAppName)
-                    elif self.uiAppControlType == "WindowControl":
-                        app = auto.WindowControl(
-                            searchDepth=1, Name=self.uiAppName)
-                    elif self.uiAppControlType == "ImageControl":
-                        app = auto.ImageControl(
-                            searchDepth=1, Name=self.uiAppName)
-                    elif self.uiAppControlType == "ButtonControl":
-                        app = auto.ButtonControl(
-                            searchDepth=1, Name=self.uiAppName)
-                    elif self.uiAppControlType == "CustomControl":
-                        app = auto.CustomControl(
-                            searchDepth=1, Name=self.uiAppName)
-                    else:
-                        Logger.WriteLine(
-                            "GAME() ERROR %s: %s is not recognized as a ControlType. Please check again or report this issue." % (self.getGameName(), self.uiAppControlType), ConsoleColor.Red)
-                        return 0
-
-                    # Set the launcher window to the very top of the screen
-                    app.SetTopmost(True)
-
-                    # Click on Start Button
-                    if self.uiStartControlType == "PaneControl":
-                        auto.PaneControl(
-                            foundIndex=self.uiStartIndex, Name=self.uiStartName).Click()
-                    elif self.uiStartControlType == "WindowControl":
-                        auto.WindowControl(
-                            foundIndex=self.uiStartIndex, Name=self.uiStartName).Click()
-                    elif self.uiStartControlType == "ImageControl":
-                        auto.ImageControl(
-                            foundIndex=self.uiStartIndex, Name=self.uiStartName).Click()
-                    elif self.uiStartControlType == "ButtonControl":
-                        auto.ButtonControl(
-                            foundIndex=self.uiStartIndex, Name=self.uiStartName).Click()
-                    elif self.uiStartControlType == "CustomControl":
-                        auto.CustomControl(
-                            foundIndex=self.uiStartIndex, Name=self.uiStartName).Click()
-                    else:
-                        Logger.WriteLine(
-                            "GAME() ERROR %s: %s is not recognized as a ControlType. Please check again or report this issue." % (self.getGameName(), self.uiStartControlType), ConsoleColor.Red)
-                        return 0
+                    for controlType in (self.uiAppControlType, self.uiStartControlType):
+                        if controlType not in InputBackend.CONTROL_TYPES:
+                            Logger.WriteLine(
+                                "GAME() ERROR %s: %s is not recognized as a ControlType. Please check again or report this issue." % (self.getGameName(), controlType), ConsoleColor.Red)
+                            return 0
+
+                    # Set the launcher window to the very top of the screen, and click on Start Button
+                    backend.clickControl(self.uiAppControlType, self.uiAppName,
+                                         self.uiStartControlType, self.uiStartIndex, self.uiStartName)
 
                 # Using win32 Mouse Click Action
                 elif self.getLauncherMode() == 2:
@@ -2417,13 +8410,26 @@ class Game:
                 elif self.getLauncherMode() == 3:
                     Input.callTinyTask(self.TinyTaskName)
 
-            Logger.WriteLine(
-                'waiting %s seconds for Game to start......' % GameWaitTime, ConsoleColor.Gray)
-            Logger.CountProgress(GameWaitTime)
-            # time.sleep(GameWaitTime )
+                # Locating the Start Button by template, and click on it
+                elif self.getLauncherMode() == 4:
+                    report = self.templateMatcher.locate(game=self.getGameName())
+                    EventLog.Emit("template", **report)
+                    Logger.WriteLine('Start Button %s at (%s, %s) with confidence %.3f at scale %s in %.3f seconds%s' % (
+                        "found" if report["found"] else "NOT found", report["x"], report["y"], report["confidence"],
+                        report["scale"], report["seconds"], " (cached)" if report["cached"] else ""),
+                        ConsoleColor.Gray if report["found"] else ConsoleColor.Red)
+                    if report["found"]:
+                        backend.setCursorPos(report["x"], report["y"])
+                        Input.clickLeft(report["x"], report["y"])
+
+            self._waitReady("Game", self.getGameReadiness(), GameWaitTime, launchStart)
         except Exception as e:
-            Logger.WriteLine('GAME() ERROR %s: %e' %
-                             (self.getGameName(), e), ConsoleColor.Gray)
+            Logger.WriteLine('GAME() ERROR %s: %s' %
+                             (self.getGameName(), e), ConsoleColor.Red)
+        finally:
+            if self.process is not None:
+                # No process is listed in the background while benchmarking, the tree is refreshed on termination
+                self.process.stopWatching()
 
         # Dealling In-Game Start Buttons
 
@@ -2441,33 +8447,24 @@ class Game:
             otherwise, return False.
 
         """
-        try:
-            if actionList is None:
-                return False
-            for action in actionList:
-                if not isinstance(action, List):
-                    Logger.WriteLine(
-                        'GAME() ERROR %s: %s Invalid Action %s' % (self.getGameName(), actionList, action), ConsoleColor.Red)
+        return self.compileActions(actionList) is not None
 
-                ActionType, tar, duration = action
-                if not ActionType in ["w", "k", "ks", "cl", "cr", "mv", "t", "s"]:
-                    Logger.WriteLine('GAME() ERROR %s: %s Invalid ActionType %s' % (
-                        self.getGameName(), actionList, ActionType), ConsoleColor.Red)
-                    return False
-                if not isinstance(duration, int) and not isinstance(duration, float):
-                    Logger.WriteLine('GAME() ERROR %s: %s Invalid Duration %s' % (
-                        self.getGameName(), actionList, duration), ConsoleColor.Red)
-                    return False
-                if not isinstance(tar, str) and not isinstance(tar, Tuple):
-                    Logger.WriteLine('GAME() ERROR %s: %s Invalid TargetType %s' % (
-                        self.getGameName(), actionList, tar), ConsoleColor.Red)
-                    return False
+    def compileActions(self, actionList: List[List[Any]]) -> ActionPlan:
+        """
+        Compile an action list into an `ActionPlan`, please see more in `ActionPlan.compile()`.
+
+        Returns
+        -------
+        compileActions : ActionPlan.
+            The compiled plan; or None if the action list is invalid, with the index of the invalid action logged.
+
+        """
+        try:
+            return ActionPlan.compile(actionList)
         except Exception as e:
             Logger.WriteLine(
                 'GAME() ERROR %s: CheckActions() %s Error %s' % (self.getGameName(), actionList, e), ConsoleColor.Red)
-            return False
-        else:
-            return True
+            return None
 
     def setStartActions(self, actions: List[List[Any]]) -> None:
         """
@@ -2488,6 +8485,7 @@ class Game:
                 -- ["mv", (x, y), duration: float]\n
                 -- ["t", TinyTask: str, duration]\n
                 -- ["s", "key_alt_tab" | "key_alt_f4", duration: float]\n
+                -- ["u", condition: tuple, timeout: float]\n
             Please see more in Notes and Examples section.
 
         Notes
@@ -2500,7 +8498,9 @@ class Game:
             "cr" - Right click on position `(x, y)` in `duration` seconds.\n
             "mv" - Move the mouse to position `(x, y)` in `duration` seconds.\n
             "t" -  Perform a `TinyTask` File Name in `duration` seconds.\n
-            "s" -  Call special actions `Input.key_alt_tab()` or `Input.key_alt_f4()` in `duration` seconds.
+            "s" -  Call special actions `Input.key_alt_tab()` or `Input.key_alt_f4()` in `duration` seconds.\n
+            "u" -  Wait until `condition` holds, for at most `timeout` seconds, such as ("process", "Fallout4.exe").
+                   Please see conditions in `Condition`.
 
         Examples
         --------
@@ -2525,8 +8525,11 @@ class Game:
         here to interact the start buttton on the main menu. Finally, waiting for 1 minute (60 seconds)
         to finish the loading menu.
 
+        The actions are compiled here into an `ActionPlan`, please see more in `Game.getStartPlan()`.
+
         """
         self._START_ACTIONS = actions
+        self._START_PLAN = self.compileActions(actions) if actions is not None else None
 
     def checkStartActions(self) -> bool:
         """
@@ -2539,7 +8542,7 @@ class Game:
             otherwise, return False.
 
         """
-        return self.checkActions(self.getStartActions())
+        return self.getStartPlan() is not None
 
     def getStartActions(self) -> List[List[Any]]:
         """
@@ -2553,6 +8556,19 @@ class Game:
         """
         return self._START_ACTIONS
 
+    def getStartPlan(self) -> ActionPlan:
+        """
+        Get the compiled start-up actions.
+
+        Returns
+        -------
+        getStartPlan : ActionPlan.
+            The plan compiled by `Game.setStartActions()`, or None if the actions are not set or invalid.
+            `ActionPlan.duration` is the total planned seconds.
+
+        """
+        return self._START_PLAN
+
     def setQuitActions(self, actions: List[List[Any]]):
         """
         Set the quit actions after game is launched.
@@ -2572,6 +8588,7 @@ class Game:
                 -- ["mv", (x, y), duration: float]\n
                 -- ["t", TinyTask: str, duration]\n
                 -- ["s", "key_alt_tab" | "key_alt_f4", duration: float]\n
+                -- ["u", condition: tuple, timeout: float]\n
             Please see more in Notes and Examples section.
 
         Notes
@@ -2584,7 +8601,9 @@ class Game:
             "cr" - Right click on position `(x, y)` in `duration` seconds.\n
             "mv" - Move the mouse to position `(x, y)` in `duration` seconds.\n
             "t" -  Perform a `TinyTask` File Name in `duration` seconds.\n
-            "s" -  Call special actions `Input.key_alt_tab()` or `Input.key_alt_f4()` in `duration` seconds.
+            "s" -  Call special actions `Input.key_alt_tab()` or `Input.key_alt_f4()` in `duration` seconds.\n
+            "u" -  Wait until `condition` holds, for at most `timeout` seconds, such as ("process", "Fallout4.exe").
+                   Please see conditions in `Condition`.
 
         Examples
         --------
@@ -2604,8 +8623,11 @@ class Game:
         >>>     ["k", "enter", 0.6]
         >>> ])
 
+        The actions are compiled here into an `ActionPlan`, please see more in `Game.getQuitPlan()`.
+
         """
         self._QUIT_ACTIONS = actions
+        self._QUIT_PLAN = self.compileActions(actions) if actions is not None else None
 
     def checkQuitActions(self) -> bool:
         """
@@ -2618,7 +8640,7 @@ class Game:
             otherwise, return False.
 
         """
-        return self.checkActions(self.getQuitActions())
+        return self.getQuitPlan() is not None
 
     def getQuitActions(self) -> List[List[Any]]:
         """
@@ -2632,13 +8654,27 @@ class Game:
         """
         return self._QUIT_ACTIONS
 
-    def startActions(self, actions: List[List[Any]]) -> int:
+    def getQuitPlan(self) -> ActionPlan:
+        """
+        Get the compiled quit actions.
+
+        Returns
+        -------
+        getQuitPlan : ActionPlan.
+            The plan compiled by `Game.setQuitActions()`, or None if the actions are not set or invalid.
+            `ActionPlan.duration` is the total planned seconds.
+
+        """
+        return self._QUIT_PLAN
+
+    def startActions(self, actions: Union[List[List[Any]], ActionPlan]) -> int:
         """
         Start actions with the givin action list.
 
         Parameters
         ----------
-        actions : List[List[Any]]
+        actions : Union[List[List[Any]], ActionPlan]
+            An `ActionPlan` compiled by `Game.compileActions()`, or an action list to be compiled first.
             A list of lists representing the actions. Each list should be length of 3.
             For the first entry, it should be a string representing the action type;
             for the second entry, it should be the target position;
@@ -2651,6 +8687,7 @@ class Game:
                 -- ["mv", (x, y), duration: float]\n
                 -- ["t", TinyTask: str, duration]\n
                 -- ["s", "key_alt_tab" | "key_alt_f4", duration: float]\n
+                -- ["u", condition: tuple, timeout: float]\n
             Please see more in Notes and Examples section.
 
         Notes
@@ -2670,7 +8707,9 @@ class Game:
             "cr" - Right click on position `(x, y)` in `duration` seconds.\n
             "mv" - Move the mouse to position `(x, y)` in `duration` seconds.\n
             "t" -  Perform a `TinyTask` File Name in `duration` seconds.\n
-            "s" -  Call special actions `Input.key_alt_tab()` or `Input.key_alt_f4()` in `duration` seconds.
+            "s" -  Call special actions `Input.key_alt_tab()` or `Input.key_alt_f4()` in `duration` seconds.\n
+            "u" -  Wait until `condition` holds, for at most `timeout` seconds, such as ("process", "Fallout4.exe").
+                   Please see conditions in `Condition`.
 
         Examples
         --------
@@ -2714,64 +8753,24 @@ class Game:
         >>> f4.start()
 
         """
+        if not isinstance(actions, ActionPlan):
+            actions = self.compileActions(actions)
+            if actions is None:
+                return 0
         try:
             resCode = 0
-            num = 0
-            for action in actions:
-
-                ActionType, tar, duration = action
-
-                Logger.WriteFlush('Performing Action %s %s : At %s in %s seconds' % (
-                    num, ActionType, tar, duration), ConsoleColor.DarkGray)
-                num += 1
-
-                ActionType = str.lower(ActionType)
-
-                if ActionType == "w":
-                    # time.sleep(duration)
-                    Logger.CountProgress(
-                        duration, log="Waiting", consoleColor=ConsoleColor.DarkGray)
-                    resCode = duration
-
-                # k - Single key
-                if ActionType == "k":
-                    resCode = Input.key_input(tar, duration)
-
-                # ks - Multiple Keys
-                if ActionType == "ks":
-                    resCode = Input.key_inputs(tar, duration)
-
-                # cl - Left-Click
-                if ActionType == "cl":
-                    x, y = tar
-                    resCode = sum(Input.clickLeft(x, y, duration))
-
-                # cr - Right-Click
-                if ActionType == "cr":
-                    x, y = tar
-                    resCode = sum(Input.clickRight(x, y, duration))
-
-                # mv - Move mouse position
-                if ActionType == "mv":
-                    x, y = tar
-                    resCode = sum(Input.moveTo(x, y, duration))
-
-                # t - Call TinyTask
-                if ActionType == "t":
-                    resCode = Input.callTinyTask(tar)
-                    time.sleep(duration)
-
-                # s - Special Function in Input Class
-                if ActionType == "s":
-                    if tar == "key_alt_tab":
-                        Input.key_alt_tab(duration)
-                    if tar == "key_alt_f4":
-                        Input.key_alt_f4(duration)
-                    resCode = duration
+            clock = Clock.get()
+            for index, ActionType, tar, duration, call, label in actions:
+                Logger.WriteFlush(label, ConsoleColor.DarkGray)
+                actionStart = clock.nowNs()
+                resCode = call()
+                EventLog.Emit("action", index=index, type=ActionType, target=tar, duration=duration,
+                              ns=clock.nowNs() - actionStart, result=resCode)
 
                 if not resCode:
                     Logger.WriteLine(
-                        'GAME() ERROR %s: Action %s Failed in Actions()' % (self.getGameName(), action), ConsoleColor.Red)
+                        'GAME() ERROR %s: Action %s Failed in Actions()' % (
+                            self.getGameName(), [ActionType, tar, duration]), ConsoleColor.Red)
         except Exception as e:
             Logger.WriteLine(
                 'GAME() ERROR %s: %s' % (self.getGameName(), e), ConsoleColor.Red)
@@ -2797,7 +8796,7 @@ class Game:
         """
         if not self.checkStartActions():
             return 0
-        return self.startActions(self.getStartActions())
+        return self.startActions(self.getStartPlan())
 
     def quit(self):
         """
@@ -2818,7 +8817,7 @@ class Game:
         """
         if not self.checkQuitActions():
             return 0
-        return self.startActions(self.getQuitActions())
+        return self.startActions(self.getQuitPlan())
 
     ############################### Benchmarking ###############################
     def setBenchmarkingMode(self, mode: Literal[0, 1, 2, 3, 4]) -> None:
@@ -2863,29 +8862,72 @@ class Game:
         """
         return self.mode
 
-    def startBenchMarking(self) -> None:
+    def startBenchMarking(self) -> Dict[str, Any]:
         """
         Start Benchmarking once the game is fully launched and entered.
 
+        Returns
+        -------
+        startBenchMarking : Dict[str, Any].
+            The report of planned and achieved duration and lateness of actions (see more in `Scheduler.getReport()`),
+            or None if the Benchmarking Mode is not valid. The last report is also saved by `Game.getBenchmarkReport()`.
+
         """
+        report = None
         # Normal Benchmarking
         if self.getBenchmarkingMode() == 0:
-            Benchmarking.NormalTest(self.getBenchmarkTime())
+            report = Benchmarking.NormalTest(self.getBenchmarkTime())
         # Alt-Tab Benchmarking
         elif self.getBenchmarkingMode() == 1:
-            Benchmarking.StressTest(self.getBenchmarkTime())
+            report = Benchmarking.StressTest(
+                self.getBenchmarkTime(), seed=self.getBenchmarkSeed())
         # Random-Control Benchmarking
         elif self.getBenchmarkingMode() == 2:
-            Benchmarking.RandomControlTest(self.getBenchmarkTime())
+            if self.getBenchmarkRecording() is not None:
+                report = Benchmarking.ReplayTest(
+                    self.getBenchmarkTime(), self.getBenchmarkRecording())
+            else:
+                report = Benchmarking.RandomControlTest(
+                    self.getBenchmarkTime(), seed=self.getBenchmarkSeed())
         # Random-Input Benchmarking
         elif self.getBenchmarkingMode() == 3:
-            Benchmarking.RandomInputTest(self.getBenchmarkTime())
+            report = Benchmarking.RandomInputTest(
+                self.getBenchmarkTime(), seed=self.getBenchmarkSeed())
         # Random-Rotate Benchmarking
-        elif self.checkLaunch() == 4:
-            Benchmarking.RandomRotateTest(self.getBenchmarkTime())
+        elif self.getBenchmarkingMode() == 4:
+            report = Benchmarking.RandomRotateTest(
+                self.getBenchmarkTime(), seed=self.getBenchmarkSeed())
         else:
             Logger.WriteLine("GAME() ERROR %s: Benchmarking Mode %s is not valid" %
                              (self.getGameName(), self.getBenchmarkingMode()), ConsoleColor.Red)
+            return None
+
+        self.benchmarkReport = report
+        EventLog.Emit("benchmarkReport", mode=self.getBenchmarkingMode(), **report)
+        Logger.WriteLine('GAME() INFO %s: Benchmarking planned %.2f s, achieved %.2f s, %s actions with mean lateness %.1f ms and max lateness %.1f ms' % (
+            self.getGameName(), report["planned"], report["achieved"], report["actions"],
+            report["latenessMean"] * 1000, report["latenessMax"] * 1000), ConsoleColor.DarkGray)
+        waits = report["waitOvershoot"]
+        if waits["waits"]:
+            Logger.WriteLine('GAME() INFO %s: %s waits overshot by mean %.3f ms, p99 %.3f ms and max %.3f ms, spinning %.1f ms' % (
+                self.getGameName(), waits["waits"], waits["overshootMean"] * 1000, waits["overshootP99"] * 1000,
+                waits["overshootMax"] * 1000, waits["spin"] * 1000), ConsoleColor.DarkGray)
+        if "seed" in report:
+            Logger.WriteLine('GAME() INFO %s: Benchmarking schedule seed %s, hash %s' % (
+                self.getGameName(), report["seed"], report["scheduleHash"]), ConsoleColor.DarkGray)
+        return report
+
+    def getBenchmarkReport(self) -> Dict[str, Any]:
+        """
+        Get the report of the last Benchmarking.
+
+        Returns
+        -------
+        getBenchmarkReport : Dict[str, Any].
+            The report returned by the last `Game.startBenchMarking()`, or None if not benchmarked yet.
+
+        """
+        return self.benchmarkReport
 
     ############################### Benchmarking ###############################
     def check(self) -> bool:
@@ -3269,7 +9311,7 @@ class BMAutomation:
         Parameters
         ----------
         killProcess : bool.
-            True to kill process by executor.
+            True to terminate the launched process and its children, please see `Game.terminate()`.
 
         Returns
         -------
@@ -3277,12 +9319,25 @@ class BMAutomation:
             A list of tuple representing Game benchmarking result code.
 
         """
+        runId = datetime.datetime.fromtimestamp(
+            Clock.get().wall()).strftime("%Y%m%d-%H%M%S")
+        EventLog.SetContext(run=runId)
+        EventLog.Emit("run", state="begin", wall=Clock.get().wall(),
+                      games=self.getGameList(), loops=self.getOverallLoopTimes())
         try:
             res = dict()
             for i in range(self.getOverallLoopTimes()):
+                EventLog.SetContext(loop=i)
+                if i > 0 and Logger.RotateEachLoop:
+                    Logger.Rotate()
                 for game in self.getGameList():
-                    if self.dealCrashDump and detectCrashDumps():
-                        dealCrashDumps(self.CrashDumpDir)
+                    EventLog.SetContext(game=game)
+                    Logger.Mark(run=runId, loop=i, game=game)
+                    if self.dealCrashDump:
+                        files1, files2 = detectCrashDumps()
+                        if files1 or files2:
+                            EventLog.Emit("crashDump", dir=self.CrashDumpDir, dumps=files1 + files2)
+                            dealCrashDumps(self.CrashDumpDir)
                     if not game in res:
                         res[game] = []
 
@@ -3294,7 +9349,16 @@ class BMAutomation:
         except Exception as e:
             Logger.WriteLine(
                 'BA() ERROR: %s' % e, ConsoleColor.Red)
+            EventLog.Emit("error", error=repr(e))
+            Logger.DumpCrashContext('@CrashContext_%s.json' %
+                                    runId, error=repr(e))
             return None
+        finally:
+            EventLog.SetContext(loop=None, game=None, gameLoop=None)
+            EventLog.Emit("run", state="end", wall=Clock.get().wall(),
+                          waitOvershoot=PreciseWait.get().stats.getStats())
+            EventLog.ClearContext()
+            Logger.Flush()
 
     def _start(self, game: str, killProcess: bool = False) -> Tuple[int, int]:
         """
@@ -3305,7 +9369,7 @@ class BMAutomation:
         game : string.
             The current game.
         killProcess : bool.
-            True to kill process by executor.
+            True to terminate the launched process and its children, please see `Game.terminate()`.
 
         Returns
         -------
@@ -3317,12 +9381,18 @@ class BMAutomation:
         times = 0
         startCode, quitCode = (0, 0)
         while times < tar.getLoopTimes():
-            startCode = tar.launch(30)
-            startCode = tar.start()
-            tar.startBenchMarking()
-            quitCode = tar.quit()
+            EventLog.SetContext(gameLoop=times)
+            with EventLog.Phase("launch") as end:
+                startCode = end["code"] = tar.launch(30)
+            with EventLog.Phase("start") as end:
+                startCode = end["code"] = tar.start()
+            with EventLog.Phase("benchmark", mode=tar.getBenchmarkingMode()):
+                tar.startBenchMarking()
+            with EventLog.Phase("quit") as end:
+                quitCode = end["code"] = tar.quit()
             if killProcess:
-                killProgress(tar.getExecutor())
+                with EventLog.Phase("kill"):
+                    tar.terminate()
             times += 1
         return startCode, quitCode
 
@@ -3464,6 +9534,9 @@ def detectCrashDumps(tar="MEMORY.DMP") -> Tuple[list, list]:
 def dealCrashDumps(tar="C:\\WinDumps") -> None:
     """
     Copy the Windows dump file to the desired location and remove the dump files.
+    The last structured events persisted on disk (see `Logger.PersistCrashContext()`), which are those
+    before the crash even if the system crashed in the previous run, are written next to every copied
+    dump as '{dump}.context.json'.
 
     Parameters
     ----------
@@ -3489,6 +9562,8 @@ def dealCrashDumps(tar="C:\\WinDumps") -> None:
             if os.path.isfile(src_name):
                 exe = 'copy ' + src_name + ' %s' % dst_name
                 os.system(exe)
+                Logger.DumpCrashContext(
+                    dst_name + '.context.json', dump=src_name)
                 if searchFile(src, files):
                     os.system('del '+src_name)
             else:
@@ -3502,6 +9577,8 @@ def dealCrashDumps(tar="C:\\WinDumps") -> None:
             if os.path.isfile(src_name):
                 exe = 'copy ' + src_name + ' %s' % dst_name
                 os.system(exe)
+                Logger.DumpCrashContext(
+                    dst_name + '.context.json', dump=src_name)
                 if searchFile(src, "MEMORY.DMP"):
                     os.system('del '+src_name)
 
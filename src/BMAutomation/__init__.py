@@ -1,4 +1,4 @@
 from __future__ import absolute_import
 
 from .version import VERSION
-from .bmautomation import *
\ No newline at end of file
+from .BMAutomation import *
\ No newline at end of file
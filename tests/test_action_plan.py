@@ -0,0 +1,86 @@
+import pytest
+
+from BMAutomation import (ActionPlan, Clock, ConditionProvider, FakeConditionProvider, Game, InputBackend,
+                          InputBatch, MacroPlayer, RecordingInputBackend, VirtualClock)
+
+
+@pytest.fixture
+def macros():
+    MacroPlayer.register("enter", [["tap", "enter", 0.5]])
+    MacroPlayer.register("mouse/moveLeftWard", [["moveBy", -500, 0, 3, 30]])
+    MacroPlayer.Enabled = True
+    yield
+    MacroPlayer.Enabled = False
+    MacroPlayer.reset()
+
+
+@pytest.mark.parametrize("action, message", [
+    ("wait 5", "Invalid Action"),
+    (["x", "wait", 5], "Invalid ActionType"),
+    (["w", "wait", -1], "Invalid Duration"),
+    (["k", "not a key", 0.1], "Invalid Key"),
+    (["ks", 42, 0.1], "Invalid Keys"),
+    (["cl", (960,), 0.1], "Invalid Target"),
+    (["cr", "center", 0.1], "Invalid Target"),
+    (["mv", (960, "540"), 0.1], "Invalid Target"),
+    (["t", None, 1], "Invalid TinyTask"),
+    (["s", "key_ctrl_c", 0.6], "Invalid Special"),
+    (["u", ("nothing", 1), 10], "Invalid Condition"),
+])
+def test_invalid_actions_are_reported_with_their_index(action, message):
+    with pytest.raises(ValueError, match=r"^Action 1: %s" % message):
+        ActionPlan.compile([["w", "wait", 1], action])
+
+
+def test_compile_actions_logs_and_returns_none():
+    assert Game("Test").compileActions([["k", "w", 0.1], ["k", "not a key", 0.1]]) is None
+    assert Game("Test").compileActions(None) is None
+
+
+def test_duration_is_precomputed(macros):
+    plan = ActionPlan.compile([
+        ["w", "wait", 5],
+        ["k", "w", 0.1],
+        ["ks", "abc", 0.1],
+        ["cl", (960, 540), 0.2],
+        ["mv", (100, 100), 1],
+        ["t", "tinytask//enter.exe", 1],
+        ["t", "mouse/moveLeftWard", 1],
+        ["t", "tinytask//unknown.exe", 2],
+        ["s", "key_alt_tab", 0.5],
+        ["u", ("process", "Game.exe"), 30],
+    ])
+    ks = InputBatch.fromString("abc", 0.1).getDuration() + 0.5
+    motion = MacroPlayer.get("mouse/moveLeftWard").getDuration()
+    assert motion > 1
+    # "t" takes max(duration, macro length), "u" its timeout
+    assert plan.duration == pytest.approx(5 + 0.1 + ks + 0.2 + 1 + 1 + motion + 2 + 0.5 + 30)
+    assert [step[0] for step in plan] == list(range(10))
+    assert [step[1] for step in plan] == ["w", "k", "ks", "cl", "mv", "t", "t", "t", "s", "u"]
+
+
+def test_start_actions_runs_a_compiled_plan(macros):
+    clock = VirtualClock(start=0)
+    backend = RecordingInputBackend()
+    with Clock.use(clock), InputBackend.use(backend), ConditionProvider.use(FakeConditionProvider()) as provider:
+        provider.addProcess("Game.exe", start=4)
+        game = Game("Test")
+        plan = game.compileActions([
+            ["w", "wait", 2],
+            ["u", ("process", "Game.exe"), 30],
+            ["k", "w", 0.1],
+            ["t", "enter", 1],
+            ["t", "tinytask//unknown.exe", 1],
+            ["s", "key_alt_f4", 0.6],
+        ])
+        assert game.startActions(plan)
+
+    w, enter, alt, f4 = (InputBatch.toCode(key) for key in ("w", "enter", "alt", "F4"))
+    assert [(round(t / 1e9, 3), kind, code) for t, kind, code in backend.events()] == [
+        (4, InputBatch.KEY_DOWN, w), (4.1, InputBatch.KEY_UP, w),
+        (4.1, InputBatch.KEY_DOWN, enter), (4.6, InputBatch.KEY_UP, enter),
+        (6.1, InputBatch.KEY_DOWN, alt), (6.3, InputBatch.KEY_DOWN, f4),
+        (6.5, InputBatch.KEY_UP, f4), (6.7, InputBatch.KEY_UP, alt),
+    ]
+    (t, name, (file, params)), = backend.actions
+    assert name == "shellExecute" and file.endswith("unknown.exe") and t == pytest.approx(5.1e9)
@@ -0,0 +1,51 @@
+from BMAutomation import (Benchmarking, BenchmarkSchedule, Clock, InputBackend, InputBatch,
+                          RecordingInputBackend, VirtualClock, WorkloadGenerator)
+
+VIEWS = ["view_upward", "view_downward", "view_leftward", "view_rightward"]
+
+
+def test_random_control_schedule_has_view_actions():
+    schedule = BenchmarkSchedule.generate(2, 600, seed=7)
+    assert all(view in schedule.actions for view in VIEWS)
+    used = {schedule.actions[i] for i in schedule.actionIds}
+    assert used & set(VIEWS)
+
+
+def test_schedule_hash_covers_actions():
+    schedule = BenchmarkSchedule.generate(2, 60, seed=7)
+    assert schedule.getHash() == BenchmarkSchedule.generate(2, 60, seed=7).getHash()
+    other = BenchmarkSchedule(2, 60, 7, schedule.actions[:-1])
+    for offset, actionId, hold in zip(schedule.offsets, schedule.actionIds, schedule.holds):
+        other.append(offset, actionId, hold)
+    assert other.getHash() != schedule.getHash()
+
+
+def test_view_action_is_relative_motion():
+    backend = RecordingInputBackend()
+    with Clock.use(VirtualClock()), InputBackend.use(backend):
+        Benchmarking._getHandler(2, "view_leftward")(1.0)
+    moves = [i for i, kind in enumerate(backend.kinds) if kind == InputBatch.MOVE_BY]
+    assert moves and len(moves) == len(backend)
+    assert sum(backend.xs[i] for i in moves) == -Benchmarking._VIEW_SPEED
+    assert sum(backend.ys[i] for i in moves) == 0
+
+
+
+def test_stress_test_switches_back_after_every_action():
+    schedule = BenchmarkSchedule.generate(1, 120, seed=3)
+    for policy in ("compensate", "skip"):
+        backend = RecordingInputBackend()
+        with Clock.use(VirtualClock()), InputBackend.use(backend):
+            report = Benchmarking.replay(schedule, policy)
+        downs = sum(1 for kind in backend.kinds if kind == InputBatch.KEY_DOWN)
+        # Each action run is one ALT+TAB away and one back, of two keys each
+        assert downs == 4 * (len(schedule) - report["skipped"])
+
+
+def test_stress_test_workload_switches_back_after_every_record():
+    generator = WorkloadGenerator.forMode(1, seed=5, blockSize=64)
+    backend = RecordingInputBackend()
+    with Clock.use(VirtualClock()), InputBackend.use(backend):
+        report = Benchmarking.replayWorkload(generator, 1, 120)
+    downs = sum(1 for kind in backend.kinds if kind == InputBatch.KEY_DOWN)
+    assert report["scheduleLength"] and downs == 4 * report["scheduleLength"]
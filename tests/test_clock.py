@@ -0,0 +1,31 @@
+import pytest
+
+from BMAutomation import Clock, RealClock, VirtualClock
+
+
+def test_clock_is_abstract():
+    with pytest.raises(TypeError):
+        Clock()
+
+    class Partial(Clock):
+        def now(self):
+            return 0.0
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_virtual_clock_sleeps_instantly():
+    clock = VirtualClock(start=10, wallStart=1000)
+    clock.sleep(2.5)
+    assert clock.now() == 12.5
+    assert clock.nowNs() == 12500000000
+    assert clock.wall() == 1002.5
+
+
+def test_use_restores_previous_clock():
+    previous = Clock.get()
+    with Clock.use(VirtualClock()) as clock:
+        assert Clock.get() is clock
+    assert Clock.get() is previous
+    assert isinstance(previous, RealClock)
@@ -0,0 +1,74 @@
+import pytest
+
+from BMAutomation import Clock, Condition, ConditionProvider, FakeConditionProvider, VirtualClock
+
+
+@pytest.fixture
+def fake():
+    with Clock.use(VirtualClock(start=0)):
+        provider = FakeConditionProvider()
+        with ConditionProvider.use(provider):
+            yield provider
+
+
+def test_condition_provider_is_abstract():
+    with pytest.raises(TypeError):
+        ConditionProvider()
+
+
+def test_process_is_met_at_the_first_poll_after_it_starts(fake):
+    fake.addProcess("Fallout4.exe", start=12, end=300)
+    report = Condition.wait(("process", "Fallout4.exe"), 60, interval=0.5)
+    assert report["met"]
+    assert report["elapsed"] == 12
+    assert report["polls"] == 25
+    assert Clock.get().now() == 12
+
+
+def test_timeout(fake):
+    report = Condition.wait(("window", "Fallout4"), 10, interval=1)
+    assert not report["met"]
+    assert report["elapsed"] == 10
+    assert report["polls"] == 11
+
+
+def test_backoff_polls(fake):
+    fake.addWindow("Fallout4", start=20)
+    report = Condition.wait(("window", "Fallout4"), 60, interval=1, backoff=2, maxInterval=8)
+    # Polls at 0, 1, 3, 7, 15 and 23 seconds
+    assert report["met"] and report["elapsed"] == 23 and report["polls"] == 6
+
+
+def test_exited(fake):
+    fake.addProcess("Launcher.exe", start=0, end=5)
+    assert Condition.wait(("exited", "Launcher.exe"), 60, interval=1)["elapsed"] == 5
+
+
+def test_file_stable(fake):
+    fake.addFile("save.log", [(5, 100), (7, 400), (9, 800)])
+    report = Condition.wait(("fileStable", "save.log", 3), 60, interval=1)
+    assert report["met"] and report["elapsed"] == 12
+
+
+def test_control_with_child(fake):
+    fake.addControl("WindowControl", "Launcher", start=2)
+    fake.addControl("ButtonControl", "Play", start=6)
+    assert Condition.wait(("control", "WindowControl", "Launcher"), 60, interval=1)["elapsed"] == 2
+    report = Condition.wait(("control", "WindowControl", "Launcher", "ButtonControl", 0, "Play"), 60, interval=1)
+    assert report["met"] and Clock.get().now() == 6
+
+
+def test_spawned(fake):
+    fake.addProcess("Launcher.exe", pid=10)
+    fake.addProcess("Helper.exe", pid=11, ppid=10)
+    fake.addProcess("Game.exe", start=8, pid=12, ppid=11)
+    fake.addProcess("Other.exe", start=4, pid=13, ppid=1)
+    report = Condition.wait(("spawned", 10), 60, interval=1)
+    assert report["met"] and report["elapsed"] == 8
+
+
+def test_invalid_condition():
+    with pytest.raises(ValueError):
+        Condition.parse(("control", "NoControl", "Launcher"))
+    with pytest.raises(ValueError):
+        Condition.parse(("spawned", "Game.exe"))
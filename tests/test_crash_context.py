@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from BMAutomation import EventLog, Logger, RingBuffer
+
+
+@pytest.fixture
+def crashContext(monkeypatch):
+    monkeypatch.setattr(EventLog, "Enabled", False)
+    monkeypatch.setattr(Logger, "CrashContext", RingBuffer(8))
+    Logger.SetCrashContextFile("context.jsonl")
+    yield
+    Logger.SetCrashContextFile('@CrashContext.jsonl')
+
+
+def test_phases_force_events_onto_disk(crashContext, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    with EventLog.Phase("launch"):
+        begin = len(synced)
+        assert begin
+        EventLog.Emit("action", index=0)
+    assert len(synced) == begin + 1
+    with open("context.jsonl", encoding="utf-8") as f:
+        events = [json.loads(line) for line in f]
+    assert [e["ev"] for e in events] == ["phase", "action", "phase"]
+
+
+def test_previous_run_is_read_back(crashContext):
+    for index in range(5):
+        EventLog.Emit("action", index=index)
+    Logger.PersistCrashContext()
+    # A new run after a crash of the system only has the events on disk
+    Logger.SetCrashContextFile("context.jsonl")
+    Logger.CrashContext.clear()
+    EventLog.Emit("run", state="begin")
+    events = Logger.ReadCrashContext()
+    assert [e.get("index") for e in events] == [0, 1, 2, 3, 4, None]
+
+    Logger.DumpCrashContext("MEMORY.DMP.context.json", dump="MEMORY.DMP")
+    with open("MEMORY.DMP.context.json", encoding="utf-8") as f:
+        assert json.load(f)["events"] == events
+
+
+def test_file_is_compacted(crashContext):
+    for index in range(100):
+        EventLog.Emit("action", index=index)
+    Logger.PersistCrashContext()
+    with open("context.jsonl", encoding="utf-8") as f:
+        lines = f.readlines()
+    assert len(lines) == 8
+    assert [e["index"] for e in Logger.ReadCrashContext()] == list(range(92, 100))
+
+
+def test_emit_does_no_io(crashContext, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    for index in range(20):
+        EventLog.Emit("action", index=index)
+    assert not synced and not os.path.exists("context.jsonl")
+    Logger.PersistCrashContext()
+    assert len(synced) == 1 and os.path.exists("context.jsonl")
+
+
+def test_unchanged_context_is_not_rewritten(crashContext, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    monkeypatch.setattr(Logger, "CrashContextSyncInterval", 0)
+    EventLog.Emit("action", index=0)
+    Logger._PersistCrashContextIfDue()
+    Logger._PersistCrashContextIfDue()
+    assert len(synced) == 1
+    EventLog.Emit("action", index=1)
+    Logger._PersistCrashContextIfDue()
+    assert len(synced) == 2
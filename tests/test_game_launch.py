@@ -0,0 +1,59 @@
+import pytest
+
+from BMAutomation import (Clock, ConditionProvider, FakeConditionProvider, Game, InputBackend,
+                          RecordingInputBackend, VirtualClock)
+
+
+@pytest.fixture
+def recorded():
+    with Clock.use(VirtualClock(start=0)), InputBackend.use(RecordingInputBackend()) as backend:
+        yield backend
+
+
+@pytest.fixture
+def fake(recorded):
+    with ConditionProvider.use(FakeConditionProvider()) as provider:
+        yield provider
+
+
+def _game(workdir, launcherMode=1, **readiness):
+    (workdir / "Fallout4Launcher.exe").write_bytes(b"")
+    game = Game("Fallout 4", absolutePath=str(workdir), exe="Fallout4Launcher.exe")
+    game.setExecutorPath("a")
+    game.setLauncherMode(launcherMode)
+    game.setLauncher(waitTime=20,
+                     uiAppControlType="WindowControl", uiAppName="Fallout 4",
+                     uiStartControlType="ImageControl", uiStartIndex=4, uiStartName="Play",
+                     clickPos=(114, 514))
+    game.setReadiness(interval=0.5, backoff=1, maxInterval=0.5, **readiness)
+    return game
+
+
+def test_launch_proceeds_as_soon_as_ready(fake, recorded, workdir):
+    fake.addControl("WindowControl", "Fallout 4", start=3)
+    # The START button is shown after the launcher window
+    fake.addControl("ImageControl", "Play", start=5)
+    fake.addProcess("Fallout4.exe", start=12)
+    game = _game(workdir, game=("process", "Fallout4.exe"))
+
+    assert game.launch(GameWaitTime=60)
+    assert game.getLaunchReport() == {"launcher": 5, "launcherReady": True, "game": 12, "gameReady": True}
+    (clicked, name, args), = [action for action in recorded.actions if action[1] == "clickControl"]
+    assert clicked == 5e9 and args == ("WindowControl", "Fallout 4", "ImageControl", 4, "Play")
+    assert Clock.get().now() == 12
+
+
+def test_launch_falls_back_to_the_maximum(fake, workdir):
+    fake.addControl("WindowControl", "Fallout 4", start=3)
+    game = _game(workdir, game=("window", "Fallout4"))
+
+    assert game.launch(GameWaitTime=60)
+    assert game.getLaunchReport() == {"launcher": 20, "launcherReady": False, "game": 80, "gameReady": False}
+    assert Clock.get().now() == 80
+
+
+def test_launch_without_conditions_waits_the_whole_time(fake, workdir):
+    game = _game(workdir, launcherMode=2)
+
+    assert game.launch(GameWaitTime=30)
+    assert game.getLaunchReport() == {"launcher": 20, "launcherReady": None, "game": 50, "gameReady": None}
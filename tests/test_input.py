@@ -0,0 +1,83 @@
+import pytest
+
+from BMAutomation import (CameraMotion, Clock, Input, InputBackend, InputBatch, NullInputBackend, RecordingInputBackend,
+                          Trajectory, VirtualClock)
+
+
+@pytest.fixture
+def recorded():
+    backend = RecordingInputBackend()
+    with Clock.use(VirtualClock(start=0)), InputBackend.use(backend):
+        yield backend
+
+
+def test_input_backend_is_abstract():
+    with pytest.raises(TypeError):
+        InputBackend()
+
+
+def test_events_are_recorded_in_order(recorded):
+    Input.key_input("w", 0.1)
+    Input.key_alt_tab(0.5)
+    recorded.setCursorPos(100, 200)
+    Input.clickLeft(100, 200, 0.05)
+
+    w, alt, tab = (InputBatch.toCode(key) for key in ("w", "alt", "tab"))
+    assert list(zip(recorded.kinds, recorded.codes))[:6] == [
+        (InputBatch.KEY_DOWN, w), (InputBatch.KEY_UP, w),
+        (InputBatch.KEY_DOWN, alt), (InputBatch.KEY_DOWN, tab),
+        (InputBatch.KEY_UP, tab), (InputBatch.KEY_UP, alt),
+    ]
+    assert list(recorded.kinds[6:]) == [InputBatch.MOVE_TO, InputBatch.LEFT_DOWN, InputBatch.LEFT_UP]
+    assert (recorded.xs[6], recorded.ys[6]) == (100, 200)
+
+
+def test_event_times_follow_holds(recorded):
+    recorded.sendBatch(InputBatch.fromString("abc", hold=0.1, interval=0.5))
+    times = [t / 1e9 for t in recorded.times]
+    assert times == sorted(times)
+    assert [round(b - a, 6) for a, b in zip(times, times[1:])] == [0.1, 0.5, 0.1, 0.5, 0.1]
+
+
+def test_null_backend_waits_the_holds():
+    clock = VirtualClock(start=0)
+    backend = NullInputBackend()
+    with Clock.use(clock), InputBackend.use(backend):
+        Input.key_input("w", 0.1)
+        Input.key_alt_tab(0.5)
+        Input.key_alt_f4(0.6)
+        assert clock.now() == pytest.approx(1.2)
+        report = Trajectory.play((0, 0), (300, 200), 0.5, rate=100)
+    assert clock.now() == pytest.approx(1.7)
+    assert report["achieved"] == pytest.approx(0.5)
+    assert report["rate"] > 0 and report["endpointError"] == 0
+    assert backend.getCursorPos() == (300, 200)
+
+
+def test_camera_motion_injects_single_events(recorded):
+    CameraMotion._compile.cache_clear()
+    report = CameraMotion.play("sweep", 0.5, rate=100, amplitude=200, period=1)
+    assert report["ticks"] == report["injections"] == 50
+    assert set(recorded.kinds) == {InputBatch.MOVE_BY}
+    xs, _ = CameraMotion.compile("sweep", 0.5, rate=100, amplitude=200, period=1)
+    assert sum(recorded.xs) == xs[50] == recorded.getCursorPos()[0]
+    # Random durations within the same second share the compiled curve
+    CameraMotion.compile("sweep", 0.731, rate=100, amplitude=200, period=1)
+    assert CameraMotion._compile.cache_info().hits == 2
+
+
+def test_get_mouse_waits_by_the_clock(recorded, monkeypatch, capsys):
+    monkeypatch.setattr("os.system", lambda command: 0)
+    clock = Clock.get()
+    stops = iter([False, False, True])
+
+    def sleep(seconds):
+        clock.advance(seconds)
+        if next(stops):
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(clock, "sleep", sleep)
+    recorded.setCursorPos(114, 514)
+    Input.getMouse(0.5)
+    assert clock.now() == 1.5
+    assert capsys.readouterr().out.count("Mouse Position: (114, 514)") == 3
@@ -0,0 +1,94 @@
+import atexit
+import os
+import sys
+import threading
+
+from BMAutomation import ConsoleColor, LogCompressor, Logger, LogSink, LogWriter
+
+
+def test_urgent_writes_are_fsynced(monkeypatch):
+    calls = []
+    monkeypatch.setattr(os, "fsync", calls.append)
+    sink = LogSink.get("urgent.txt")
+    sink.write("info\n")
+    sink.flush()
+    assert not calls
+    sink.write("error\n", urgent=True)
+    assert len(calls) == 1
+    sink.close()
+
+
+def test_set_fsync(monkeypatch):
+    calls = []
+    monkeypatch.setattr(os, "fsync", calls.append)
+    monkeypatch.setattr(LogSink, "Fsync", LogSink.Fsync)
+    Logger.SetFsync(False)
+    try:
+        Logger.WriteLine("error", ConsoleColor.Red, logFile="set_fsync.txt")
+        assert not calls
+        assert LogSink.get("other.txt").fsync is False
+    finally:
+        Logger.SetFsync(True)
+    Logger.WriteLine("error", ConsoleColor.Red, logFile="set_fsync.txt")
+    assert len(calls) == 1
+
+
+def test_marks_are_read_back_across_rotated_segments(workdir):
+    sink = LogSink("loops.txt", fsync=False)
+    sink.setRotation(maxBytes=150)
+    lines = {loop: ["loop %s line %s\n" % (loop, i) for i in range(5)] for loop in range(8)}
+    for loop, texts in lines.items():
+        sink.mark(loop=loop, game="Borderlands3")
+        for text in texts:
+            sink.write(text)
+        sink.flush()
+        if loop == 3:
+            sink.rotate()
+    LogCompressor.wait()
+
+    assert len(list(workdir.glob("loops.*.txt.gz"))) >= 3
+    assert not list(workdir.glob("loops.*[0-9].txt"))
+    for loop, texts in lines.items():
+        path, offset, zoffset = sink.locate(loop=loop)
+        assert (zoffset is None) == (path == "loops.txt")
+        assert list(sink.readFrom(loop=loop, game="Borderlands3"))[:5] == texts
+    assert list(sink.readFrom(loop=8)) == []
+    sink.close()
+
+
+def test_drop_policy_keeps_urgent_records(monkeypatch):
+    written = []
+    taken, release = threading.Event(), threading.Event()
+
+    def output(log, *args):
+        taken.set()
+        release.wait(5)
+        written.append(log)
+
+    monkeypatch.setattr(Logger, "_Output", output)
+    writer = LogWriter(maxQueueSize=1, policy="drop")
+    record = ("info", -1, False, False, "drop.txt", 0, None)
+    writer.put(record)
+    assert taken.wait(5)
+    # The writer thread is blocked on the first record, the second fills the queue
+    assert writer.put(("queued",) + record[1:])
+    assert not writer.put(("dropped",) + record[1:]) and writer.dropped == 1
+    urgent = threading.Thread(target=writer.put, args=(("error",) + record[1:],), kwargs={"urgent": True})
+    urgent.start()
+    release.set()
+    urgent.join(5)
+    writer.stop()
+    assert written == ["info", "queued", "error"] and writer.dropped == 1
+
+
+def test_shutdown_is_registered_once(monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setattr(sys.modules[Logger.__module__], "_LoggerShutdownRegistered", False)
+    try:
+        Logger.SetAsync(True)
+        Logger.SetAsync(True, policy="drop")
+        Logger.SetAsync(True)
+    finally:
+        Logger.SetAsync(False)
+    assert registered == [Logger.Shutdown]
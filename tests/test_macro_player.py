@@ -0,0 +1,43 @@
+import json
+import os
+import struct
+
+import pytest
+
+from BMAutomation import InputBatch, MacroPlayer
+
+TINYTASK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples", "AMDAutomation", "dev", "tinytask")
+
+
+def test_tinytask_executor_is_converted():
+    steps = MacroPlayer.fromTinyTask(os.path.join(TINYTASK, "w.exe"))
+    # The F8 pressed to stop recording is dropped
+    assert steps == [["down", "w"], ["wait", 0.093], ["up", "w"]]
+    batch = MacroPlayer.compile(steps)
+    assert list(batch.kinds) == [InputBatch.KEY_DOWN, InputBatch.KEY_UP]
+    assert batch.getDuration() == pytest.approx(0.093)
+
+
+def test_shipped_macros_match_the_recordings():
+    with open(os.path.join(TINYTASK, "macros.json"), encoding="utf-8") as f:
+        shipped = json.load(f)
+    assert shipped == MacroPlayer.convertTinyTask(TINYTASK)
+    assert {"w", "a", "d", "enter", "esc", "e", "alt_f4", "mouse/moveLeftWard", "mouse/reset_mouse"} <= set(shipped)
+    for steps in shipped.values():
+        MacroPlayer.compile(steps)
+
+
+def test_tinytask_recording_with_buttons(tmp_path):
+    path = str(tmp_path / "click.rec")
+    with open(path, "wb") as f:
+        for message, paramL, paramH, t in [(0x0200, 100, 200, 0xFFFFFFF0), (0x0201, 100, 200, 0x10),
+                                           (0x0202, 100, 200, 0x60), (0x0100, 0x4277, 0x42, 0x100)]:
+            f.write(struct.pack('<5I', message, paramL, paramH, t, 0))
+    steps = MacroPlayer.fromTinyTask(path)
+    assert steps == [["moveTo", 100, 200], ["wait", 0.032], ["buttonDown", "left"], ["wait", 0.08], ["buttonUp", "left"]]
+    assert list(MacroPlayer.compile(steps).kinds) == [InputBatch.MOVE_TO, InputBatch.LEFT_DOWN, InputBatch.LEFT_UP]
+
+    with open(path, "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ValueError):
+        MacroPlayer.fromTinyTask(path)
@@ -0,0 +1,58 @@
+import pytest
+
+from BMAutomation import (Clock, InputBackend, InputBatch, MacroRecorder, MacroRecording,
+                          RecordingInputBackend, VirtualClock)
+
+W = InputBatch.toCode("w")
+
+
+@pytest.fixture
+def recorded():
+    backend = RecordingInputBackend()
+    with Clock.use(VirtualClock(start=0)), InputBackend.use(backend):
+        yield backend
+
+
+def test_round_trip_keeps_events_and_times(recorded, tmp_path):
+    path = str(tmp_path / "macro.bmr")
+    batch = InputBatch.fromString("wasd", hold=0.1, interval=0.25)
+    batch.append(InputBatch.MOVE_BY, delay=0.01, x=3, y=-2)
+    batch.append(InputBatch.MOVE_BY, delay=0.01, x=300, y=-200)
+    batch.append(InputBatch.MOVE_TO, delay=0.5, x=960, y=540)
+    batch.extend(InputBatch.click("right", 0.05))
+    with MacroRecorder(path) as recorder:
+        recorder.recordBatch(batch, timeNs=0)
+
+    with MacroRecording(path) as recording:
+        assert len(recording) == len(batch)
+        assert recording.getDuration() == pytest.approx(batch.getDuration())
+        report = recording.play()
+
+    assert report["actions"] == len(batch) and report["released"] == 0
+    assert list(recorded.kinds) == list(batch.kinds)
+    assert list(recorded.codes) == list(batch.codes)
+    assert list(recorded.xs) == list(batch.xs) and list(recorded.ys) == list(batch.ys)
+    times = [t / 1e9 for t in recorded.times]
+    expected, t = [], 0
+    for delay in batch.delays:
+        t += delay
+        expected.append(t)
+    assert times == pytest.approx(expected, abs=1e-3)
+
+
+def test_cut_releases_held_keys_and_buttons(recorded, tmp_path):
+    path = str(tmp_path / "hold.bmr")
+    with MacroRecorder(path) as recorder:
+        recorder.record(InputBatch.KEY_DOWN, W, timeNs=0)
+        recorder.record(InputBatch.LEFT_DOWN, timeNs=int(1e9))
+        recorder.record(InputBatch.LEFT_UP, timeNs=int(4e9))
+        recorder.record(InputBatch.KEY_UP, W, timeNs=int(5e9))
+
+    with MacroRecording(path) as recording:
+        report = recording.play(duration=2)
+
+    assert report["actions"] == 2 and report["released"] == 2
+    assert [(round(t / 1e9, 3), kind, code) for t, kind, code in recorded.events()] == [
+        (0, InputBatch.KEY_DOWN, W), (1, InputBatch.LEFT_DOWN, 0),
+        (2, InputBatch.LEFT_UP, 0), (2, InputBatch.KEY_UP, W),
+    ]
@@ -0,0 +1,151 @@
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from BMAutomation import Clock, ConditionProvider, FakeConditionProvider, ProcessManager, VirtualClock
+
+LAUNCHER = """
+import subprocess, sys, time
+subprocess.Popen([sys.executable, sys.argv[1]] + sys.argv[2:])
+time.sleep(0.3)
+"""
+
+GAME = """
+import signal, sys, time
+if "stubborn" in sys.argv:
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+time.sleep(30)
+"""
+
+
+@pytest.fixture
+def launcher(workdir):
+    (workdir / "launcher.py").write_text(LAUNCHER)
+    (workdir / "game.py").write_text(GAME)
+
+    def start(*args):
+        process = ProcessManager.start(sys.executable, " ".join(["launcher.py", "game.py"] + list(args)))
+        deadline = time.monotonic() + 10
+        while len(process.getReport()["processes"]) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return process
+    return start
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="terminates by signals")
+def test_graceful_termination(launcher):
+    process = launcher()
+    assert len(process.tree()) >= 1
+    started = time.monotonic()
+    report = process.terminate(grace=5)
+    assert time.monotonic() - started < 5
+    assert report["forced"] == []
+    assert report["seconds"] is not None
+    assert all(p["exited"] is not None for p in report["processes"])
+    assert [e["event"] for e in report["timeline"]].count("kill") == 0
+    assert process._stopped.is_set()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="terminates by signals")
+def test_forced_termination(launcher):
+    process = launcher("stubborn")
+    game = [p["pid"] for p in process.getReport()["processes"] if p["pid"] != process.pid]
+    report = process.terminate(grace=1)
+    assert report["forced"] == game
+    assert not process.alive()
+    events = [e["event"] for e in report["timeline"]]
+    assert events.index("terminate") < events.index("kill")
+
+
+class _Popen:
+    def __init__(self, pid, exitAfter=None):
+        self.pid = pid
+        self.exitAfter = exitAfter
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        # Exits `exitAfter` seconds of the current clock later, or times out
+        if self.exitAfter is None or timeout is not None and timeout < self.exitAfter:
+            raise subprocess.TimeoutExpired("launcher", timeout)
+        Clock.get().advance(self.exitAfter)
+        self.returncode = 0
+        return 0
+
+
+def test_adoption_ignores_reused_pids(monkeypatch):
+    monkeypatch.setattr(threading.Thread, "start", lambda self: None)
+    with Clock.use(VirtualClock(start=0)) as clock:
+        fake = FakeConditionProvider()
+        with ConditionProvider.use(fake):
+            fake.addProcess("Launcher.exe", start=1, end=6, pid=10)
+            # Created before the launcher, with a parent pid reused by it
+            fake.addProcess("Old.exe", start=0, pid=11, ppid=10)
+            fake.addProcess("Game.exe", start=3, pid=12, ppid=10)
+            clock.advance(1)
+            process = ProcessManager(_Popen(10), "Launcher.exe")
+            clock.advance(2)
+            assert sorted(pid for pid, _ in process.refresh()) == [10, 12]
+
+            # The pid of the launcher is reused after it exits
+            fake.addProcess("Other.exe", start=8, pid=10)
+            fake.addProcess("Child.exe", start=9, pid=13, ppid=10)
+            clock.advance(7)
+            process.popen.poll = lambda: 0
+            assert sorted(pid for pid, _ in process.refresh()) == [12]
+            assert process.tracked("game.exe") and not process.tracked("Child.exe")
+
+
+class _CountingProvider(FakeConditionProvider):
+    def __init__(self):
+        super().__init__()
+        self.listed = 0
+
+    def listProcesses(self):
+        self.listed += 1
+        return super().listProcesses()
+
+
+def test_watcher_stops_after_launch(monkeypatch):
+    monkeypatch.setattr(ProcessManager, "Interval", 0.01)
+    provider = _CountingProvider()
+    provider.addProcess("Game.exe", pid=10)
+    with ConditionProvider.use(provider):
+        process = ProcessManager(_Popen(10), "Game.exe")
+        deadline = time.monotonic() + 5
+        while provider.listed < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert provider.listed >= 3
+        process.stopWatching()
+        time.sleep(0.05)
+        listed = provider.listed
+        time.sleep(0.1)
+        assert provider.listed == listed
+        # Refreshed on demand only
+        assert process.alive() and provider.listed == listed + 1
+
+
+def test_wait_shares_one_clock_deadline(monkeypatch):
+    monkeypatch.setattr(threading.Thread, "start", lambda self: None)
+    waited = []
+    monkeypatch.setattr(ProcessManager, "_waitPid", staticmethod(lambda pid, timeout: waited.append((pid, timeout))))
+    with Clock.use(VirtualClock(start=0)) as clock:
+        fake = FakeConditionProvider()
+        with ConditionProvider.use(fake):
+            fake.addProcess("Launcher.exe", start=0, end=3, pid=10)
+            fake.addProcess("Game.exe", start=1, pid=12, ppid=10)
+            process = ProcessManager(_Popen(10, exitAfter=3), "Launcher.exe")
+            clock.advance(1)
+            assert not process.wait(10)
+            # The game gets what the launcher left of the deadline
+            assert waited == [(12, 10 - 3)]
+            assert Clock.get().now() == 4
+
+            process.popen = _Popen(10, exitAfter=30)
+            assert not process.wait(10)
+            assert Clock.get().now() == 4
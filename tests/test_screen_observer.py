@@ -0,0 +1,57 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from BMAutomation import (Clock, Condition, ConditionProvider, FakeConditionProvider, ScreenObserver,
+                          SyntheticFrameSource, VirtualClock)
+
+REGION = (760, 400, 400, 300)
+
+
+@pytest.fixture
+def screen(monkeypatch):
+    monkeypatch.setattr(ScreenObserver, "_References", None)
+    with Clock.use(VirtualClock(start=0)) as clock:
+        provider = FakeConditionProvider()
+        provider.addFrames(None, SyntheticFrameSource(loadTime=10, noise=3))
+        with ConditionProvider.use(provider):
+            yield clock
+
+
+def test_noise_is_not_a_change():
+    source = SyntheticFrameSource(loadTime=0, noise=3)
+    observer = ScreenObserver(REGION)
+    a, b = observer.fingerprint(source(1, REGION)), observer.fingerprint(source(2, REGION))
+    assert observer.difference(a, b) <= observer.threshold
+
+
+def test_loading_screen_changes(screen):
+    observer = ScreenObserver(REGION)
+    assert not observer.changed()
+    screen.advance(0.25)
+    assert observer.changed()
+
+
+def test_stable_after_loading(screen):
+    observer = ScreenObserver(REGION)
+    stable = []
+    while screen.now() < 20:
+        stable.append((screen.now(), observer.stable(2)))
+        screen.advance(0.5)
+    assert not any(met for t, met in stable if t < 12)
+    assert all(met for t, met in stable if t >= 12)
+
+
+def test_region_stable_condition(screen):
+    report = Condition.wait(("regionStable", REGION, 2), 60, interval=0.5)
+    assert report["met"] and report["elapsed"] == 12
+
+
+def test_reference_matches(screen):
+    observer = ScreenObserver(REGION, game="Fallout 4")
+    screen.advance(15)
+    assert observer.saveReference("main menu")
+    assert observer.matches("main menu")
+    ScreenObserver._References = None
+    assert ScreenObserver(REGION, game="Fallout 4").getReference("main menu") is not None
+    assert not ScreenObserver(REGION, game="Fallout 4").matches("pause menu")
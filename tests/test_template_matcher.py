@@ -0,0 +1,68 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from BMAutomation import TemplateMatcher  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    monkeypatch.setattr(TemplateMatcher, "_Cache", None)
+
+
+def _button(width=96, height=48):
+    # A smooth textured button, so the halved levels still correlate
+    y, x = np.mgrid[0:height, 0:width]
+    return (128 + 60 * np.sin(x / 5.0) * np.cos(y / 7.0) + 40 * (x > width // 2)).astype(np.float32)
+
+
+def _screen(template, scale, x, y, width=640, height=360, seed=1):
+    rng = np.random.default_rng(seed)
+    screen = rng.uniform(0, 40, (height, width)).astype(np.float32)
+    button = TemplateMatcher.resize(template, scale)
+    h, w = button.shape
+    screen[y:y + h, x:x + w] = button
+    return screen, (x + w // 2, y + h // 2)
+
+
+def test_pyramid_halves_each_level():
+    matcher = TemplateMatcher(_button())
+    assert matcher.levels == 3
+    images = TemplateMatcher.pyramid(matcher.getTemplate(1), matcher.levels)
+    assert [image.shape for image in images] == [(48, 96), (24, 48), (12, 24)]
+    assert matcher.getTemplate(1.5).shape == (72, 144)
+
+
+@pytest.mark.parametrize("scale", [1, 1.25, 1.5])
+def test_search_finds_the_scale(scale):
+    template = _button()
+    matcher = TemplateMatcher(template)
+    screen, center = _screen(template, scale, 301, 157)
+    report = matcher.locate(screen, game="Fallout 4")
+    assert report["found"] and report["scale"] == scale
+    assert abs(report["x"] - center[0]) <= 1 and abs(report["y"] - center[1]) <= 1
+    assert report["confidence"] > 0.95 and not report["cached"]
+
+
+def test_cache_is_keyed_on_resolution():
+    template = _button()
+    matcher = TemplateMatcher(template)
+    screen, center = _screen(template, 1.25, 301, 157)
+    first = matcher.locate(screen, game="Fallout 4")
+    again = matcher.locate(screen, game="Fallout 4")
+    assert again["cached"] and (again["x"], again["y"], again["scale"]) == (first["x"], first["y"], 1.25)
+
+    # Another resolution is searched again, even with the button at the cached location
+    larger, _ = _screen(template, 1.25, 301, 157, width=800, height=450)
+    report = matcher.locate(larger, game="Fallout 4")
+    assert report["found"] and not report["cached"] and report["resolution"] == (800, 450)
+    assert matcher.locate(larger, game="Fallout 4")["cached"]
+    # A fresh matcher reads the locations back from the cache file
+    TemplateMatcher._Cache = None
+    assert TemplateMatcher(template).locate(screen, game="Fallout 4")["cached"]
+
+
+def test_raw_bytes_need_a_size():
+    matcher = TemplateMatcher(_button())
+    with pytest.raises(ValueError):
+        matcher.locate(bytes(640 * 360 * 4), useCache=False)